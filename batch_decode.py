@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+
+import os
+import csv
+import argparse
+from array import array
+
+from binary_reader import BinaryReader
+from command_schema import HEADER_SIZE
+from encoder import read_header, iter_commands, list_binary_files
+
+class StringColumn:
+    """
+    Column of strings stored as integer codes into a table of distinct values.
+    Each distinct string is kept once however many rows use it.
+    """
+
+    def __init__(self):
+        self.codes = array('I')
+        self.values = []
+        self._index = {}
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, i):
+        return self.values[self.codes[i]]
+
+    def append(self, value):
+        code = self._index.get(value)
+        if code is None:
+            code = len(self.values)
+            self._index[value] = code
+            self.values.append(value)
+        self.codes.append(code)
+
+    def to_categorical(self):
+        """Return the column as a pandas Categorical without expanding it to strings."""
+        import numpy as np
+        import pandas as pd
+        return pd.Categorical.from_codes(np.frombuffer(self.codes, dtype=np.uint32).astype(np.int32),
+                                         categories=self.values)
+
+class ColumnarBatch:
+    """
+    Test sequences of many decoded files stored as struct-of-arrays.
+    Step i of the batch is file_ids[i], rows[i], commands[i], ... ; per-file
+    values (path, metadata, errors) are indexed by file id.
+    """
+
+    # Step columns stored as StringColumn, in export order
+    STRING_COLUMNS = ("Command", "Description", "Condition", "Unit", "Tolerance")
+
+    def __init__(self):
+        self.files = []
+        self._file_index = {}
+        self.metadata = []
+        self.errors = {}
+        self.file_ids = array('I')
+        self.rows = array('I')
+        self.columns = {name: StringColumn() for name in self.STRING_COLUMNS}
+
+    def __len__(self):
+        return len(self.file_ids)
+
+    def __contains__(self, file_path):
+        return file_path in self._file_index
+
+    def add_file(self, file_path, metadata):
+        """
+        Register a decoded file. A path has one id, registering it again
+        replaces its metadata and returns the same id.
+
+        Args:
+            file_path: Path of the decoded file
+            metadata: Component metadata dictionary
+
+        Returns:
+            File id used for the file's steps
+        """
+        file_id = self._file_index.get(file_path)
+        if file_id is not None:
+            self.metadata[file_id] = metadata
+            return file_id
+        file_id = self._file_index[file_path] = len(self.files)
+        self.files.append(file_path)
+        self.metadata.append(metadata)
+        return file_id
+
+    def add_step(self, file_id, row_index, record):
+        """
+        Append one test sequence step.
+
+        Args:
+            file_id: Id returned by add_file()
+            row_index: Position of the step in its file's test sequence
+            record: CommandRecord with the step's fields
+        """
+        self.file_ids.append(file_id)
+        self.rows.append(row_index)
+        columns = self.columns
+        columns["Command"].append(record.command)
+        columns["Description"].append(record.description)
+        columns["Condition"].append(record.condition)
+        columns["Unit"].append(record.unit)
+        columns["Tolerance"].append(record.tolerance)
+
+    def iter_rows(self):
+        """
+        Iterate steps as tuples of (file path, row, command, description,
+        condition, unit, tolerance).
+        """
+        string_columns = [self.columns[name] for name in self.STRING_COLUMNS]
+        for i, file_id in enumerate(self.file_ids):
+            yield (self.files[file_id], f"R{self.rows[i]:02d}") + tuple(column[i] for column in string_columns)
+
+    def to_dataframe(self):
+        """
+        Build a pandas DataFrame of all steps straight from the column arrays.
+
+        Returns:
+            DataFrame with File, Row and one categorical column per string field
+        """
+        import numpy as np
+        import pandas as pd
+
+        file_codes = np.frombuffer(self.file_ids, dtype=np.uint32).astype(np.int32)
+        frame = {
+            "File": pd.Categorical.from_codes(file_codes, categories=self.files),
+            "Row": np.frombuffer(self.rows, dtype=np.uint32),
+        }
+        for name in self.STRING_COLUMNS:
+            frame[name] = self.columns[name].to_categorical()
+        return pd.DataFrame(frame)
+
+    def files_dataframe(self):
+        """
+        Build a pandas DataFrame with one row of metadata per file.
+
+        Returns:
+            DataFrame indexed by file id
+        """
+        import pandas as pd
+        return pd.DataFrame.from_records(self.metadata).assign(File=self.files)
+
+def decode_batch(file_paths, verbose=False):
+    """
+    Decode many binary files into one ColumnarBatch.
+
+    Args:
+        file_paths: Paths of the binary files to decode
+        verbose: Whether to print verbose output
+
+    Returns:
+        ColumnarBatch holding every file's test sequence
+    """
+    batch = ColumnarBatch()
+
+    for file_path in file_paths:
+        # A file given directly and through its directory is decoded once
+        if file_path in batch or file_path in batch.errors:
+            continue
+        if verbose:
+            print(f"Decoding {file_path}...")
+
+        try:
+            with BinaryReader.from_file(file_path) as reader:
+                metadata, offset = {}, -1
+                if len(reader) >= HEADER_SIZE:
+                    metadata, offset = read_header(reader, HEADER_SIZE)
+
+                # Added only once the whole sequence parsed, a failing file leaves no partial steps
+                records = list(iter_commands(reader, offset, verbose))
+            file_id = batch.add_file(file_path, metadata)
+            for row_index, record in enumerate(records):
+                batch.add_step(file_id, row_index, record)
+        except Exception as e:
+            batch.errors[file_path] = str(e)
+            if verbose:
+                print(f"Error processing file {file_path}: {str(e)}")
+
+    return batch
+
+def write_csv(batch, output_path):
+    """
+    Write every step of a batch to one CSV file.
+
+    Args:
+        batch: ColumnarBatch to write
+        output_path: Output file path
+    """
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(("File", "Row") + ColumnarBatch.STRING_COLUMNS)
+        writer.writerows(batch.iter_rows())
+
+def main():
+    parser = argparse.ArgumentParser(description='Decode many binary spring force test files into one test sequence table.')
+    parser.add_argument('input', nargs='+', help='Input binary files or directories')
+    parser.add_argument('-o', '--output', default='test_sequences.csv', help='Output CSV file')
+    parser.add_argument('-r', '--recursive', action='store_true', help='Process directories recursively')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output')
+
+    args = parser.parse_args()
+
+    file_paths = []
+    for input_path in args.input:
+        if os.path.isdir(input_path):
+            file_paths.extend(list_binary_files(input_path, args.recursive))
+        elif os.path.isfile(input_path):
+            file_paths.append(input_path)
+        else:
+            print(f"Error: {input_path} does not exist")
+
+    batch = decode_batch(file_paths, args.verbose)
+    write_csv(batch, args.output)
+
+    print(f"Decoded {len(batch.files)} files ({len(batch)} steps), {len(batch.errors)} failed")
+
+if __name__ == "__main__":
+    main()
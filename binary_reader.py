@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+
+import mmap
+import struct
+
+from vocabulary import VOCABULARY
+
+# Big-endian 4-byte length prefix used by every string in the file
+LENGTH_PREFIX = struct.Struct('>I')
+
+# Longest string payload extract_string() accepts
+MAX_STRING_LENGTH = 1000
+
+class BinaryReader:
+    """
+    Zero-copy reader for length-prefixed strings in spring force test files.
+    Wraps a memory-mapped file or a caller-supplied buffer as a memoryview,
+    so reading a field only slices the view and decoding happens on demand.
+    """
+
+    def __init__(self, buffer):
+        """
+        Wrap an in-memory buffer.
+
+        Args:
+            buffer: bytes, bytearray, memoryview or any other buffer object
+        """
+        self._mmap = None
+        self.view = memoryview(buffer).cast('B')
+        # Object whose find() indexes match the view, copied lazily if needed
+        self._searchable = buffer if isinstance(buffer, (bytes, bytearray, mmap.mmap)) else None
+
+    @classmethod
+    def from_file(cls, file_path):
+        """
+        Open a file and map it into memory read-only.
+
+        Args:
+            file_path: Path to the binary file
+
+        Returns:
+            BinaryReader over the mapped file
+        """
+        with open(file_path, 'rb') as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                return cls(b'')
+
+        reader = cls(mapped)
+        reader._mmap = mapped
+        return reader
+
+    def __len__(self):
+        return len(self.view)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Release the view and unmap the file if this reader mapped it."""
+        self._searchable = None
+        try:
+            self.view.release()
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+        except BufferError:
+            # Slices handed out to callers are still alive; the garbage
+            # collector unmaps the file once they are dropped
+            pass
+
+    def tobytes(self):
+        """Return a copy of the whole buffer as bytes."""
+        return self.view.tobytes()
+
+    def find(self, needle, start=0, end=None):
+        """
+        Locate a byte sequence with a single C-level search.
+
+        Args:
+            needle: Bytes to look for, e.g. a length-prefixed string
+            start: Offset to start searching from
+            end: Offset the match must end by (default: end of the data)
+
+        Returns:
+            Offset of the first match, or -1 if not found
+        """
+        if self._searchable is None:
+            self._searchable = self.view.tobytes()
+        # mmap.find does not accept None for end
+        return self._searchable.find(needle, start, len(self) if end is None else end)
+
+    def read_length(self, offset):
+        """
+        Read the length prefix at offset.
+
+        Args:
+            offset: Offset of the 4-byte length prefix
+
+        Returns:
+            Payload length, or None if the prefix is missing or implausible
+        """
+        if offset < 0 or offset + 4 > len(self.view):
+            return None
+
+        length = LENGTH_PREFIX.unpack_from(self.view, offset)[0]
+        if length > MAX_STRING_LENGTH or offset + 4 + length > len(self.view):
+            return None
+        return length
+
+    def read_field(self, offset):
+        """
+        Read a length-prefixed field without copying or decoding it.
+
+        Args:
+            offset: Offset of the 4-byte length prefix
+
+        Returns:
+            Tuple of (memoryview payload or None, new_offset)
+        """
+        length = self.read_length(offset)
+        if length is None:
+            return None, offset
+
+        start = offset + 4
+        return self.view[start:start+length], start + length
+
+    def skip_string(self, offset):
+        """
+        Step over a length-prefixed string without decoding it.
+
+        Args:
+            offset: Offset of the 4-byte length prefix
+
+        Returns:
+            Offset just past the string, or offset unchanged if it is invalid
+        """
+        length = self.read_length(offset)
+        if length is None:
+            return offset
+        return offset + 4 + length
+
+    def read_string(self, offset):
+        """
+        Read and decode a length-prefixed string.
+        Behaves like encoder.extract_string().
+
+        Args:
+            offset: Offset of the 4-byte length prefix
+
+        Returns:
+            Tuple of (string, new_offset)
+        """
+        field, new_offset = self.read_field(offset)
+        if field is None:
+            return "", offset
+        return decode_field(field), new_offset
+
+    def has_bytes(self, offset, size):
+        """
+        Check whether size bytes starting at offset are inside the buffer.
+
+        Args:
+            offset: Offset to start from
+            size: Number of bytes needed
+
+        Returns:
+            True if the bytes are available
+        """
+        return offset + size <= len(self.view)
+
+    def is_padding(self, offset, size):
+        """
+        Check whether a block of zero padding starts at offset.
+        Only the first 4 bytes are inspected, like the original encoder.
+
+        Args:
+            offset: Offset of the padding
+            size: Size of the padding block
+
+        Returns:
+            True if the whole block fits in the buffer and starts with zeros
+        """
+        return self.has_bytes(offset, size) and self.is_zero(offset, 4)
+
+    def is_zero(self, offset, size):
+        """
+        Check whether size bytes starting at offset are all zero.
+
+        Args:
+            offset: Offset to start checking from
+            size: Number of bytes to check
+
+        Returns:
+            True if the range is inside the buffer and contains only zeros
+        """
+        if offset + size > len(self.view):
+            return False
+        return not any(self.view[offset:offset+size])
+
+
+def decode_field(field):
+    """
+    Decode a string payload read from a BinaryReader.
+    Goes through the shared vocabulary, so repeated strings are not decoded again.
+
+    Args:
+        field: memoryview or bytes holding the payload
+
+    Returns:
+        Decoded (interned) string
+    """
+    return VOCABULARY.decode(field)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import hashlib
+
+# Bytes hashed at a time when fingerprinting an input file
+HASH_CHUNK_SIZE = 1 << 20
+
+def hash_file(file_path):
+    """
+    Compute the content hash of a file.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        SHA-256 digest as a hex string
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class BuildCache:
+    """
+    Manifest of the inputs a batch converter has already converted.
+    Stored as JSON in the output directory, one manifest per tool. An input
+    is up to date when its content hash, the tool's output version and the
+    conversion options all match the manifest and its outputs still exist.
+    """
+
+    def __init__(self, output_dir, tool, version, options=None):
+        """
+        Args:
+            output_dir: Directory the tool writes its outputs to
+            tool: Name of the converter, e.g. "encoder"
+            version: Output version of the converter, bumped when its output changes
+            options: Dictionary of options that affect the outputs (e.g. output format)
+        """
+        self.path = os.path.join(output_dir, f".{tool}_manifest.json")
+        self.version = version
+        self.options = dict(options or {})
+        self.entries = {}
+        # Digests of the inputs checked in this run, recorded once they are converted
+        self.digests = {}
+        self.skipped = 0
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f).get("entries", {})
+        except (OSError, ValueError):
+            # No manifest yet, or an unreadable one: rebuild everything
+            self.entries = {}
+
+    @staticmethod
+    def _key(input_file):
+        return os.path.abspath(input_file)
+
+    def is_current(self, input_file, digest):
+        """
+        Check whether an input's recorded outputs are up to date.
+
+        Args:
+            input_file: Path to the input file
+            digest: Content hash of the input
+
+        Returns:
+            True if the input does not need converting again
+        """
+        entry = self.entries.get(self._key(input_file))
+        return (entry is not None
+                and entry["hash"] == digest
+                and entry["version"] == self.version
+                and entry["options"] == self.options
+                and all(os.path.exists(path) for path in entry["outputs"]))
+
+    def changed(self, input_files, output_paths):
+        """
+        Select the inputs that need converting.
+        Inputs that write the same output as a changed input are converted
+        again too, so the outputs match a full rebuild.
+
+        Args:
+            input_files: Paths of the input files, in conversion order
+            output_paths: Function returning the list of output paths of an input
+
+        Returns:
+            List of the input files to convert, in the given order
+        """
+        stale = set()
+        owners = {}
+        for input_file in input_files:
+            digest = hash_file(input_file)
+            self.digests[input_file] = digest
+            if not self.is_current(input_file, digest):
+                stale.add(input_file)
+            for path in output_paths(input_file):
+                owners.setdefault(os.path.abspath(path), []).append(input_file)
+
+        for inputs in owners.values():
+            if stale.intersection(inputs):
+                stale.update(inputs)
+
+        selected = [input_file for input_file in input_files if input_file in stale]
+        self.skipped = len(input_files) - len(selected)
+        return selected
+
+    def record(self, input_file, outputs):
+        """
+        Record a successful conversion.
+
+        Args:
+            input_file: Path to the input file, previously passed to changed()
+            outputs: Paths of the files written for it
+        """
+        digest = self.digests.get(input_file) or hash_file(input_file)
+        self.entries[self._key(input_file)] = {
+            "hash": digest,
+            "version": self.version,
+            "options": self.options,
+            "outputs": [os.path.abspath(path) for path in outputs],
+        }
+
+    def forget(self, input_file):
+        """
+        Drop an input from the manifest, e.g. after a failed conversion.
+
+        Args:
+            input_file: Path to the input file
+        """
+        self.entries.pop(self._key(input_file), None)
+
+    def save(self):
+        """Write the manifest, replacing the previous one atomically."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"entries": self.entries}, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import sqlite3
+import argparse
+import datetime
+
+from build_cache import hash_file
+from corpus_summary import decoder_function, force_unit, iter_inputs
+
+# Version of the catalogue tables, bump it when the schema or the stored values change
+SCHEMA_VERSION = 2
+
+# Step rows buffered before they are inserted and committed
+BATCH_ROWS = 50000
+
+# Share of the catalogue that has to change before the indexes are dropped
+# and rebuilt after the load instead of being updated row by row
+REINDEX_FRACTION = 0.2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    hash TEXT NOT NULL,
+    size INTEGER,
+    decoded_at TEXT,
+    part_number TEXT,
+    model_number TEXT,
+    free_length TEXT,
+    force_unit TEXT,
+    steps INTEGER,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS specs (
+    file_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS steps (
+    file_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    row TEXT,
+    command TEXT,
+    description TEXT,
+    condition TEXT,
+    unit TEXT,
+    tolerance TEXT,
+    speed TEXT
+);
+"""
+
+# Secondary indexes, created after a bulk load
+INDEXES = {
+    "steps_file": "steps (file_id)",
+    "steps_command": "steps (command, unit, tolerance)",
+    "specs_file": "specs (file_id)",
+    "specs_name": "specs (name, value)",
+    "files_part_number": "files (part_number)",
+}
+
+class Catalogue:
+    """
+    SQLite database of decoded programs: one row per file, its component
+    specifications and its test sequence steps.
+    Files are keyed by absolute path and content hash, so a load only
+    decodes files that are new or changed. Rows are inserted with
+    executemany in large transactions, in WAL mode.
+    """
+
+    def __init__(self, db_path, options=None):
+        """
+        Args:
+            db_path: Path of the SQLite database, created if missing
+            options: Dictionary of decoder options; files decoded with other options are loaded again
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+        stamp = repr(sorted(dict(options or {}, schema=SCHEMA_VERSION).items()))
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'options'").fetchone()
+        if row is not None and row[0] != stamp:
+            # Everything was decoded differently, start over
+            self.conn.executescript("DELETE FROM steps; DELETE FROM specs; DELETE FROM files;")
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('options', ?)", (stamp,))
+        self.conn.commit()
+
+        self.added = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.removed = 0
+        self.failed = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the database."""
+        self.conn.close()
+
+    def drop_indexes(self):
+        """Drop the secondary indexes before a bulk load."""
+        for name in INDEXES:
+            self.conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+    def create_indexes(self):
+        """Create the secondary indexes that are missing and refresh the query planner statistics."""
+        for name, columns in INDEXES.items():
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {columns}")
+        self.conn.execute("ANALYZE")
+        self.conn.commit()
+
+    def load(self, file_paths, decode, prune=False, verbose=False):
+        """
+        Bring the catalogue up to date with a set of files.
+
+        Args:
+            file_paths: Iterable of paths of the files to catalogue
+            decode: Function returning the decoded data of a file path
+            prune: Whether to remove files that are in the catalogue but not in file_paths
+            verbose: Whether to print verbose output
+        """
+        known = {path: (file_id, digest) for file_id, path, digest in
+                 self.conn.execute("SELECT id, path, hash FROM files")}
+
+        # Hash first, so old rows can be removed while their indexes still exist
+        changed = []
+        seen = set()
+        for file_path in file_paths:
+            path = os.path.abspath(file_path)
+            if path in seen:
+                continue
+            seen.add(path)
+            digest = hash_file(path)
+            entry = known.get(path)
+            if entry is not None and entry[1] == digest:
+                self.unchanged += 1
+                continue
+            changed.append((path, digest, entry is not None))
+
+        stale = [(known[path][0],) for path, _, existed in changed if existed]
+        if prune:
+            stale.extend((file_id,) for path, (file_id, _) in known.items() if path not in seen)
+            self.removed = len(known) - len(seen.intersection(known))
+        self.conn.executemany("DELETE FROM steps WHERE file_id = ?", stale)
+        self.conn.executemany("DELETE FROM specs WHERE file_id = ?", stale)
+        self.conn.executemany("DELETE FROM files WHERE id = ?", stale)
+        self.conn.commit()
+
+        if not changed:
+            self.create_indexes()
+            return
+
+        if len(changed) >= REINDEX_FRACTION * len(known):
+            self.drop_indexes()
+
+        next_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM files").fetchone()[0]
+        files, specs, steps = [], [], []
+        for path, digest, existed in changed:
+            if verbose:
+                print(f"Decoding {path}...")
+            files.append(self._decode_rows(next_id, path, digest, decode, specs, steps, verbose))
+            next_id += 1
+            if existed:
+                self.updated += 1
+            else:
+                self.added += 1
+            if len(steps) >= BATCH_ROWS:
+                self._insert(files, specs, steps)
+
+        self._insert(files, specs, steps)
+        self.create_indexes()
+
+    def _decode_rows(self, file_id, path, digest, decode, specs, steps, verbose):
+        # Appends the file's specs and steps rows and returns its files row
+        decoded_at = datetime.datetime.now().isoformat()
+        size = os.path.getsize(path)
+        try:
+            data = decode(path)
+        except Exception as e:
+            self.failed += 1
+            if verbose:
+                print(f"Error processing file {path}: {str(e)}")
+            return (file_id, path, digest, size, decoded_at, None, None, None, None, 0, str(e))
+
+        # The encoder calls the header "metadata", complete_decoder "component_specifications"
+        metadata = data.get("metadata") or data.get("component_specifications") or {}
+        specs.extend((file_id, name, str(value)) for name, value in metadata.items())
+
+        sequence = data.get("test_sequence", [])
+        steps.extend((file_id, position) + step.to_tuple() for position, step in enumerate(sequence))
+
+        return (file_id, path, digest, size, decoded_at, metadata.get("Part Number"), metadata.get("Model Number"),
+                metadata.get("Free Length"), force_unit(data), len(sequence), None)
+
+    def _insert(self, files, specs, steps):
+        # One transaction per batch
+        with self.conn:
+            self.conn.executemany("INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", files)
+            self.conn.executemany("INSERT INTO specs VALUES (?, ?, ?)", specs)
+            self.conn.executemany("INSERT INTO steps VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", steps)
+        files.clear()
+        specs.clear()
+        steps.clear()
+
+def main():
+    parser = argparse.ArgumentParser(description='Catalogue binary spring force test files in an SQLite database.')
+    parser.add_argument('input', nargs='+', help='Input binary files or directories')
+    parser.add_argument('-o', '--output', default='catalogue.db', help='SQLite database, updated in place')
+    parser.add_argument('-r', '--recursive', action='store_true', help='Process directories recursively')
+    parser.add_argument('-d', '--decoder', choices=['encoder', 'complete'], default='encoder',
+                        help='Decode with encoder.py (fast) or complete_decoder.py (also reads damaged and text files)')
+    parser.add_argument('--scan-mode', choices=['chain', 'scan'], default='chain', help='String search of the complete decoder')
+    parser.add_argument('--prune', action='store_true', help='Remove catalogued files that are not in the inputs any more')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output')
+
+    args = parser.parse_args()
+
+    decode = decoder_function(args.decoder, args.scan_mode)
+    db_path = os.path.abspath(args.output)
+    # The database and its WAL files may live inside a scanned directory
+    file_paths = iter_inputs(args.input, args.recursive, [db_path, f"{db_path}-wal", f"{db_path}-shm"])
+
+    options = {"decoder": args.decoder, "scan_mode": args.scan_mode}
+    with Catalogue(args.output, options) as catalogue:
+        catalogue.load(file_paths, decode, args.prune, args.verbose)
+
+    print(f"Catalogue {args.output}: {catalogue.added} added, {catalogue.updated} updated, "
+          f"{catalogue.unchanged} unchanged, {catalogue.removed} removed, {catalogue.failed} failed",
+          file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+
+import sys
+from functools import lru_cache
+
+from binary_reader import LENGTH_PREFIX
+
+# Size of the fixed file header that precedes the component metadata
+HEADER_SIZE = 13
+
+# Fields of a decoded test sequence command, in the order they appear in entries
+DESCRIPTION = "Description"
+CONDITION = "Condition"
+UNIT = "Unit"
+TOLERANCE = "Tolerance"
+
+# Zero bytes that follow some commands in the binary file
+PADDING_SIZE = 16
+PADDING = b'\x00' * PADDING_SIZE
+
+# Distinct strings pack_string() keeps encoded; programs reuse a small set of values
+PACK_CACHE_SIZE = 4096
+
+# Columns of a decoded test sequence step, in export order
+RECORD_FIELDS = ("Row", "Command", "Description", "Condition", "Unit", "Tolerance", "Speed")
+
+# Entry keys accepted by CommandRecord, complete_decoder and converter call the command "CMD"
+_RECORD_SLOTS = {
+    "Row": "row",
+    "Command": "command",
+    "CMD": "command",
+    "Description": "description",
+    "Condition": "condition",
+    "Unit": "unit",
+    "Tolerance": "tolerance",
+    "Speed": "speed",
+}
+
+class CommandRecord:
+    """
+    One decoded test sequence step.
+    Stores its seven fields in slots instead of a per-step dict, with every
+    value interned so the strings repeated across a corpus are shared.
+    Supports entry["Unit"] / entry.get("CMD") access for code written
+    against the dict form; convert with to_dict() only when exporting.
+    """
+
+    __slots__ = ("row", "command", "description", "condition", "unit", "tolerance", "speed")
+
+    def __init__(self, row="", command="", description="", condition="", unit="", tolerance="", speed=""):
+        intern = sys.intern
+        self.row = intern(row)
+        self.command = intern(command)
+        self.description = intern(description)
+        self.condition = intern(condition)
+        self.unit = intern(unit)
+        self.tolerance = intern(tolerance)
+        self.speed = intern(speed)
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, _RECORD_SLOTS[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        try:
+            setattr(self, _RECORD_SLOTS[key], sys.intern(value))
+        except KeyError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        slot = _RECORD_SLOTS.get(key)
+        if slot is None:
+            return default
+        return getattr(self, slot)
+
+    def __eq__(self, other):
+        if not isinstance(other, CommandRecord):
+            return NotImplemented
+        return self.to_tuple() == other.to_tuple()
+
+    def __repr__(self):
+        return f"CommandRecord({', '.join(repr(value) for value in self.to_tuple())})"
+
+    def to_tuple(self):
+        """Return the field values in RECORD_FIELDS order."""
+        return (self.row, self.command, self.description, self.condition,
+                self.unit, self.tolerance, self.speed)
+
+    def to_dict(self, command_key="Command"):
+        """
+        Convert to the dict form used in JSON and DataFrame exports.
+
+        Args:
+            command_key: Key for the command code ("Command" or "CMD")
+
+        Returns:
+            Dictionary with the fields in RECORD_FIELDS order
+        """
+        return {
+            "Row": self.row,
+            command_key: self.command,
+            "Description": self.description,
+            "Condition": self.condition,
+            "Unit": self.unit,
+            "Tolerance": self.tolerance,
+            "Speed": self.speed,
+        }
+
+def record_columns(command_key="Command"):
+    """
+    Column names matching CommandRecord.to_tuple().
+
+    Args:
+        command_key: Name of the command column ("Command" or "CMD")
+
+    Returns:
+        List of column names
+    """
+    return [command_key if field == "Command" else field for field in RECORD_FIELDS]
+
+def with_record_dicts(data, command_key="Command"):
+    """
+    Shallow copy of a decoded file with its test sequence converted to dicts.
+
+    Args:
+        data: Decoded data dictionary holding CommandRecord steps
+        command_key: Key for the command code ("Command" or "CMD")
+
+    Returns:
+        Dictionary ready for json.dump()
+    """
+    steps = [step.to_dict(command_key) if isinstance(step, CommandRecord) else step
+             for step in data.get("test_sequence", [])]
+    return dict(data, test_sequence=steps)
+
+@lru_cache(maxsize=PACK_CACHE_SIZE)
+def pack_string(string):
+    """
+    Convert a string to binary format with a 4-byte length prefix.
+    Results are cached, so repeated literals are encoded only once per process.
+
+    Args:
+        string: String to convert
+
+    Returns:
+        Binary data as bytes
+    """
+    string_bytes = string.encode('utf-8')
+    return LENGTH_PREFIX.pack(len(string_bytes)) + string_bytes
+
+class CommandLayout:
+    """
+    Binary layout of one test sequence command.
+    Describes the strings that follow the command code, whether the command
+    is followed by 16 bytes of padding, and the values the encoder falls back
+    to when the text form cannot be parsed.
+    """
+
+    def __init__(self, code, fields, padded=False, defaults=None, parse_params=None, split_description=True):
+        """
+        Args:
+            code: Command code as it appears in the file (e.g. "Mv(P)")
+            fields: Entry keys of the strings following the code, in file order
+            padded: Whether the command is followed by 16 bytes of padding
+            defaults: Dictionary of field values used when parsing fails
+            parse_params: Function turning the text after "Description:" into
+                a dictionary of field values, missing fields use the defaults
+            split_description: Whether the text form is "Description: params"
+                (False means the whole text is the description)
+        """
+        self.code = code
+        self.fields = tuple(fields)
+        self.padded = padded
+        self.defaults = dict(defaults or {})
+        self.parse_params = parse_params
+        self.split_description = split_description
+        self._packed_code = pack_string(code)
+
+    def read(self, reader, offset, entry):
+        """
+        Read the command's fields from a BinaryReader into an entry.
+
+        Args:
+            reader: BinaryReader positioned after the command code
+            offset: Offset of the first field
+            entry: CommandRecord (or dictionary) to store the field values in
+
+        Returns:
+            Offset just past the command (including padding)
+        """
+        for field in self.fields:
+            entry[field], offset = reader.read_string(offset)
+
+        # Skip padding bytes if present
+        if self.padded and reader.is_padding(offset, PADDING_SIZE):
+            offset += PADDING_SIZE
+
+        return offset
+
+    def values_from_text(self, rest):
+        """
+        Parse the text form of a command (the part after "CMD - ").
+
+        Args:
+            rest: Text following the command code
+
+        Returns:
+            Dictionary of field values
+        """
+        if not self.split_description:
+            return {DESCRIPTION: rest}
+
+        values = dict(self.defaults)
+        if ":" in rest:
+            description, params = rest.split(":", 1)
+            values[DESCRIPTION] = description.strip()
+            if self.parse_params:
+                values.update(self.parse_params(params.strip()))
+
+        return values
+
+    def pack(self, values):
+        """
+        Encode the command and its field values.
+
+        Args:
+            values: Dictionary of field values, missing fields use the defaults
+
+        Returns:
+            Binary data as bytes
+        """
+        parts = [self._packed_code]
+        for field in self.fields:
+            value = values.get(field)
+            if value is None:
+                value = self.defaults.get(field, "")
+            parts.append(pack_string(str(value)))
+
+        if self.padded:
+            parts.append(PADDING)
+
+        return b''.join(parts)
+
+def _parse_threshold(params):
+    # "10 N, Value: 10"
+    if "," not in params:
+        return {}
+    force_part, value_part = params.split(",", 1)
+    force_parts = force_part.strip().split()
+    if len(force_parts) < 2:
+        return {}
+
+    value = value_part.strip()
+    if value.startswith("Value:"):
+        value = value[6:].strip()
+    return {CONDITION: force_parts[0], UNIT: force_parts[1], TOLERANCE: value}
+
+def _parse_move(params):
+    # "50 mm, Target: 50", "=(R02-10), Target: 50" or just "50"
+    if "," not in params:
+        return {CONDITION: params}
+    position_part, target_part = params.split(",", 1)
+    position_parts = position_part.strip().split()
+
+    target = target_part.strip()
+    if target.startswith("Target:"):
+        target = target[7:].strip()
+
+    if len(position_parts) >= 2:
+        return {CONDITION: position_parts[0], UNIT: position_parts[1], TOLERANCE: target}
+    # Position without unit
+    return {CONDITION: position_part.strip(), TOLERANCE: target}
+
+def _parse_time_delay(params):
+    # "1 Sec"
+    params = params.split()
+    if len(params) < 2:
+        return {}
+    return {CONDITION: params[0], UNIT: params[1]}
+
+def _parse_tolerance(params):
+    # "50(40,60)"
+    return {TOLERANCE: params}
+
+def _parse_condition(params):
+    # "R03,2"
+    return {CONDITION: params}
+
+# Layout of every command the encoder and reverser understand, keyed by code
+COMMAND_LAYOUTS = {layout.code: layout for layout in [
+    CommandLayout("ZF", [DESCRIPTION], padded=True,
+                  split_description=False),
+    CommandLayout("ZD", [DESCRIPTION], padded=True,
+                  split_description=False),
+    CommandLayout("TH", [DESCRIPTION, CONDITION, UNIT, TOLERANCE],
+                  defaults={DESCRIPTION: "Search Contact", CONDITION: "10", UNIT: "N", TOLERANCE: "10"},
+                  parse_params=_parse_threshold),
+    CommandLayout("FL(P)", [DESCRIPTION, UNIT, TOLERANCE],
+                  defaults={DESCRIPTION: "Measure Free Length", UNIT: "mm", TOLERANCE: "50"},
+                  parse_params=_parse_tolerance),
+    CommandLayout("Mv(P)", [DESCRIPTION, CONDITION, UNIT, TOLERANCE],
+                  defaults={DESCRIPTION: "Move to Position", CONDITION: "50", UNIT: "mm", TOLERANCE: "50"},
+                  parse_params=_parse_move),
+    CommandLayout("Fr(P)", [DESCRIPTION, UNIT, TOLERANCE],
+                  defaults={DESCRIPTION: "Force at Position", UNIT: "N", TOLERANCE: "100"},
+                  parse_params=_parse_tolerance),
+    CommandLayout("TD", [DESCRIPTION, CONDITION, UNIT],
+                  defaults={DESCRIPTION: "Time Delay", CONDITION: "1", UNIT: "Sec"},
+                  parse_params=_parse_time_delay),
+    CommandLayout("Scrag", [DESCRIPTION, CONDITION], padded=True,
+                  defaults={DESCRIPTION: "Scragging", CONDITION: "R03,2"},
+                  parse_params=_parse_condition),
+    CommandLayout("PMsg", [DESCRIPTION, CONDITION], padded=True,
+                  defaults={DESCRIPTION: "User Message", CONDITION: "Test Completed"},
+                  parse_params=_parse_condition),
+    CommandLayout("LP", [DESCRIPTION, CONDITION], padded=True,
+                  defaults={DESCRIPTION: "Loop", CONDITION: "R03,3"},
+                  parse_params=_parse_condition),
+]}
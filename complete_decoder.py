@@ -5,12 +5,201 @@ import sys
 import struct
 import re
 import json
-import pandas as pd
 import argparse
 from pathlib import Path
 import binascii
 import io
+import time
 import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from build_cache import BuildCache
+from journal import Journal, atomic_path, atomic_write
+from exporters import ExporterRegistry, write_csv_table
+from hex_dump import write_hex_dump
+from command_schema import CommandRecord, record_columns, with_record_dicts
+from string_scanner import PRINTABLE_ASCII, find_candidate_strings
+from vocabulary import VOCABULARY
+
+# Longest string payload the decoder treats as plausible
+MAX_STRING_LENGTH = 100
+
+# Version of the exported files, bump it when a change alters them so
+# incremental runs decode every file again
+OUTPUT_VERSION = 1
+
+# How far past an invalid length prefix the chain walker searches for the next string
+RESYNC_WINDOW = 64
+
+# CSV file written for each table of table_rows()
+CSV_TABLE_FILES = {
+    "Component Specs": "component_specs.csv",
+    "Test Sequence": "test_sequence.csv",
+    "File Info": "file_info.csv",
+    "Raw Strings": "raw_strings.csv",
+}
+
+# Export formats of LabVIEWDatabaseDecoder, registered on its export methods
+EXPORTERS = ExporterRegistry()
+
+def table_rows(data):
+    """
+    Build the tabular views of a decoded file shared by the Excel and CSV exporters.
+    
+    Args:
+        data: Decoded data dictionary
+        
+    Returns:
+        Dictionary of (columns, rows) keyed by sheet name, in sheet order
+    """
+    tables = {}
+    
+    # Component specifications
+    tables["Component Specs"] = (["Parameter", "Value"], list(data["component_specifications"].items()))
+    
+    # Test sequence
+    if data["test_sequence"]:
+        tables["Test Sequence"] = (record_columns("CMD"), [cmd.to_tuple() for cmd in data["test_sequence"]])
+    
+    # File info
+    tables["File Info"] = (["Attribute", "Value"], list(data["file_info"].items()))
+    
+    # Raw strings if available
+    if "_extracted_strings" in data:
+        tables["Raw Strings"] = (["Index", "Value"], list(enumerate(data["_extracted_strings"])))
+    
+    return tables
+
+def build_tables(data, tables=None):
+    """
+    Build the tables of table_rows() as DataFrames for the Excel exporter.
+    
+    Args:
+        data: Decoded data dictionary
+        tables: Tables from table_rows(data), built here if not given
+        
+    Returns:
+        Dictionary of DataFrames keyed by sheet name, in sheet order
+    """
+    import pandas as pd
+    if tables is None:
+        tables = table_rows(data)
+    return {name: pd.DataFrame.from_records(rows, columns=columns)
+            for name, (columns, rows) in tables.items()}
+
+def write_excel_tables(tables, output_path):
+    """
+    Write tables from build_tables() to an Excel workbook, one sheet each.
+    
+    Args:
+        tables: Dictionary of DataFrames keyed by sheet name
+        output_path: Output file path
+    """
+    import pandas as pd
+    with atomic_path(output_path) as temp_path:
+        with pd.ExcelWriter(temp_path) as writer:
+            for sheet_name, table in tables.items():
+                table.to_excel(writer, sheet_name=sheet_name, index=False)
+
+def _timed_excel_export(tables, output_path):
+    # Runs in an export worker process, returns the time spent writing.
+    # The DataFrames are built here from the table_rows() tables.
+    start = time.perf_counter()
+    write_excel_tables(build_tables(None, tables), output_path)
+    return time.perf_counter() - start
+
+class ExportStage:
+    """
+    Writes every requested format of decoded files with the EXPORTERS writers.
+    Text formats are written on a thread pool and Excel on a process pool; timings holds the seconds per format.
+    """
+    
+    def __init__(self, decoder, formats, threads=4, excel_processes=1):
+        """
+        Args:
+            decoder: LabVIEWDatabaseDecoder whose export methods are used
+            formats: Formats to write (names registered in EXPORTERS)
+            threads: Number of writer threads
+            excel_processes: Number of processes writing Excel files (0 writes them on the threads)
+            
+        Raises:
+            ValueError: If a format is not registered
+            ImportError: If a format needs a package that is not installed
+        """
+        self.decoder = decoder
+        requested = {fmt: EXPORTERS.get(fmt) for fmt in formats}
+        self.exporters = {fmt: requested[fmt] for fmt in EXPORTERS.names() if fmt in requested}
+        self.formats = list(self.exporters)
+        self.threads = ThreadPoolExecutor(max_workers=max(1, threads))
+        self.processes = None
+        if "excel" in self.formats and excel_processes > 0:
+            self.processes = ProcessPoolExecutor(max_workers=excel_processes)
+        # Seconds spent per format (and building tables), summed over all files
+        self.timings = dict.fromkeys(["tables"] + self.formats, 0.0)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Wait for running writers and shut the pools down."""
+        self.threads.shutdown()
+        if self.processes is not None:
+            self.processes.shutdown()
+    
+    def _timed(self, writer, *args, **kwargs):
+        start = time.perf_counter()
+        writer(*args, **kwargs)
+        return time.perf_counter() - start
+    
+    def export(self, data, output_prefix):
+        """
+        Write all formats for one decoded file and wait for them to finish.
+        
+        Args:
+            data: Decoded data dictionary
+            output_prefix: Output path without the format suffix
+            
+        Returns:
+            Dictionary of seconds spent per format for this file
+        """
+        timings = {}
+        tables = None
+        if any(exporter.uses_tables for exporter in self.exporters.values()):
+            # Built once per file and shared by every writer that accepts them
+            start = time.perf_counter()
+            tables = table_rows(data)
+            timings["tables"] = time.perf_counter() - start
+        
+        futures = {}
+        for fmt, exporter in self.exporters.items():
+            if fmt == "excel" and self.processes is not None:
+                output_path = f"{output_prefix}{exporter.suffix}"
+                futures[fmt] = self.processes.submit(_timed_excel_export, tables, output_path)
+            elif exporter.uses_tables:
+                futures[fmt] = self.threads.submit(self._timed, exporter.write, self.decoder, data, output_prefix, tables=tables)
+            else:
+                futures[fmt] = self.threads.submit(self._timed, exporter.write, self.decoder, data, output_prefix)
+        
+        # Wait for every writer before reporting the first failure
+        errors = []
+        for fmt, future in futures.items():
+            try:
+                timings[fmt] = future.result()
+            except Exception as e:
+                errors.append(f"{fmt}: {e}")
+        
+        for fmt, seconds in timings.items():
+            self.timings[fmt] += seconds
+        if errors:
+            raise Exception("; ".join(errors))
+        
+        if self.decoder.verbose and "excel" in futures and self.processes is not None:
+            print(f"Excel file exported to {output_prefix}{self.exporters['excel'].suffix}")
+        
+        return timings
 
 class LabVIEWDatabaseDecoder:
     """
@@ -19,8 +208,11 @@ class LabVIEWDatabaseDecoder:
     It handles component specifications, test sequences, and all embedded metadata.
     """
     
-    def __init__(self, verbose=False):
+    def __init__(self, verbose=False, scan_mode="chain"):
         self.verbose = verbose
+        # "chain" follows the length prefixes from string to string,
+        # "scan" tries every byte offset (the original heuristic)
+        self.scan_mode = scan_mode
         # Command dictionary for translating test commands
         self.command_dict = {
             "ZF": "Zero Force", 
@@ -110,32 +302,14 @@ class LabVIEWDatabaseDecoder:
         }
         
         # Extract string data - any sequence of readable ASCII
-        i = 0
-        strings = []
+        if self.scan_mode == "scan":
+            strings = self._scan_strings(file_data)
+            skipped_bytes = 0
+        else:
+            strings, skipped_bytes = self._walk_length_chain(file_data)
         
-        # Typical LabVIEW pattern: 4 bytes length, then the string
-        while i < len(file_data):
-            # Check for known length marker
-            if i + 4 <= len(file_data):
-                length_bytes = file_data[i:i+4]
-                
-                try:
-                    length = struct.unpack('>I', length_bytes)[0]
-                    
-                    # If we have a valid length between 1 and 100 (reasonable for strings)
-                    if 0 < length <= 100 and i + 4 + length <= len(file_data):
-                        string_data = file_data[i+4:i+4+length]
-                        
-                        # Check if the data is ASCII printable
-                        if all(32 <= b <= 126 for b in string_data):
-                            string_value = string_data.decode('utf-8', errors='replace')
-                            strings.append((i, string_value))
-                            
-                            if self.verbose:
-                                print(f"Found string at offset {i}: {string_value}")
-                except:
-                    pass
-            i += 1
+        result["file_info"]["scan_mode"] = self.scan_mode
+        result["file_info"]["skipped_bytes"] = skipped_bytes
         
         # Extract component specifications from strings
         for i in range(len(strings) - 2):
@@ -170,15 +344,11 @@ class LabVIEWDatabaseDecoder:
                     
                     # Only process if it looks like a command
                     if cmd in self.command_dict or re.match(r'^[A-Za-z]+(\([A-Za-z]+\))?$', cmd):
-                        command_data = {
-                            "Row": f"R{len(result['test_sequence']):02d}",
-                            "CMD": cmd,
-                            "Description": self.command_dict.get(cmd, cmd),
-                            "Condition": "",
-                            "Unit": "",
-                            "Tolerance": "",
-                            "Speed": ""
-                        }
+                        command_data = CommandRecord(
+                            row=f"R{len(result['test_sequence']):02d}",
+                            command=cmd,
+                            description=self.command_dict.get(cmd, cmd)
+                        )
                         
                         # Look ahead for parameters
                         for j in range(i+1, min(i+5, len(strings))):
@@ -213,6 +383,111 @@ class LabVIEWDatabaseDecoder:
         
         return result
     
+    def _scan_strings(self, file_data):
+        """
+        Find length-prefixed strings by testing every byte offset.
+        
+        Args:
+            file_data: Binary data as bytes
+            
+        Returns:
+            List of (offset, string) tuples
+        """
+        strings = []
+        view = memoryview(file_data)
+        
+        # Typical LabVIEW pattern: 4 bytes length, then the string
+        for offset, length in find_candidate_strings(file_data, MAX_STRING_LENGTH):
+            string_value = VOCABULARY.decode(view[offset+4:offset+4+length])
+            strings.append((offset, string_value))
+            
+            if self.verbose:
+                print(f"Found string at offset {offset}: {string_value}")
+        
+        return strings
+    
+    def _read_chained_string(self, file_data, offset, allow_empty=True):
+        """
+        Validate the length-prefixed string starting at offset.
+        
+        Args:
+            file_data: Binary data as bytes
+            offset: Offset of the 4-byte length prefix
+            allow_empty: Whether a zero-length string counts as valid
+            
+        Returns:
+            Offset just past the string, or -1 if the prefix is not a plausible string
+        """
+        if offset + 4 > len(file_data):
+            return -1
+        
+        length = struct.unpack_from('>I', file_data, offset)[0]
+        end = offset + 4 + length
+        if length > MAX_STRING_LENGTH or end > len(file_data):
+            return -1
+        if length == 0:
+            return end if allow_empty else -1
+        
+        # Deleting every printable byte leaves nothing for a valid payload
+        if file_data[offset+4:end].translate(None, PRINTABLE_ASCII):
+            return -1
+        return end
+    
+    def _walk_length_chain(self, file_data):
+        """
+        Find length-prefixed strings by following each prefix to the next string.
+        
+        The file is a LabVIEW 2-D string array: two 4-byte dimensions followed
+        by one length-prefixed string per cell. When a prefix is invalid the
+        walker scans at most RESYNC_WINDOW bytes ahead for the next plausible
+        string and counts the bytes it had to skip.
+        
+        Args:
+            file_data: Binary data as bytes
+            
+        Returns:
+            Tuple of (list of (offset, string) tuples, skipped byte count)
+        """
+        strings = []
+        skipped_bytes = 0
+        offset = 0
+        view = memoryview(file_data)
+        
+        # Skip the array dimensions if the first cell follows them
+        if self._read_chained_string(file_data, 8) >= 0:
+            offset = 8
+        
+        while offset + 4 <= len(file_data):
+            end = self._read_chained_string(file_data, offset)
+            if end >= 0:
+                if end > offset + 4:
+                    string_value = VOCABULARY.decode(view[offset+4:end])
+                    strings.append((offset, string_value))
+                    
+                    if self.verbose:
+                        print(f"Found string at offset {offset}: {string_value}")
+                offset = end
+                continue
+            
+            # Invalid prefix: resync on the next non-empty printable string
+            resync_limit = min(offset + RESYNC_WINDOW, len(file_data) - 4)
+            resync_offset = offset + 1
+            while resync_offset <= resync_limit:
+                if self._read_chained_string(file_data, resync_offset, allow_empty=False) >= 0:
+                    break
+                resync_offset += 1
+            
+            resync_offset = min(resync_offset, len(file_data))
+            if self.verbose:
+                print(f"Invalid length prefix at offset {offset}, skipped {resync_offset - offset} bytes")
+            skipped_bytes += resync_offset - offset
+            offset = resync_offset
+        
+        # Trailing bytes too short to hold a length prefix
+        skipped_bytes += len(file_data) - offset
+        
+        return strings, skipped_bytes
+    
     def decode_text_file(self, file_path):
         """
         Decode the file assuming it's already in text format.
@@ -278,15 +553,11 @@ class LabVIEWDatabaseDecoder:
                         params = ""
                     
                     # Create command entry
-                    command_data = {
-                        "Row": f"R{len(result['test_sequence']):02d}",
-                        "CMD": cmd,
-                        "Description": desc,
-                        "Condition": "",
-                        "Unit": "",
-                        "Tolerance": "",
-                        "Speed": ""
-                    }
+                    command_data = CommandRecord(
+                        row=f"R{len(result['test_sequence']):02d}",
+                        command=cmd,
+                        description=desc
+                    )
                     
                     # Parse parameters
                     if params:
@@ -333,16 +604,12 @@ class LabVIEWDatabaseDecoder:
         hex_dump_path = f"{file_path}_hex_dump.txt"
         
         with open(hex_dump_path, 'w') as f:
-            for i in range(0, len(data), 16):
-                chunk = data[i:i+16]
-                hex_values = ' '.join(f'{b:02x}' for b in chunk)
-                ascii_values = ''.join(chr(b) if 32 <= b <= 126 else '.' for b in chunk)
-                
-                f.write(f"{i:08x}:  {hex_values.ljust(47)}  {ascii_values}\n")
+            write_hex_dump(data, f, style="complete_decoder")
         
         if self.verbose:
             print(f"Hex dump created at: {hex_dump_path}")
     
+    @EXPORTERS.register("json", ".json")
     def export_to_json(self, data, output_path):
         """
         Export the decoded data to JSON format.
@@ -351,98 +618,61 @@ class LabVIEWDatabaseDecoder:
             data: Decoded data dictionary
             output_path: Output file path
         """
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        with atomic_write(output_path, 'w', encoding='utf-8') as f:
+            json.dump(with_record_dicts(data, "CMD"), f, indent=4, ensure_ascii=False)
         
         if self.verbose:
             print(f"JSON file exported to {output_path}")
     
-    def export_to_excel(self, data, output_path):
+    @EXPORTERS.register("excel", ".xlsx", requires=("pandas", "openpyxl"), uses_tables=True)
+    def export_to_excel(self, data, output_path, tables=None):
         """
         Export the decoded data to Excel format.
         
         Args:
             data: Decoded data dictionary
             output_path: Output file path
+            tables: Tables from table_rows(data), built here if not given
         """
-        with pd.ExcelWriter(output_path) as writer:
-            # Write component specifications
-            specs_df = pd.DataFrame([data["component_specifications"]]).T
-            specs_df.columns = ["Value"]
-            specs_df.index.name = "Parameter"
-            specs_df.reset_index(inplace=True)
-            specs_df.to_excel(writer, sheet_name="Component Specs", index=False)
-            
-            # Write test sequence
-            if data["test_sequence"]:
-                test_df = pd.DataFrame(data["test_sequence"])
-                test_df.to_excel(writer, sheet_name="Test Sequence", index=False)
-            
-            # Write file info
-            file_info_df = pd.DataFrame([data["file_info"]]).T
-            file_info_df.columns = ["Value"]
-            file_info_df.index.name = "Attribute"
-            file_info_df.reset_index(inplace=True)
-            file_info_df.to_excel(writer, sheet_name="File Info", index=False)
-            
-            # Write raw strings if available
-            if "_extracted_strings" in data:
-                strings_df = pd.DataFrame(data["_extracted_strings"], columns=["Value"])
-                strings_df.index.name = "Index"
-                strings_df.reset_index(inplace=True)
-                strings_df.to_excel(writer, sheet_name="Raw Strings", index=False)
+        write_excel_tables(build_tables(data, tables), output_path)
         
         if self.verbose:
             print(f"Excel file exported to {output_path}")
     
-    def export_to_csv(self, data, output_dir):
+    @EXPORTERS.register("csv", "_csv", uses_tables=True)
+    def export_to_csv(self, data, output_dir, tables=None):
         """
-        Export the decoded data to CSV format.
+        Export the decoded data to CSV format, one file per table.
         
         Args:
             data: Decoded data dictionary
             output_dir: Output directory
+            tables: Tables from table_rows(data), built here if not given
         """
         os.makedirs(output_dir, exist_ok=True)
         
-        # Write component specifications
-        specs_df = pd.DataFrame([data["component_specifications"]]).T
-        specs_df.columns = ["Value"]
-        specs_df.index.name = "Parameter"
-        specs_df.reset_index(inplace=True)
-        specs_df.to_csv(os.path.join(output_dir, "component_specs.csv"), index=False)
-        
-        # Write test sequence
-        if data["test_sequence"]:
-            test_df = pd.DataFrame(data["test_sequence"])
-            test_df.to_csv(os.path.join(output_dir, "test_sequence.csv"), index=False)
-        
-        # Write file info
-        file_info_df = pd.DataFrame([data["file_info"]]).T
-        file_info_df.columns = ["Value"]
-        file_info_df.index.name = "Attribute"
-        file_info_df.reset_index(inplace=True)
-        file_info_df.to_csv(os.path.join(output_dir, "file_info.csv"), index=False)
-        
-        # Write raw strings if available
-        if "_extracted_strings" in data:
-            strings_df = pd.DataFrame(data["_extracted_strings"], columns=["Value"])
-            strings_df.index.name = "Index"
-            strings_df.reset_index(inplace=True)
-            strings_df.to_csv(os.path.join(output_dir, "raw_strings.csv"), index=False)
+        if tables is None:
+            tables = table_rows(data)
+        for name, (columns, rows) in tables.items():
+            write_csv_table(os.path.join(output_dir, CSV_TABLE_FILES[name]), columns, rows)
         
         if self.verbose:
             print(f"CSV files exported to {output_dir}")
     
-    def export_to_txt(self, data, output_path):
+    @EXPORTERS.register("txt", ".txt", uses_tables=True)
+    def export_to_txt(self, data, output_path, tables=None):
         """
         Export the decoded data to text format.
         
         Args:
             data: Decoded data dictionary
             output_path: Output file path
+            tables: Tables from table_rows(data), built here if not given
         """
-        with open(output_path, 'w', encoding='utf-8') as f:
+        if tables is None:
+            tables = table_rows(data)
+        sequence_rows = tables["Test Sequence"][1] if "Test Sequence" in tables else []
+        with atomic_write(output_path, 'w', encoding='utf-8') as f:
             f.write("=== SPRING TEST FILE DECODED DATA ===\n\n")
             
             # Write file info
@@ -463,9 +693,9 @@ class LabVIEWDatabaseDecoder:
             
             # Write test sequence
             f.write("=== TEST SEQUENCE ===\n")
-            if data["test_sequence"]:
-                headers = ["Row", "CMD", "Description", "Condition", "Unit", "Tolerance", "Speed"]
-                col_widths = [max(len(str(cmd.get(h, ""))) for cmd in data["test_sequence"] + [{"Row": "Row", "CMD": "CMD", "Description": "Description", "Condition": "Condition", "Unit": "Unit", "Tolerance": "Tolerance", "Speed": "Speed"}]) for h in headers]
+            if sequence_rows:
+                headers = record_columns("CMD")
+                col_widths = [max(len(str(value)) for value in column) for column in zip(headers, *sequence_rows)]
                 
                 # Write header
                 header_line = ""
@@ -477,10 +707,10 @@ class LabVIEWDatabaseDecoder:
                 f.write("-" * sum(col_widths) + "-" * (len(headers) * 2) + "\n")
                 
                 # Write data rows
-                for cmd in data["test_sequence"]:
+                for row in sequence_rows:
                     line = ""
-                    for i, h in enumerate(headers):
-                        line += str(cmd.get(h, "")).ljust(col_widths[i] + 2)
+                    for i, value in enumerate(row):
+                        line += str(value).ljust(col_widths[i] + 2)
                     f.write(line + "\n")
             
             # Write raw strings if available
@@ -492,14 +722,19 @@ class LabVIEWDatabaseDecoder:
         if self.verbose:
             print(f"Text file exported to {output_path}")
     
-    def export_to_html(self, data, output_path):
+    @EXPORTERS.register("html", ".html", uses_tables=True)
+    def export_to_html(self, data, output_path, tables=None):
         """
         Export the decoded data to HTML format.
         
         Args:
             data: Decoded data dictionary
             output_path: Output file path
+            tables: Tables from table_rows(data), built here if not given
         """
+        if tables is None:
+            tables = table_rows(data)
+        sequence_rows = tables["Test Sequence"][1] if "Test Sequence" in tables else []
         html = f"""<!DOCTYPE html>
 <html>
 <head>
@@ -559,15 +794,15 @@ class LabVIEWDatabaseDecoder:
 """
         
         # Add test sequence
-        for cmd in data["test_sequence"]:
+        for row, command, description, condition, unit, tolerance, speed in sequence_rows:
             html += f"""                <tr>
-                    <td>{cmd.get("Row", "")}</td>
-                    <td>{cmd.get("CMD", "")}</td>
-                    <td>{cmd.get("Description", "")}</td>
-                    <td>{cmd.get("Condition", "")}</td>
-                    <td>{cmd.get("Unit", "")}</td>
-                    <td>{cmd.get("Tolerance", "")}</td>
-                    <td>{cmd.get("Speed", "")}</td>
+                    <td>{row}</td>
+                    <td>{command}</td>
+                    <td>{description}</td>
+                    <td>{condition}</td>
+                    <td>{unit}</td>
+                    <td>{tolerance}</td>
+                    <td>{speed}</td>
                 </tr>
 """
         
@@ -594,32 +829,40 @@ class LabVIEWDatabaseDecoder:
 </body>
 </html>"""
         
-        with open(output_path, 'w', encoding='utf-8') as f:
+        with atomic_write(output_path, 'w', encoding='utf-8') as f:
             f.write(html)
         
         if self.verbose:
             print(f"HTML file exported to {output_path}")
 
+# Output file suffix of each export format, appended to the output prefix
+EXPORT_SUFFIXES = EXPORTERS.suffixes()
 
 def main():
     parser = argparse.ArgumentParser(description='LabVIEW Database File Decoder')
     parser.add_argument('file_path', help='Path to the LabVIEW database file')
     parser.add_argument('--output', '-o', help='Output directory or file prefix', default='output/')
-    parser.add_argument('--format', '-f', choices=['json', 'excel', 'csv', 'txt', 'html', 'all'], default='all', help='Output format')
+    parser.add_argument('--format', '-f', choices=EXPORTERS.names() + ['all'], default='all', help='Output format')
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose output')
     parser.add_argument('--recursive', '-r', action='store_true', help='Process directories recursively')
+    parser.add_argument('--scan-mode', choices=['chain', 'scan'], default='chain', help='Follow length prefixes (chain) or test every byte offset (scan)')
+    parser.add_argument('--export-threads', type=int, default=4, help='Number of threads writing output formats')
+    parser.add_argument('--excel-processes', type=int, default=1, help='Number of processes writing Excel files (0 writes them on the export threads)')
+    parser.add_argument('--timings', action='store_true', help='Print the time spent per output format')
+    parser.add_argument('--incremental', action='store_true', help='Skip files that have not changed since the last run')
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted directory run from its journal')
     
     args = parser.parse_args()
     
-    decoder = LabVIEWDatabaseDecoder(verbose=args.verbose)
+    decoder = LabVIEWDatabaseDecoder(verbose=args.verbose, scan_mode=args.scan_mode)
     
     # Process single file or directory
     file_paths = []
     if os.path.isdir(args.file_path):
         for root, _, files in os.walk(args.file_path):
             for file in files:
-                # Skip already processed files
-                if file.endswith('_hex_dump.txt') or file.endswith('.json') or file.endswith('.xlsx') or file.endswith('.html') or file.endswith('.txt'):
+                # Skip already processed files, and the journal, manifest and temporary files
+                if file.startswith('.') or file.endswith('_hex_dump.txt') or file.endswith('.json') or file.endswith('.jsonl') or file.endswith('.xlsx') or file.endswith('.html') or file.endswith('.txt'):
                     continue
                 
                 file_path = os.path.join(root, file)
@@ -631,37 +874,74 @@ def main():
     else:
         file_paths = [args.file_path]
     
-    for file_path in file_paths:
+    try:
+        formats = [exporter.name for exporter in EXPORTERS.resolve(args.format)]
+    except ImportError as e:
+        parser.error(str(e))
+    
+    def output_prefix_for(file_path):
+        # Determine output path
+        if os.path.isdir(args.output):
+            return os.path.join(args.output, os.path.basename(file_path))
+        return args.output
+    
+    def output_paths(file_path):
+        output_prefix = output_prefix_for(file_path)
+        return [f"{output_prefix}{EXPORT_SUFFIXES[fmt]}" for fmt in formats]
+    
+    output_dir = args.output if os.path.isdir(args.output) else os.path.dirname(args.output)
+    options = {"format": args.format, "scan_mode": args.scan_mode}
+    
+    # Directory runs record every finished file so an interrupted run can be resumed
+    journal = None
+    if os.path.isdir(args.file_path):
         try:
-            print(f"Processing: {file_path}")
-            data = decoder.decode_file(file_path)
-            
-            # Determine output path
-            if os.path.isdir(args.output):
-                output_prefix = os.path.join(args.output, os.path.basename(file_path))
-            else:
-                output_prefix = args.output
-            
-            # Export based on format
-            if args.format in ['json', 'all']:
-                decoder.export_to_json(data, f"{output_prefix}.json")
-            
-            if args.format in ['excel', 'all']:
-                decoder.export_to_excel(data, f"{output_prefix}.xlsx")
-            
-            if args.format in ['csv', 'all']:
-                decoder.export_to_csv(data, f"{output_prefix}_csv")
-            
-            if args.format in ['txt', 'all']:
-                decoder.export_to_txt(data, f"{output_prefix}.txt")
-            
-            if args.format in ['html', 'all']:
-                decoder.export_to_html(data, f"{output_prefix}.html")
-            
-            print(f"Decoding completed successfully!")
-        except Exception as e:
-            print(f"Error processing {file_path}: {e}")
-
+            journal = Journal(output_dir, "complete_decoder", OUTPUT_VERSION, options, resume=args.resume)
+        except ValueError as e:
+            parser.error(str(e))
+        file_paths = journal.pending(file_paths, output_paths)
+        if journal.skipped:
+            print(f"Resuming: skipping {journal.skipped} files already decoded")
+    
+    cache = None
+    if args.incremental:
+        cache = BuildCache(output_dir, "complete_decoder", OUTPUT_VERSION, options)
+        file_paths = cache.changed(file_paths, output_paths)
+        print(f"Skipping {cache.skipped} unchanged files")
+    
+    decode_seconds = 0.0
+    try:
+        with ExportStage(decoder, formats, args.export_threads, args.excel_processes) as exporter:
+            for file_path in file_paths:
+                try:
+                    print(f"Processing: {file_path}")
+                    start = time.perf_counter()
+                    data = decoder.decode_file(file_path)
+                    decode_seconds += time.perf_counter() - start
+                    
+                    # Export based on format
+                    exporter.export(data, output_prefix_for(file_path))
+                    if cache is not None:
+                        cache.record(file_path, output_paths(file_path))
+                    if journal is not None:
+                        journal.record(file_path, output_paths(file_path))
+                    
+                    print(f"Decoding completed successfully!")
+                except Exception as e:
+                    if cache is not None:
+                        cache.forget(file_path)
+                    print(f"Error processing {file_path}: {e}")
+    finally:
+        if cache is not None:
+            cache.save()
+        if journal is not None:
+            journal.close()
+    
+    if args.timings:
+        print("Time per stage:")
+        print(f"  {'decode':<8} {decode_seconds:8.3f} s")
+        for stage, seconds in exporter.timings.items():
+            print(f"  {stage:<8} {seconds:8.3f} s")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,8 +1,23 @@
 import re
-import pandas as pd
 import os
 import json
 
+from command_schema import CommandRecord, record_columns, with_record_dicts
+from exporters import ExporterRegistry, write_csv_table
+
+# Export formats of SpringFileDecoder, registered on its export methods
+EXPORTERS = ExporterRegistry()
+
+# Columns of the component specifications table
+SPEC_COLUMNS = ['SI No', 'Parameter', 'Unit', 'Value']
+
+def spec_rows(data):
+    """
+    Rows of the component specifications table, in SPEC_COLUMNS order
+    """
+    return [(v.get('SI No', ''), k, v.get('Unit', ''), v.get('Value', ''))
+            for k, v in data['component_specifications'].items()]
+
 class SpringFileDecoder:
     """
     Decoder for spring test files with no extension
@@ -145,15 +160,11 @@ class SpringFileDecoder:
                             rest = rest.strip()
                             parts = re.split(r'([0-9\(\)\,\.]+)([A-Za-z]+)', rest)
                             
-                            step = {
-                                'Row': f'R{row_counter:02d}',
-                                'CMD': cmd,
-                                'Description': self.command_dict.get(cmd, cmd),
-                                'Condition': '',
-                                'Unit': '',
-                                'Tolerance': '',
-                                'Speed': ''
-                            }
+                            step = CommandRecord(
+                                row=f'R{row_counter:02d}',
+                                command=cmd,
+                                description=self.command_dict.get(cmd, cmd)
+                            )
                             
                             if len(parts) >= 3:
                                 step['Condition'] = parts[1]
@@ -189,15 +200,13 @@ class SpringFileDecoder:
                             condition = num_match.group(1) if num_match else ''
                             unit = unit_match.group(1) if unit_match else ''
                             
-                            step = {
-                                'Row': f'R{row_counter:02d}',
-                                'CMD': cmd,
-                                'Description': self.command_dict.get(cmd, cmd),
-                                'Condition': condition,
-                                'Unit': unit,
-                                'Tolerance': '',
-                                'Speed': ''
-                            }
+                            step = CommandRecord(
+                                row=f'R{row_counter:02d}',
+                                command=cmd,
+                                description=self.command_dict.get(cmd, cmd),
+                                condition=condition,
+                                unit=unit
+                            )
                             
                             sequence.append(step)
                             row_counter += 1
@@ -207,27 +216,21 @@ class SpringFileDecoder:
             # Look for specific command patterns in the content
             zf_match = re.search(r'ZF', test_content)
             if zf_match:
-                sequence.append({
-                    'Row': 'R00',
-                    'CMD': 'ZF',
-                    'Description': 'Tare force',
-                    'Condition': '',
-                    'Unit': '',
-                    'Tolerance': '',
-                    'Speed': ''
-                })
+                sequence.append(CommandRecord(
+                    row='R00',
+                    command='ZF',
+                    description='Tare force'
+                ))
             
             th_match = re.search(r'TH\s*([A-Za-z\s]+)\s*(\d+)', test_content)
             if th_match:
-                sequence.append({
-                    'Row': 'R01',
-                    'CMD': 'TH',
-                    'Description': 'Threshold',
-                    'Condition': th_match.group(2),
-                    'Unit': 'N',
-                    'Tolerance': '',
-                    'Speed': ''
-                })
+                sequence.append(CommandRecord(
+                    row='R01',
+                    command='TH',
+                    description='Threshold',
+                    condition=th_match.group(2),
+                    unit='N'
+                ))
             
             # Add more specific pattern matching for other commands
             # ...
@@ -240,33 +243,35 @@ class SpringFileDecoder:
             
             row_counter = 0
             for cmd, desc, unit, value in steps:
-                step = {
-                    'Row': f'R{row_counter:02d}',
-                    'CMD': cmd,
-                    'Description': desc.strip() if desc else self.command_dict.get(cmd, cmd),
-                    'Condition': '',
-                    'Unit': unit if unit else '',
-                    'Tolerance': value if value else '',
-                    'Speed': ''
-                }
+                step = CommandRecord(
+                    row=f'R{row_counter:02d}',
+                    command=cmd,
+                    description=desc.strip() if desc else self.command_dict.get(cmd, cmd),
+                    unit=unit if unit else '',
+                    tolerance=value if value else ''
+                )
                 
                 sequence.append(step)
                 row_counter += 1
         
         return sequence
     
+    @EXPORTERS.register("json", ".json")
     def export_to_json(self, data, output_path):
         """
         Export parsed data to JSON format
         """
         with open(output_path, 'w') as f:
-            json.dump(data, f, indent=4)
+            json.dump(with_record_dicts(data, "CMD"), f, indent=4)
         print(f"JSON file exported to {output_path}")
     
+    @EXPORTERS.register("excel", ".xlsx", requires=("pandas", "openpyxl"))
     def export_to_excel(self, data, output_path):
         """
         Export parsed data to Excel format
         """
+        import pandas as pd
+        
         # Create Excel writer
         with pd.ExcelWriter(output_path) as writer:
             # Component Specifications sheet
@@ -283,11 +288,12 @@ class SpringFileDecoder:
             
             # Test Sequence sheet
             if data['test_sequence']:
-                sequence_df = pd.DataFrame(data['test_sequence'])
+                sequence_df = pd.DataFrame.from_records([step.to_tuple() for step in data['test_sequence']], columns=record_columns("CMD"))
                 sequence_df.to_excel(writer, sheet_name='Test Sequence', index=False)
         
         print(f"Excel file exported to {output_path}")
     
+    @EXPORTERS.register("csv", "_csv")
     def export_to_csv(self, data, output_folder):
         """
         Export parsed data to CSV format
@@ -296,26 +302,17 @@ class SpringFileDecoder:
         os.makedirs(output_folder, exist_ok=True)
         
         # Component Specifications CSV
-        specs_df = pd.DataFrame([
-            {
-                'SI No': v.get('SI No', ''),
-                'Parameter': k,
-                'Unit': v.get('Unit', ''),
-                'Value': v.get('Value', '')
-            }
-            for k, v in data['component_specifications'].items()
-        ])
         specs_path = os.path.join(output_folder, "component_specifications.csv")
-        specs_df.to_csv(specs_path, index=False)
+        write_csv_table(specs_path, SPEC_COLUMNS, spec_rows(data))
         
         # Test Sequence CSV
         if data['test_sequence']:
-            sequence_df = pd.DataFrame(data['test_sequence'])
             sequence_path = os.path.join(output_folder, "test_sequence.csv")
-            sequence_df.to_csv(sequence_path, index=False)
+            write_csv_table(sequence_path, record_columns("CMD"), (step.to_tuple() for step in data['test_sequence']))
         
         print(f"CSV files exported to {output_folder}")
     
+    @EXPORTERS.register("txt", ".txt")
     def export_to_txt(self, data, output_path):
         """
         Export parsed data to readable text format
@@ -348,6 +345,7 @@ class SpringFileDecoder:
         
         print(f"Text file exported to {output_path}")
     
+    @EXPORTERS.register("html", ".html")
     def export_to_html(self, data, output_path):
         """
         Export parsed data to HTML format
@@ -453,11 +451,16 @@ def main():
     parser = argparse.ArgumentParser(description='Spring Test File Decoder')
     parser.add_argument('file_path', help='Path to the spring test file')
     parser.add_argument('--output', '-o', default='output', help='Output directory or file prefix')
-    parser.add_argument('--format', '-f', choices=['json', 'excel', 'csv', 'txt', 'html', 'all'], 
+    parser.add_argument('--format', '-f', choices=EXPORTERS.names() + ['all'], 
                         default='all', help='Output format')
     
     args = parser.parse_args()
     
+    try:
+        exporters = EXPORTERS.resolve(args.format)
+    except ImportError as e:
+        parser.error(str(e))
+    
     # Create decoder instance
     decoder = SpringFileDecoder()
     
@@ -469,20 +472,8 @@ def main():
     os.makedirs(os.path.dirname(args.output) if os.path.dirname(args.output) else '.', exist_ok=True)
     
     # Export data based on selected format
-    if args.format in ['json', 'all']:
-        decoder.export_to_json(data, f"{args.output}.json")
-    
-    if args.format in ['excel', 'all']:
-        decoder.export_to_excel(data, f"{args.output}.xlsx")
-    
-    if args.format in ['csv', 'all']:
-        decoder.export_to_csv(data, f"{args.output}_csv")
-    
-    if args.format in ['txt', 'all']:
-        decoder.export_to_txt(data, f"{args.output}.txt")
-    
-    if args.format in ['html', 'all']:
-        decoder.export_to_html(data, f"{args.output}.html")
+    for exporter in exporters:
+        exporter.write(decoder, data, args.output)
     
     print("Decoding completed successfully!")
 
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+import sys
+import gzip
+import json
+import argparse
+
+try:
+    import orjson
+except ImportError:
+    # The stdlib serializer writes the same records, only slower
+    orjson = None
+
+from command_schema import CommandRecord
+from corpus_summary import decoder_function, iter_inputs
+from journal import atomic_path
+
+# gzip level of compressed streams: close to the smallest output at a fraction of level 9's time
+GZIP_LEVEL = 6
+
+def record_serializer(command_key="Command"):
+    """
+    Build the function that turns a record into one compact JSON line.
+    Uses orjson when it is installed and the stdlib json module otherwise.
+    Test sequence steps are converted while serializing, without copying
+    the decoded data first.
+
+    Args:
+        command_key: Key for the command code of each step ("Command" or "CMD")
+
+    Returns:
+        Function taking a record dictionary and returning the line as UTF-8 bytes
+    """
+    def default(value):
+        if isinstance(value, CommandRecord):
+            return value.to_dict(command_key)
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    if orjson is not None:
+        return lambda record: orjson.dumps(record, default=default, option=orjson.OPT_APPEND_NEWLINE)
+
+    encoder = json.JSONEncoder(default=default, ensure_ascii=False, separators=(',', ':'))
+    return lambda record: (encoder.encode(record) + "\n").encode('utf-8')
+
+def write_corpus(file_paths, stream, decode, command_key="Command", verbose=False):
+    """
+    Decode files one at a time and write one JSON line per program.
+
+    Args:
+        file_paths: Iterable of paths of the files to decode
+        stream: Binary file object the lines are written to
+        decode: Function returning the decoded data of a file path
+        command_key: Key for the command code of each step ("Command" or "CMD")
+        verbose: Whether to print verbose output
+
+    Returns:
+        Tuple of (records_written, error_count)
+    """
+    serialize = record_serializer(command_key)
+    records = 0
+    errors = 0
+
+    for file_path in file_paths:
+        if verbose:
+            print(f"Decoding {file_path}...", file=sys.stderr)
+        try:
+            record = {"file": file_path}
+            record.update(decode(file_path))
+        except Exception as e:
+            errors += 1
+            record = {"file": file_path, "error": str(e)}
+            if verbose:
+                print(f"Error processing file {file_path}: {str(e)}", file=sys.stderr)
+        stream.write(serialize(record))
+        records += 1
+
+    return records, errors
+
+def open_stream(f, compress):
+    """
+    Wrap a binary file object in a gzip stream if requested.
+
+    Args:
+        f: Binary file object
+        compress: Whether to gzip the output
+
+    Returns:
+        Binary file object to write the lines to
+    """
+    if compress:
+        return gzip.GzipFile(fileobj=f, mode='wb', compresslevel=GZIP_LEVEL)
+    return f
+
+def main():
+    parser = argparse.ArgumentParser(description='Write decoded binary spring force test files as one JSON Lines stream.')
+    parser.add_argument('input', nargs='+', help='Input binary files or directories')
+    parser.add_argument('-o', '--output', default='-', help='Output file (- for stdout); a .gz name is compressed')
+    parser.add_argument('-z', '--gzip', action='store_true', help='Compress the output with gzip')
+    parser.add_argument('-r', '--recursive', action='store_true', help='Process directories recursively')
+    parser.add_argument('-d', '--decoder', choices=['encoder', 'complete'], default='encoder',
+                        help='Decode with encoder.py (fast) or complete_decoder.py (also reads damaged and text files)')
+    parser.add_argument('--scan-mode', choices=['chain', 'scan'], default='chain', help='String search of the complete decoder')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output (written to stderr)')
+
+    args = parser.parse_args()
+
+    decode = decoder_function(args.decoder, args.scan_mode)
+    # Same step keys as the per-file JSON of each tool
+    command_key = "CMD" if args.decoder == 'complete' else "Command"
+    compress = args.gzip or args.output.endswith('.gz')
+    # Listed before the output is opened, so neither the output nor its
+    # temporary file next to it can be read back as an input
+    file_paths = list(iter_inputs(args.input, args.recursive, [] if args.output == '-' else [args.output]))
+
+    if args.output == '-':
+        stream = open_stream(sys.stdout.buffer, compress)
+        records, errors = write_corpus(file_paths, stream, decode, command_key, args.verbose)
+        stream.flush()
+        if compress:
+            stream.close()
+    else:
+        # Written in place of the output once complete, a killed run leaves no truncated stream
+        with atomic_path(args.output) as temp_path:
+            with open(temp_path, 'wb') as f, open_stream(f, compress) as stream:
+                records, errors = write_corpus(file_paths, stream, decode, command_key, args.verbose)
+
+    serializer = "orjson" if orjson is not None else "json"
+    print(f"Wrote {records} records ({serializer}), {errors} failed", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import sys
+import json
+import math
+import argparse
+from collections import Counter
+
+from encoder import process_binary_file, iter_binary_files
+
+# Width of the Free Length buckets, in the unit of the Free Length field (mm)
+DEFAULT_BUCKET_SIZE = 10
+
+# Key used for files without a usable Free Length or Force Unit
+UNKNOWN = "unknown"
+
+# Units the test sequence header can name
+FORCE_UNITS = ("N", "kgf", "lbf")
+
+_NUMBER = re.compile(r'[-+]?\d*\.?\d+')
+
+def free_length_bucket(free_length, bucket_size=DEFAULT_BUCKET_SIZE):
+    """
+    Find the bucket of a Free Length value such as "120 mm".
+
+    Args:
+        free_length: Free Length field of a program, or None
+        bucket_size: Width of the buckets
+
+    Returns:
+        Lower bound of the bucket, or None if the value has no number
+    """
+    match = _NUMBER.search(free_length or "")
+    if match is None:
+        return None
+    return math.floor(float(match.group()) / bucket_size) * bucket_size
+
+def force_unit(data):
+    """
+    Find the Force Unit of a decoded program.
+    The encoder stores it in the metadata. complete_decoder has no such
+    field; it decodes the unit that opens the test sequence as a first
+    step whose command and description are both the unit.
+
+    Args:
+        data: Result of encoder.process_binary_file() or LabVIEWDatabaseDecoder.decode_file()
+
+    Returns:
+        Force Unit, or None if the program does not name one
+    """
+    metadata = data.get("metadata") or {}
+    if metadata.get("Force Unit"):
+        return metadata["Force Unit"]
+    sequence = data.get("test_sequence") or []
+    if sequence:
+        first = sequence[0]
+        if first.command in FORCE_UNITS and first.description == first.command:
+            return first.command
+    return None
+
+class CorpusSummary:
+    """
+    Running aggregates over a stream of decoded programs.
+    Only counters are kept, so memory does not grow with the number of
+    files: steps per command, files per Force Unit and per Free Length
+    bucket, and failures per error type.
+    """
+
+    def __init__(self, bucket_size=DEFAULT_BUCKET_SIZE):
+        """
+        Args:
+            bucket_size: Width of the Free Length buckets
+        """
+        self.bucket_size = bucket_size
+        self.files = 0
+        self.steps = 0
+        self.commands = Counter()
+        self.force_units = Counter()
+        self.free_lengths = Counter()
+        self.errors = Counter()
+
+    def add(self, file_path, data):
+        """
+        Add a decoded program to the aggregates.
+
+        Args:
+            file_path: Path of the decoded file
+            data: Result of encoder.process_binary_file() or LabVIEWDatabaseDecoder.decode_file()
+
+        Returns:
+            Per-file record dictionary
+        """
+        # The encoder calls the header "metadata", complete_decoder "component_specifications"
+        metadata = data.get("metadata") or data.get("component_specifications") or {}
+        unit = force_unit(data) or UNKNOWN
+        free_length = metadata.get("Free Length")
+        bucket = free_length_bucket(free_length, self.bucket_size)
+
+        commands = Counter(step.get("Command") or step.get("CMD") for step in data.get("test_sequence", []))
+        steps = sum(commands.values())
+
+        self.files += 1
+        self.steps += steps
+        self.commands.update(commands)
+        self.force_units[unit] += 1
+        self.free_lengths[UNKNOWN if bucket is None else bucket] += 1
+
+        return {
+            "file": file_path,
+            "part_number": metadata.get("Part Number"),
+            "force_unit": unit,
+            "free_length": free_length,
+            "free_length_bucket": self.bucket_label(bucket),
+            "steps": steps,
+            "commands": dict(commands),
+        }
+
+    def add_error(self, file_path, error):
+        """
+        Count a file that could not be decoded.
+
+        Args:
+            file_path: Path of the file
+            error: Exception raised while decoding it
+
+        Returns:
+            Per-file record dictionary
+        """
+        self.errors[type(error).__name__] += 1
+        return {"file": file_path, "error": str(error)}
+
+    def bucket_label(self, bucket):
+        """
+        Format a Free Length bucket.
+
+        Args:
+            bucket: Lower bound from free_length_bucket(), or None
+
+        Returns:
+            Label such as "120-130"
+        """
+        if bucket is None or bucket == UNKNOWN:
+            return UNKNOWN
+        return f"{bucket:g}-{bucket + self.bucket_size:g}"
+
+    def to_dict(self):
+        """
+        Return the aggregates as a JSON-serializable dictionary.
+
+        Returns:
+            Dictionary of totals and counters, most common first
+        """
+        buckets = sorted(bucket for bucket in self.free_lengths if bucket != UNKNOWN)
+        if UNKNOWN in self.free_lengths:
+            buckets.append(UNKNOWN)
+        return {
+            "files": self.files,
+            "steps": self.steps,
+            "failed": sum(self.errors.values()),
+            "commands": dict(self.commands.most_common()),
+            "force_units": dict(self.force_units.most_common()),
+            "free_length_buckets": {self.bucket_label(bucket): self.free_lengths[bucket] for bucket in buckets},
+            "errors": dict(self.errors.most_common()),
+        }
+
+def decoder_function(decoder="encoder", scan_mode="chain"):
+    """
+    Pick the function that decodes one file.
+
+    Args:
+        decoder: "encoder" for encoder.process_binary_file, "complete" for
+            complete_decoder.LabVIEWDatabaseDecoder (also reads damaged and text files)
+        scan_mode: String search of the complete decoder
+
+    Returns:
+        Function taking a file path and returning the decoded data
+    """
+    if decoder == "complete":
+        # Imported here so the encoder path does not load the complete decoder
+        from complete_decoder import LabVIEWDatabaseDecoder
+        return LabVIEWDatabaseDecoder(scan_mode=scan_mode).decode_file
+    return process_binary_file
+
+def iter_inputs(input_paths, recursive=False, exclude=()):
+    """
+    Yield the files to decode one at a time.
+
+    Args:
+        input_paths: Input files and directories
+        recursive: Whether to include subdirectories
+        exclude: Paths to leave out, such as the tool's own output files
+
+    Yields:
+        File paths
+    """
+    excluded = {os.path.abspath(path) for path in exclude}
+    for input_path in input_paths:
+        if os.path.isdir(input_path):
+            file_paths = iter_binary_files(input_path, recursive)
+        elif os.path.isfile(input_path):
+            file_paths = [input_path]
+        else:
+            print(f"Error: {input_path} does not exist", file=sys.stderr)
+            continue
+        for file_path in file_paths:
+            if os.path.abspath(file_path) not in excluded:
+                yield file_path
+
+def summarize(file_paths, records, decode, bucket_size=DEFAULT_BUCKET_SIZE, verbose=False):
+    """
+    Decode files one at a time, writing a JSON line per file as soon as it
+    is decoded. Nothing but the aggregates is kept between files.
+
+    Args:
+        file_paths: Iterable of paths of the files to decode
+        records: Text file object the JSON lines are written to
+        decode: Function returning the decoded data of a file path
+        bucket_size: Width of the Free Length buckets
+        verbose: Whether to print verbose output
+
+    Returns:
+        CorpusSummary with the aggregates
+    """
+    summary = CorpusSummary(bucket_size)
+
+    for file_path in file_paths:
+        if verbose:
+            print(f"Decoding {file_path}...", file=sys.stderr)
+        try:
+            record = summary.add(file_path, decode(file_path))
+        except Exception as e:
+            record = summary.add_error(file_path, e)
+            if verbose:
+                print(f"Error processing file {file_path}: {str(e)}", file=sys.stderr)
+        records.write(json.dumps(record) + "\n")
+        records.flush()
+
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize a corpus of binary spring force test files in constant memory.')
+    parser.add_argument('input', nargs='+', help='Input binary files or directories')
+    parser.add_argument('-o', '--output', default='-', help='JSON lines file with one record per file (- for stdout)')
+    parser.add_argument('-a', '--aggregates', help='Write the aggregates as JSON to this file instead of standard error')
+    parser.add_argument('-r', '--recursive', action='store_true', help='Process directories recursively')
+    parser.add_argument('-d', '--decoder', choices=['encoder', 'complete'], default='encoder',
+                        help='Decode with encoder.py (fast) or complete_decoder.py (also reads damaged and text files)')
+    parser.add_argument('--scan-mode', choices=['chain', 'scan'], default='chain', help='String search of the complete decoder')
+    parser.add_argument('--bucket-size', type=float, default=DEFAULT_BUCKET_SIZE, help='Width of the Free Length buckets in mm')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output (written to stderr)')
+
+    args = parser.parse_args()
+
+    decode = decoder_function(args.decoder, args.scan_mode)
+    # The record and aggregate files may be written inside a scanned directory
+    own_files = [path for path in (args.output, args.aggregates) if path and path != '-']
+    file_paths = iter_inputs(args.input, args.recursive, own_files)
+
+    if args.output == '-':
+        summary = summarize(file_paths, sys.stdout, decode, args.bucket_size, args.verbose)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as records:
+            summary = summarize(file_paths, records, decode, args.bucket_size, args.verbose)
+
+    aggregates = json.dumps(summary.to_dict(), indent=2)
+    if args.aggregates:
+        with open(args.aggregates, 'w', encoding='utf-8') as f:
+            f.write(aggregates + "\n")
+    else:
+        print(aggregates, file=sys.stderr)
+
+    print(f"Summarized {summary.files} files ({summary.steps} steps), {sum(summary.errors.values())} failed",
+          file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import shutil
+
+from build_cache import hash_file
+
+def group_identical(input_files, digests=None):
+    """
+    Group byte-identical input files by content hash.
+
+    Args:
+        input_files: Paths of the input files
+        digests: Optional dictionary of already computed content hashes by path
+
+    Returns:
+        Dictionary mapping each content hash to its files, in listing order
+    """
+    digests = digests or {}
+    groups = {}
+    for input_file in input_files:
+        digest = digests.get(input_file) or hash_file(input_file)
+        groups.setdefault(digest, []).append(input_file)
+    return groups
+
+class DuplicatePlan:
+    """
+    Decides which inputs of a batch have to be converted and which can
+    reuse the outputs of an identical input.
+    A copy is only linked when the result is the same as converting every
+    file in listing order: its outputs are not overwritten by a later input,
+    the outputs of the file it links to hold that file's content at the end
+    of the run, and the two do not share output paths.
+    """
+
+    def __init__(self, input_files, output_paths, digests=None):
+        """
+        Args:
+            input_files: Paths of the input files, in conversion order
+            output_paths: Function returning the list of output paths of an input
+            digests: Optional dictionary of already computed content hashes by path
+        """
+        self.groups = group_identical(input_files, digests)
+        digest_of = {path: digest for digest, paths in self.groups.items() for path in paths}
+        self._output_paths = output_paths
+
+        # Last input writing each output path, as in a serial run
+        owner = {}
+        for input_file in input_files:
+            for path in output_paths(input_file):
+                owner[os.path.abspath(path)] = input_file
+
+        def outputs(input_file):
+            return [os.path.abspath(path) for path in output_paths(input_file)]
+
+        # Pairs of (copy, original) whose outputs are linked instead of converted
+        self.links = []
+        for paths in self.groups.values():
+            original = paths[0]
+            original_outputs = outputs(original)
+            if any(digest_of[owner[path]] != digest_of[original] for path in original_outputs):
+                continue
+            for copy in paths[1:]:
+                copy_outputs = outputs(copy)
+                if (all(owner[path] == copy for path in copy_outputs)
+                        and not set(copy_outputs).intersection(original_outputs)):
+                    self.links.append((copy, original))
+
+        linked = {copy for copy, _ in self.links}
+        self.to_convert = [input_file for input_file in input_files if input_file not in linked]
+
+    def duplicate_groups(self):
+        """Return the groups with more than one file."""
+        return [paths for paths in self.groups.values() if len(paths) > 1]
+
+    def link_outputs(self, failed=()):
+        """
+        Create the outputs of every linked copy from its original's outputs.
+
+        Args:
+            failed: Originals whose conversion failed, their copies are not linked
+
+        Returns:
+            List of (copy, original) pairs that were linked
+        """
+        done = []
+        for copy, original in self.links:
+            if original in failed:
+                continue
+            for source, target in zip(self._output_paths(original), self._output_paths(copy)):
+                # An output the original did not write would not be written
+                # for the copy either, so the copy's path is left as it is
+                if not os.path.exists(source):
+                    continue
+                link_file(source, target)
+            done.append((copy, original))
+        return done
+
+    def report(self):
+        """
+        Build a machine-readable duplicate report.
+
+        Returns:
+            Dictionary with one entry per group of identical inputs
+        """
+        linked = dict(self.links)
+        groups = []
+        for digest, paths in self.groups.items():
+            if len(paths) > 1:
+                groups.append({
+                    "hash": digest,
+                    "files": paths,
+                    "linked": [path for path in paths if path in linked],
+                })
+        return {
+            "groups": groups,
+            "duplicate_files": sum(len(group["files"]) - 1 for group in groups),
+            "conversions_saved": len(self.links),
+        }
+
+    def write_report(self, report_path):
+        """
+        Write the duplicate report as JSON.
+
+        Args:
+            report_path: Output file path
+        """
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+
+def break_hardlink(path):
+    """
+    Remove an output file that shares its data with other files, so writing
+    a new version does not change the linked copies too.
+
+    Args:
+        path: Path of the output about to be written
+    """
+    try:
+        if os.stat(path).st_nlink > 1:
+            os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def link_file(source, target):
+    """
+    Make target a hardlink to source, copying it where links are not supported.
+
+    Args:
+        source: Existing file
+        target: Path to create or replace
+    """
+    if os.path.exists(target):
+        if os.path.samefile(source, target):
+            return
+        os.remove(target)
+    os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        # Different file systems, or a file system without hardlinks
+        shutil.copyfile(source, target)
@@ -6,25 +6,22 @@ import struct
 import argparse
 import json
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
-def create_hex_dump(data, bytes_per_line=16):
-    """
-    Create a hex dump of binary data.
-    
-    Args:
-        data: Binary data as bytes or bytearray
-        bytes_per_line: Number of bytes to display per line
-        
-    Returns:
-        String containing the hex dump
-    """
-    result = []
-    for i in range(0, len(data), bytes_per_line):
-        chunk = data[i:i+bytes_per_line]
-        hex_values = ' '.join(f'{b:02X}' for b in chunk)
-        ascii_values = ''.join(chr(b) if 32 <= b <= 126 else '.' for b in chunk)
-        result.append(f'{i:08X}  {hex_values:<{bytes_per_line*3}}  |{ascii_values}|')
-    return '\n'.join(result)
+from binary_reader import BinaryReader
+from build_cache import BuildCache
+from duplicates import DuplicatePlan
+from journal import Journal, atomic_write
+from hex_dump import create_hex_dump, write_hex_dump
+from command_schema import COMMAND_LAYOUTS, HEADER_SIZE, CommandRecord, pack_string, with_record_dicts
+
+# Version of the text/JSON/hex dump outputs, bump it when a change alters them
+# so incremental runs convert every file again
+OUTPUT_VERSION = 1
+
+# Length-prefixed encodings of the section anchors, each located with one bytes.find
+SECTION_ANCHORS = {name: pack_string(name) for name in
+                   ["Part Number", "Model Number", "Free Length", "<Test Sequence>"]}
 
 def extract_string(data, offset):
     """
@@ -43,7 +40,7 @@ def extract_string(data, offset):
     
     try:
         # Read the 4-byte length prefix (big endian)
-        length = struct.unpack('>I', data[offset:offset+4])[0]
+        length = struct.unpack_from('>I', data, offset)[0]
         offset += 4
         
         # Sanity check for length
@@ -66,6 +63,123 @@ def extract_string(data, offset):
         # If any error occurs, return empty string and original offset
         return "", offset
 
+def read_header(reader, offset):
+    """
+    Read the component metadata and the test sequence header.
+    
+    Args:
+        reader: BinaryReader over the file contents
+        offset: Offset to start searching from (after the file header)
+        
+    Returns:
+        Tuple of (metadata dictionary, offset of the first command or -1
+        if there is no test sequence)
+    """
+    metadata = {}
+    
+    # The header ends at the test sequence marker; field values after it
+    # must not be mistaken for header anchors
+    marker = reader.find(SECTION_ANCHORS["<Test Sequence>"], offset)
+    header_end = marker if marker >= 0 else len(reader)
+    
+    # First try to extract part number, model number, and free length
+    for key in ["Part Number", "Model Number", "Free Length"]:
+        anchor = reader.find(SECTION_ANCHORS[key], offset, header_end)
+        if anchor < 0:
+            continue
+        offset = anchor + len(SECTION_ANCHORS[key])
+        
+        if key == "Free Length":
+            unit, offset = reader.read_string(offset)
+            value, offset = reader.read_string(offset)
+            metadata[key] = f"{value} {unit}"
+        else:
+            offset = reader.skip_string(offset)  # Skip the "--" separator
+            value, offset = reader.read_string(offset)
+            metadata[key] = value
+    
+    if marker < 0:
+        return metadata, -1
+    offset = marker + len(SECTION_ANCHORS["<Test Sequence>"])
+    
+    # Extract force unit
+    force_unit, offset = reader.read_string(offset)
+    metadata["Force Unit"] = force_unit
+    
+    # Skip some fixed values
+    offset = reader.skip_string(offset)  # Skip the "--" separator
+    offset = reader.skip_string(offset)  # Skip "Height"
+    offset = reader.skip_string(offset)  # Skip height value
+    offset = reader.skip_string(offset)  # Skip force range
+    
+    return metadata, offset
+
+def read_command(reader, offset, row_index):
+    """
+    Read one test sequence command.
+    
+    Args:
+        reader: BinaryReader over the file contents
+        offset: Offset of the command code
+        row_index: Row number given to the command
+        
+    Returns:
+        Tuple of (CommandRecord, or None if nothing but an empty or invalid
+        string was found, new_offset)
+    """
+    cmd, new_offset = reader.read_string(offset)
+    if new_offset == offset:
+        # Invalid length prefix, resync on the next byte
+        return None, offset + 1
+    offset = new_offset
+    if not cmd:  # Skip empty commands
+        return None, offset
+    
+    # Create a command entry
+    command_entry = CommandRecord(f"R{row_index:02d}", cmd)
+    
+    # Process based on command type
+    layout = COMMAND_LAYOUTS.get(cmd)
+    if layout is not None:
+        offset = layout.read(reader, offset, command_entry)
+    else:
+        # Unknown command, try to extract next strings
+        for _ in range(3):  # Try to extract up to 3 more strings
+            if reader.has_bytes(offset, 5):
+                value, offset = reader.read_string(offset)
+                if not value:
+                    break
+    
+    return command_entry, offset
+
+def iter_commands(reader, offset, verbose=False):
+    """
+    Read test sequence commands from offset to the end of the file.
+    
+    Args:
+        reader: BinaryReader over the file contents
+        offset: Offset of the first command, as returned by read_header()
+        verbose: Whether to print verbose output
+        
+    Yields:
+        CommandRecord for each command in file order
+    """
+    row_index = 0
+    while offset >= 0 and reader.has_bytes(offset, 5):
+        try:
+            command_entry, offset = read_command(reader, offset, row_index)
+            
+            # Add command to test sequence if it has a valid command
+            if command_entry is not None:
+                row_index += 1
+                yield command_entry
+        
+        except Exception as e:
+            if verbose:
+                print(f"Error processing command at offset {offset}: {str(e)}")
+            # Try to recover by moving to the next potential string
+            offset += 1
+
 def process_binary_file(binary_file_path, verbose=False):
     """
     Process a binary file and extract its contents.
@@ -75,10 +189,24 @@ def process_binary_file(binary_file_path, verbose=False):
         verbose: Whether to print verbose output
         
     Returns:
-        Dictionary containing the extracted data
+        Dictionary containing the extracted data, with CommandRecord test sequence steps
+    """
+    with BinaryReader.from_file(binary_file_path) as reader:
+        return process_binary_data(reader, verbose)
+
+def process_binary_data(data, verbose=False):
+    """
+    Extract the contents of a binary file already held in memory.
+    
+    Args:
+        data: BinaryReader, or a bytes-like buffer to wrap in one
+        verbose: Whether to print verbose output
+        
+    Returns:
+        Dictionary containing the extracted data, with CommandRecord test sequence steps
     """
-    with open(binary_file_path, 'rb') as f:
-        data = f.read()
+    reader = data if isinstance(data, BinaryReader) else BinaryReader(data)
+    data = reader.view
     
     if verbose:
         print(f"File size: {len(data)} bytes")
@@ -91,13 +219,13 @@ def process_binary_file(binary_file_path, verbose=False):
     }
     
     # Try to determine file format based on header
-    if len(data) < 13:
+    if len(data) < HEADER_SIZE:
         if verbose:
             print("File too small to be a valid spring force test file")
         return result
     
     # Check for standard header pattern
-    header_pattern = data[:13]
+    header_pattern = data[:HEADER_SIZE].tobytes()
     standard_header = b'\x00\x00\x00\x12\x00\x00\x00\x06\x00\x00\x00\x01\x31'
     
     if header_pattern != standard_header:
@@ -106,205 +234,15 @@ def process_binary_file(binary_file_path, verbose=False):
             print(f"Expected: {standard_header.hex()}")
             print(f"Found: {header_pattern.hex()}")
     
-    # Start parsing after header
-    offset = 13
-    
-    # Extract metadata
     metadata = {}
     test_sequence = []
     
-    # First try to extract part number, model number, and free length
     try:
-        # Part Number
-        key, offset = extract_string(data, offset)
-        if key == "Part Number":
-            _, offset = extract_string(data, offset)  # Skip the "--" separator
-            value, offset = extract_string(data, offset)
-            metadata["Part Number"] = value
-            
-            # Model Number
-            key, offset = extract_string(data, offset)
-            if key == "Model Number":
-                _, offset = extract_string(data, offset)  # Skip the "--" separator
-                value, offset = extract_string(data, offset)
-                metadata["Model Number"] = value
-                
-                # Free Length
-                key, offset = extract_string(data, offset)
-                if key == "Free Length":
-                    unit, offset = extract_string(data, offset)
-                    value, offset = extract_string(data, offset)
-                    metadata["Free Length"] = f"{value} {unit}"
-        
-        # Look for test sequence marker
-        test_seq_found = False
-        search_offset = offset
-        while search_offset < len(data) - 4 and not test_seq_found:
-            try:
-                key, new_offset = extract_string(data, search_offset)
-                if key == "<Test Sequence>":
-                    offset = new_offset
-                    test_seq_found = True
-                    break
-                search_offset += 1
-            except:
-                search_offset += 1
-            
-        # If we found the test sequence marker, extract force unit
-        if test_seq_found:
-            force_unit, offset = extract_string(data, offset)
-            metadata["Force Unit"] = force_unit
-            
-            # Skip some fixed values
-            _, offset = extract_string(data, offset)  # Skip the "--" separator
-            _, offset = extract_string(data, offset)  # Skip "Height"
-            _, offset = extract_string(data, offset)  # Skip height value
-            _, offset = extract_string(data, offset)  # Skip force range
-            
-            # Process commands until end of file
-            row_index = 0
-            while offset < len(data) - 4:
-                try:
-                    cmd, offset = extract_string(data, offset)
-                    if not cmd:  # Skip empty commands
-                        continue
-                    
-                    # Create a command entry
-                    command_entry = {
-                        "Row": f"R{row_index:02d}",
-                        "Command": cmd,
-                        "Description": "",
-                        "Condition": "",
-                        "Unit": "",
-                        "Tolerance": "",
-                        "Speed": ""
-                    }
-                    
-                    # Process based on command type
-                    if cmd == "ZF":
-                        description, offset = extract_string(data, offset)
-                        command_entry["Description"] = description
-                        # Skip padding bytes if present
-                        if offset + 16 <= len(data):
-                            padding_check = data[offset:offset+4]
-                            if all(b == 0 for b in padding_check):
-                                offset += 16
-                    
-                    elif cmd == "ZD":
-                        description, offset = extract_string(data, offset)
-                        command_entry["Description"] = description
-                        # Skip padding bytes if present
-                        if offset + 16 <= len(data):
-                            padding_check = data[offset:offset+4]
-                            if all(b == 0 for b in padding_check):
-                                offset += 16
-                    
-                    elif cmd == "TH":
-                        description, offset = extract_string(data, offset)
-                        force, offset = extract_string(data, offset)
-                        unit, offset = extract_string(data, offset)
-                        value, offset = extract_string(data, offset)
-                        
-                        command_entry["Description"] = description
-                        command_entry["Condition"] = force
-                        command_entry["Unit"] = unit
-                        command_entry["Tolerance"] = value
-                    
-                    elif cmd == "FL(P)":
-                        description, offset = extract_string(data, offset)
-                        unit, offset = extract_string(data, offset)
-                        value, offset = extract_string(data, offset)
-                        
-                        command_entry["Description"] = description
-                        command_entry["Unit"] = unit
-                        command_entry["Tolerance"] = value
-                    
-                    elif cmd == "Mv(P)":
-                        description, offset = extract_string(data, offset)
-                        position, offset = extract_string(data, offset)
-                        unit, offset = extract_string(data, offset)
-                        target, offset = extract_string(data, offset)
-                        
-                        command_entry["Description"] = description
-                        command_entry["Condition"] = position
-                        command_entry["Unit"] = unit
-                        command_entry["Tolerance"] = target
-                    
-                    elif cmd == "Fr(P)":
-                        description, offset = extract_string(data, offset)
-                        unit, offset = extract_string(data, offset)
-                        value, offset = extract_string(data, offset)
-                        
-                        command_entry["Description"] = description
-                        command_entry["Unit"] = unit
-                        command_entry["Tolerance"] = value
-                    
-                    elif cmd == "TD":
-                        description, offset = extract_string(data, offset)
-                        time, offset = extract_string(data, offset)
-                        unit, offset = extract_string(data, offset)
-                        
-                        command_entry["Description"] = description
-                        command_entry["Condition"] = time
-                        command_entry["Unit"] = unit
-                    
-                    elif cmd == "Scrag":
-                        description, offset = extract_string(data, offset)
-                        value, offset = extract_string(data, offset)
-                        
-                        command_entry["Description"] = description
-                        command_entry["Condition"] = value
-                        
-                        # Skip padding bytes if present
-                        if offset + 16 <= len(data):
-                            padding_check = data[offset:offset+4]
-                            if all(b == 0 for b in padding_check):
-                                offset += 16
-                    
-                    elif cmd == "PMsg":
-                        description, offset = extract_string(data, offset)
-                        message, offset = extract_string(data, offset)
-                        
-                        command_entry["Description"] = description
-                        command_entry["Condition"] = message
-                        
-                        # Skip padding bytes if present
-                        if offset + 16 <= len(data):
-                            padding_check = data[offset:offset+4]
-                            if all(b == 0 for b in padding_check):
-                                offset += 16
-                    
-                    elif cmd == "LP":
-                        description, offset = extract_string(data, offset)
-                        loop_info, offset = extract_string(data, offset)
-                        
-                        command_entry["Description"] = description
-                        command_entry["Condition"] = loop_info
-                        
-                        # Skip padding bytes if present
-                        if offset + 16 <= len(data):
-                            padding_check = data[offset:offset+4]
-                            if all(b == 0 for b in padding_check):
-                                offset += 16
-                    
-                    else:
-                        # Unknown command, try to extract next strings
-                        for _ in range(3):  # Try to extract up to 3 more strings
-                            if offset < len(data) - 4:
-                                value, offset = extract_string(data, offset)
-                                if not value:
-                                    break
-                    
-                    # Add command to test sequence if it has a valid command
-                    if command_entry["Command"]:
-                        test_sequence.append(command_entry)
-                        row_index += 1
-                
-                except Exception as e:
-                    if verbose:
-                        print(f"Error processing command at offset {offset}: {str(e)}")
-                    # Try to recover by moving to the next potential string
-                    offset += 1
+        # Start parsing after header
+        metadata, offset = read_header(reader, HEADER_SIZE)
+        
+        # Process commands until end of file
+        test_sequence = list(iter_commands(reader, offset, verbose))
     
     except Exception as e:
         if verbose:
@@ -343,11 +281,11 @@ def format_as_text(data):
     
     # Add test sequence
     for cmd in data["test_sequence"]:
-        command = cmd["Command"]
-        description = cmd["Description"]
-        condition = cmd["Condition"]
-        unit = cmd["Unit"]
-        tolerance = cmd["Tolerance"]
+        command = cmd.command
+        description = cmd.description
+        condition = cmd.condition
+        unit = cmd.unit
+        tolerance = cmd.tolerance
         
         # Format based on command type
         if command == "ZF":
@@ -399,7 +337,146 @@ def format_as_text(data):
     
     return "\n".join(lines)
 
-def process_file(input_file, output_dir, output_format="all", verbose=False):
+def output_base_name(input_file):
+    """
+    Name the outputs of an input file are saved under, without extension.
+    
+    Args:
+        input_file: Path to the input binary file
+        
+    Returns:
+        Base output filename
+    """
+    return Path(input_file).stem.replace('~', '_').replace(' ', '_')
+
+class EncoderPipeline:
+    """
+    Converts binary files with a single read per input.
+    The buffer read from disk is handed to the parser, the hex dump writer
+    and every output formatter, and is kept until the next input so a viewer
+    can show the last converted file without reading it again.
+    """
+    
+    def __init__(self, output_dir, output_format="all", hex_dump=True, verbose=False):
+        """
+        Args:
+            output_dir: Directory to save output files
+            output_format: Output format (txt, json, all, or none to skip both)
+            hex_dump: Whether to write the hex dump of each input
+            verbose: Whether to print verbose output
+        """
+        self.output_dir = output_dir
+        self.write_txt = output_format in ['txt', 'all']
+        self.write_json = output_format in ['json', 'all']
+        self.write_hex_dump = hex_dump
+        self.verbose = verbose
+        # Absolute path and contents of the last input read
+        self.input_file = None
+        self.buffer = None
+    
+    def read(self, input_file, reuse=True):
+        """
+        Read an input file, reusing the buffer if it is the last file read.
+        
+        Args:
+            input_file: Path to the input binary file
+            reuse: Whether the buffer of the last file read may be returned
+            
+        Returns:
+            File contents as bytes
+        """
+        input_file = os.path.abspath(input_file)
+        if not reuse or input_file != self.input_file or self.buffer is None:
+            with open(input_file, 'rb') as f:
+                self.buffer = f.read()
+            self.input_file = input_file
+        return self.buffer
+    
+    def output_paths(self, input_file):
+        """
+        Paths of the files run() writes for an input file.
+        
+        Args:
+            input_file: Path to the input binary file
+            
+        Returns:
+            List of output paths
+        """
+        base_name = output_base_name(input_file)
+        paths = []
+        if self.write_hex_dump:
+            paths.append(os.path.join(self.output_dir, "encoder", f"{base_name}_hex_dump.txt"))
+        if self.write_txt:
+            paths.append(os.path.join(self.output_dir, f"{base_name}.txt"))
+        if self.write_json:
+            paths.append(os.path.join(self.output_dir, f"{base_name}.json"))
+        return paths
+    
+    def hex_dump(self, input_file):
+        """
+        Build the hex dump of an input file from the shared buffer.
+        
+        Args:
+            input_file: Path to the input binary file
+            
+        Returns:
+            Hex dump as a string
+        """
+        return create_hex_dump(self.read(input_file))
+    
+    def run(self, input_file):
+        """
+        Run the enabled stages over one input file.
+        
+        Args:
+            input_file: Path to the input binary file
+            
+        Returns:
+            Tuple of (success, error_message)
+        """
+        try:
+            # Create output directory if it doesn't exist
+            os.makedirs(self.output_dir, exist_ok=True)
+            os.makedirs(os.path.join(self.output_dir, "encoder"), exist_ok=True)
+            
+            # Read the input once, a file converted again may have changed on disk
+            buffer = self.read(input_file, reuse=False)
+            
+            # Process the binary data
+            if self.write_txt or self.write_json:
+                data = process_binary_data(buffer, self.verbose)
+            
+            # Generate base output filename
+            base_name = output_base_name(input_file)
+            
+            # Create hex dump
+            if self.write_hex_dump:
+                hex_output_path = os.path.join(self.output_dir, "encoder", f"{base_name}_hex_dump.txt")
+                with atomic_write(hex_output_path, 'w', encoding='utf-8') as f:
+                    write_hex_dump(buffer, f)
+            
+            # Save as text if requested
+            if self.write_txt:
+                text_output = format_as_text(data)
+                txt_output_path = os.path.join(self.output_dir, f"{base_name}.txt")
+                with atomic_write(txt_output_path, 'w', encoding='utf-8') as f:
+                    f.write(text_output)
+            
+            # Save as JSON if requested
+            if self.write_json:
+                json_output_path = os.path.join(self.output_dir, f"{base_name}.json")
+                with atomic_write(json_output_path, 'w', encoding='utf-8') as f:
+                    json.dump(with_record_dicts(data), f, indent=2)
+            
+            return True, ""
+        
+        except Exception as e:
+            error_message = f"Error processing file {input_file}: {str(e)}"
+            if self.verbose:
+                print(error_message)
+            return False, error_message
+
+def process_file(input_file, output_dir, output_format="all", verbose=False, hex_dump=True):
     """
     Process a single binary file and convert it to text/JSON.
     
@@ -408,52 +485,119 @@ def process_file(input_file, output_dir, output_format="all", verbose=False):
         output_dir: Directory to save output files
         output_format: Output format (txt, json, or all)
         verbose: Whether to print verbose output
+        hex_dump: Whether to write the hex dump
         
     Returns:
         Tuple of (success, error_message)
     """
-    try:
-        # Create output directory if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
-        os.makedirs(os.path.join(output_dir, "encoder"), exist_ok=True)
-        
-        # Process the binary file
-        data = process_binary_file(input_file, verbose)
-        
-        # Generate base output filename
-        base_name = Path(input_file).stem.replace('~', '_').replace(' ', '_')
-        
-        # Create hex dump
-        with open(input_file, 'rb') as f:
-            binary_data = f.read()
+    return EncoderPipeline(output_dir, output_format, hex_dump, verbose).run(input_file)
+
+def is_input_name(filename):
+    """
+    Check whether a file name can be a binary input. Text and JSON outputs
+    and dotfiles (journals, manifests and temporary files written by the
+    tools) are not.
+    
+    Args:
+        filename: File name without its directory
         
-        hex_dump = create_hex_dump(binary_data)
-        hex_output_path = os.path.join(output_dir, "encoder", f"{base_name}_hex_dump.txt")
-        with open(hex_output_path, 'w', encoding='utf-8') as f:
-            f.write(hex_dump)
+    Returns:
+        True if the file should be decoded
+    """
+    return not filename.startswith('.') and not filename.endswith(('.txt', '.json', '.jsonl'))
+
+def iter_binary_files(input_dir, recursive=False):
+    """
+    Yield the binary files in a directory one at a time, skipping outputs and dotfiles.
+    
+    Args:
+        input_dir: Directory containing input binary files
+        recursive: Whether to include subdirectories
         
-        # Save as text if requested
-        if output_format in ['txt', 'all']:
-            text_output = format_as_text(data)
-            txt_output_path = os.path.join(output_dir, f"{base_name}.txt")
-            with open(txt_output_path, 'w', encoding='utf-8') as f:
-                f.write(text_output)
+    Yields:
+        File paths, in the order list_binary_files() returns them
+    """
+    if recursive:
+        for root, _, filenames in os.walk(input_dir):
+            for filename in filenames:
+                if is_input_name(filename):
+                    yield os.path.join(root, filename)
+        return
+    
+    for f in os.listdir(input_dir):
+        if os.path.isfile(os.path.join(input_dir, f)) and is_input_name(f):
+            yield os.path.join(input_dir, f)
+
+def list_binary_files(input_dir, recursive=False):
+    """
+    List the binary files in a directory, skipping outputs and dotfiles.
+    
+    Args:
+        input_dir: Directory containing input binary files
+        recursive: Whether to include subdirectories
         
-        # Save as JSON if requested
-        if output_format in ['json', 'all']:
-            json_output_path = os.path.join(output_dir, f"{base_name}.json")
-            with open(json_output_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+    Returns:
+        List of file paths
+    """
+    return list(iter_binary_files(input_dir, recursive))
+
+# Pipeline of the current pool worker, created once per worker process
+_worker_pipeline = None
+
+def _init_worker(output_dir, output_format, hex_dump):
+    global _worker_pipeline
+    _worker_pipeline = EncoderPipeline(output_dir, output_format, hex_dump)
+
+def _run_worker_group(file_paths):
+    return [(file_path, _worker_pipeline.run(file_path)) for file_path in file_paths]
+
+def _group_by_output(files):
+    # Files that write the same output names stay together, in listing
+    # order, so the last one wins just like in a serial run
+    groups = {}
+    for file_path in files:
+        groups.setdefault(output_base_name(file_path), []).append(file_path)
+    return list(groups.values())
+
+def iter_conversions(files, output_dir, output_format="all", hex_dump=True, jobs=1, verbose=False):
+    """
+    Convert files, yielding each result as soon as it is available.
+    With jobs > 1 the files are converted by a process pool; results are
+    still yielded in a fixed order that does not depend on which worker
+    finishes first.
+    
+    Args:
+        files: Paths of the input binary files
+        output_dir: Directory to save output files
+        output_format: Output format (txt, json, or all)
+        hex_dump: Whether to write a hex dump of each file
+        jobs: Number of worker processes
+        verbose: Whether to print verbose output
         
-        return True, ""
+    Yields:
+        Tuples of (file_path, (success, error_message))
+    """
+    if jobs <= 1:
+        pipeline = EncoderPipeline(output_dir, output_format, hex_dump, verbose)
+        for file_path in files:
+            if verbose:
+                print(f"Processing {file_path}...")
+            yield file_path, pipeline.run(file_path)
+        return
     
-    except Exception as e:
-        error_message = f"Error processing file {input_file}: {str(e)}"
-        if verbose:
-            print(error_message)
-        return False, error_message
+    groups = _group_by_output(files)
+    # A few chunks per worker keeps the workers busy without one IPC round trip per file
+    chunksize = max(1, len(groups) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(output_dir, output_format, hex_dump)) as executor:
+        for results in executor.map(_run_worker_group, groups, chunksize=chunksize):
+            for file_path, result in results:
+                if verbose:
+                    print(f"Processed {file_path}")
+                yield file_path, result
 
-def process_directory(input_dir, output_dir, output_format="all", recursive=False, verbose=False):
+def process_directory(input_dir, output_dir, output_format="all", recursive=False, verbose=False, hex_dump=True, jobs=1,
+                      incremental=False, dedupe=False, duplicate_report=None, journal=None):
     """
     Process all binary files in a directory.
     
@@ -463,6 +607,12 @@ def process_directory(input_dir, output_dir, output_format="all", recursive=Fals
         output_format: Output format (txt, json, or all)
         recursive: Whether to process subdirectories recursively
         verbose: Whether to print verbose output
+        hex_dump: Whether to write a hex dump of each file
+        jobs: Number of worker processes (1 converts in this process)
+        incremental: Whether to skip files whose outputs are up to date in the build manifest
+        dedupe: Whether to convert byte-identical files once and hardlink the copies' outputs
+        duplicate_report: Path to write a JSON report of the identical files to (requires dedupe)
+        journal: Journal to record finished files in; files it already has are skipped
         
     Returns:
         Tuple of (success_count, error_count)
@@ -471,30 +621,69 @@ def process_directory(input_dir, output_dir, output_format="all", recursive=Fals
     error_count = 0
     
     # Get list of files to process
-    if recursive:
-        files = []
-        for root, _, filenames in os.walk(input_dir):
-            for filename in filenames:
-                if not filename.endswith('.txt') and not filename.endswith('.json'):
-                    files.append(os.path.join(root, filename))
-    else:
-        files = [os.path.join(input_dir, f) for f in os.listdir(input_dir) 
-                if os.path.isfile(os.path.join(input_dir, f)) 
-                and not f.endswith('.txt') and not f.endswith('.json')]
+    files = list_binary_files(input_dir, recursive)
+    pipeline = EncoderPipeline(output_dir, output_format, hex_dump)
     
-    # Process each file
-    for file_path in files:
+    if journal is not None:
+        files = journal.pending(files, pipeline.output_paths)
+        success_count += journal.skipped
+        if verbose and journal.skipped:
+            print(f"Resuming: skipping {journal.skipped} files already converted")
+    
+    cache = None
+    digests = {}
+    if incremental:
+        cache = BuildCache(output_dir, "encoder", OUTPUT_VERSION, {"format": output_format, "hex_dump": hex_dump})
+        files = cache.changed(files, pipeline.output_paths)
+        digests = cache.digests
+        success_count += cache.skipped
         if verbose:
-            print(f"Processing {file_path}...")
-        
-        success, error = process_file(file_path, output_dir, output_format, verbose)
+            print(f"Skipping {cache.skipped} unchanged files")
+    
+    plan = None
+    if dedupe:
+        plan = DuplicatePlan(files, pipeline.output_paths, digests)
+        files = plan.to_convert
+    
+    # Process each file
+    failed = set()
+    try:
+        for file_path, (success, error) in iter_conversions(files, output_dir, output_format, hex_dump, jobs, verbose):
+            if success:
+                success_count += 1
+                if cache is not None:
+                    cache.record(file_path, pipeline.output_paths(file_path))
+                if journal is not None:
+                    journal.record(file_path, pipeline.output_paths(file_path))
+            else:
+                error_count += 1
+                failed.add(file_path)
+                if cache is not None:
+                    cache.forget(file_path)
+                if verbose:
+                    print(error)
         
-        if success:
-            success_count += 1
-        else:
-            error_count += 1
-            if verbose:
-                print(error)
+        if plan is not None:
+            # Copies share the outputs of the identical file converted above
+            for copy, original in plan.links:
+                if original in failed:
+                    error_count += 1
+                    if cache is not None:
+                        cache.forget(copy)
+            for copy, original in plan.link_outputs(failed):
+                success_count += 1
+                if cache is not None:
+                    cache.record(copy, pipeline.output_paths(copy))
+                if journal is not None:
+                    journal.record(copy, pipeline.output_paths(copy))
+                if verbose:
+                    print(f"Linked outputs of {copy} to {original}")
+            
+            if duplicate_report:
+                plan.write_report(duplicate_report)
+    finally:
+        if cache is not None:
+            cache.save()
     
     return success_count, error_count
 
@@ -502,8 +691,14 @@ def main():
     parser = argparse.ArgumentParser(description='Convert binary spring force test files to text/JSON format.')
     parser.add_argument('input', nargs='+', help='Input binary files or directories')
     parser.add_argument('-o', '--output', default='output', help='Output directory')
-    parser.add_argument('-f', '--format', choices=['txt', 'json', 'all'], default='all', help='Output format')
+    parser.add_argument('-f', '--format', choices=['txt', 'json', 'all', 'none'], default='all', help='Output format (none writes only hex dumps)')
     parser.add_argument('-r', '--recursive', action='store_true', help='Process directories recursively')
+    parser.add_argument('--no-hex-dump', dest='hex_dump', action='store_false', help='Do not write hex dumps')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='Number of worker processes for directories')
+    parser.add_argument('--incremental', action='store_true', help='Skip files in directories that have not changed since the last run')
+    parser.add_argument('--dedupe', action='store_true', help='Convert identical files in directories once and hardlink the outputs of the copies')
+    parser.add_argument('--duplicate-report', help='Write a JSON report of the identical files found by --dedupe to this file')
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted directory run from its journal')
     parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output')
     
     args = parser.parse_args()
@@ -511,12 +706,23 @@ def main():
     total_success = 0
     total_error = 0
     
+    # Directory runs record every finished file so an interrupted run can be resumed
+    journal = None
+    if any(os.path.isdir(input_path) for input_path in args.input):
+        try:
+            journal = Journal(args.output, "encoder", OUTPUT_VERSION,
+                              {"format": args.format, "hex_dump": args.hex_dump}, resume=args.resume)
+        except ValueError as e:
+            parser.error(str(e))
+    
     for input_path in args.input:
         if os.path.isdir(input_path):
             if args.verbose:
                 print(f"Processing directory {input_path}...")
             
-            success, error = process_directory(input_path, args.output, args.format, args.recursive, args.verbose)
+            success, error = process_directory(input_path, args.output, args.format, args.recursive,
+                                              args.verbose, args.hex_dump, args.jobs, args.incremental,
+                                              args.dedupe, args.duplicate_report, journal)
             total_success += success
             total_error += error
         
@@ -524,7 +730,7 @@ def main():
             if args.verbose:
                 print(f"Processing file {input_path}...")
             
-            success, error = process_file(input_path, args.output, args.format, args.verbose)
+            success, error = process_file(input_path, args.output, args.format, args.verbose, args.hex_dump)
             
             if success:
                 total_success += 1
@@ -536,6 +742,9 @@ def main():
         else:
             print(f"Error: {input_path} does not exist")
     
+    if journal is not None:
+        journal.close()
+    
     print(f"Processed {total_success + total_error} files: {total_success} successful, {total_error} failed")
 
 if __name__ == "__main__":
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+import os
+import csv
+from importlib.util import find_spec
+
+from journal import atomic_path
+
+class Exporter:
+    """
+    One output format of a decoder: its file suffix, the optional packages
+    it needs and the function that writes it. Writers import their
+    packages themselves, so nothing is loaded until the format is used.
+    """
+
+    def __init__(self, name, suffix, writer, requires=(), uses_tables=False):
+        """
+        Args:
+            name: Format name used on the command line, e.g. "excel"
+            suffix: Suffix appended to the output prefix, e.g. ".xlsx"
+            writer: Function called as writer(decoder, data, output_path, **options)
+            requires: Names of the packages the writer imports
+            uses_tables: Whether the writer accepts the decoder's prebuilt tables as tables=
+        """
+        self.name = name
+        self.suffix = suffix
+        self.writer = writer
+        self.requires = tuple(requires)
+        self.uses_tables = uses_tables
+
+    def missing(self):
+        """Return the required packages that are not installed."""
+        return [package for package in self.requires if find_spec(package) is None]
+
+    def write(self, decoder, data, output_prefix, **options):
+        """
+        Write data in this format.
+
+        Args:
+            decoder: Decoder instance the writer belongs to
+            data: Decoded data dictionary
+            output_prefix: Output path without the format suffix
+            **options: Extra arguments for the writer
+
+        Returns:
+            Path written
+        """
+        output_path = f"{output_prefix}{self.suffix}"
+        self.writer(decoder, data, output_path, **options)
+        return output_path
+
+class ExporterRegistry:
+    """
+    Output formats of a decoder, in registration order.
+    Writers are registered with the register() decorator, usually on the
+    decoder's export methods.
+    """
+
+    def __init__(self):
+        self._exporters = {}
+
+    def register(self, name, suffix, requires=(), uses_tables=False):
+        """
+        Decorator registering a writer function for a format.
+
+        Args:
+            name: Format name
+            suffix: Suffix appended to the output prefix
+            requires: Names of the packages the writer imports
+            uses_tables: Whether the writer accepts the decoder's prebuilt tables as tables=
+
+        Returns:
+            Decorator returning the function unchanged
+        """
+        def decorator(writer):
+            self._exporters[name] = Exporter(name, suffix, writer, requires, uses_tables)
+            return writer
+        return decorator
+
+    def names(self):
+        """Return the registered format names."""
+        return list(self._exporters)
+
+    def suffixes(self):
+        """Return a dictionary of the output suffix of each format."""
+        return {name: exporter.suffix for name, exporter in self._exporters.items()}
+
+    def get(self, name):
+        """
+        Look up a format and check that its packages are installed.
+
+        Args:
+            name: Format name
+
+        Returns:
+            Exporter for the format
+
+        Raises:
+            ValueError: If the format is not registered
+            ImportError: If a package the format needs is missing
+        """
+        exporter = self._exporters.get(name)
+        if exporter is None:
+            raise ValueError(f"Unknown export format '{name}', choose from: {', '.join(self._exporters)}")
+        missing = exporter.missing()
+        if missing:
+            raise ImportError(f"The {name} format needs {', '.join(missing)} (pip install {' '.join(missing)})")
+        return exporter
+
+    def resolve(self, output_format):
+        """
+        Expand a --format value to the exporters to run.
+
+        Args:
+            output_format: A format name, or "all"
+
+        Returns:
+            List of Exporters, in registration order
+
+        Raises:
+            ValueError: If the format is not registered
+            ImportError: If a requested format needs a missing package
+        """
+        names = self.names() if output_format == "all" else [output_format]
+        return [self.get(name) for name in names]
+
+def write_csv_table(output_path, columns, rows):
+    """
+    Stream one table to a CSV file with the standard library csv writer.
+    The file is written in place of output_path atomically.
+
+    Args:
+        output_path: Output file path
+        columns: Header row
+        rows: Iterable of row tuples
+    """
+    with atomic_path(output_path) as temp_path:
+        with open(temp_path, 'w', newline='', encoding='utf-8') as f:
+            # Same line ending as the pandas CSV writer used before
+            writer = csv.writer(f, lineterminator=os.linesep)
+            writer.writerow(columns)
+            writer.writerows(rows)
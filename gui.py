@@ -10,7 +10,8 @@ import shutil
 
 # Import the encoder and decoder functions
 try:
-    from encoder import process_file as encode_file, create_hex_dump
+    from encoder import EncoderPipeline
+    from hex_dump import iter_hex_dump_blocks
     from reverser import process_file as decode_file
 except ImportError:
     messagebox.showerror("Import Error", "Could not import encoder.py or reverser.py. Make sure they are in the same directory.")
@@ -37,6 +38,9 @@ class SpringFileConverterApp:
         # Store recent files
         self.recent_files = []
         
+        # Encoder pipeline of the last conversion, keeps the input it read for the viewer
+        self.encoder_pipeline = None
+        
         # Create notebook (tabs)
         self.notebook = ttk.Notebook(self.main_frame)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -344,7 +348,10 @@ Free Length: [length] mm
         
         try:
             # Call the encoder function
-            encode_file(input_file, output_dir, output_format)
+            self.encoder_pipeline = EncoderPipeline(output_dir, output_format)
+            success, error = self.encoder_pipeline.run(input_file)
+            if not success:
+                raise Exception(error)
             
             # Get the output file paths
             base_name = Path(input_file).stem.replace('~', '_').replace(' ', '_')
@@ -505,12 +512,16 @@ Free Length: [length] mm
                 self.file_content.insert(tk.END, content)
             else:
                 # Binary file - show hex dump
-                with open(file_path, 'rb') as f:
-                    binary_data = f.read()
+                if self.encoder_pipeline is not None and self.encoder_pipeline.input_file == os.path.abspath(file_path):
+                    # Reuse the buffer the encoder already read
+                    binary_data = self.encoder_pipeline.read(file_path)
+                else:
+                    with open(file_path, 'rb') as f:
+                        binary_data = f.read()
                 
-                # Create hex dump
-                hex_dump = create_hex_dump(binary_data)
-                self.file_content.insert(tk.END, hex_dump)
+                # Insert the hex dump block by block instead of building one large string
+                for block in iter_hex_dump_blocks(binary_data):
+                    self.file_content.insert(tk.END, block)
             
             # Add to recent files
             self.add_to_recent_files(file_path)
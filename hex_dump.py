@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+# Character shown for each byte value in the ASCII column: printable ASCII as is, everything else as "."
+ASCII_COLUMN = bytes(b if 32 <= b <= 126 else ord('.') for b in range(256))
+
+# Lines formatted per block; each block costs one hex() and one translate() call
+BLOCK_LINES = 4096
+
+class HexDumpStyle:
+    """
+    Layout of a hex dump line: offset, hex column, ASCII column.
+    """
+
+    def __init__(self, uppercase=False, offset_separator="  ", hex_padding=0, ascii_brackets=False,
+                 final_newline=False):
+        """
+        Args:
+            uppercase: Whether offsets and hex digits are uppercase
+            offset_separator: Text between the offset and the hex column
+            hex_padding: Spaces added after a full hex column (short last lines are padded to the same width)
+            ascii_brackets: Whether the ASCII column is enclosed in "|"
+            final_newline: Whether the last line ends with a newline
+        """
+        self.uppercase = uppercase
+        self.offset_separator = offset_separator
+        self.hex_padding = hex_padding
+        self.ascii_brackets = ascii_brackets
+        self.final_newline = final_newline
+
+# The layouts the tools have always written
+HEX_DUMP_STYLES = {
+    # 00000000  00 00 00 12 ...  |....|
+    "encoder": HexDumpStyle(uppercase=True, hex_padding=1, ascii_brackets=True),
+    # 00000000:  00 00 00 12 ...  ....     (every line ends with a newline)
+    "complete_decoder": HexDumpStyle(offset_separator=":  ", final_newline=True),
+    # 00000000:  00 00 00 12 ...   ....
+    "jksbrfgkjasfjkgbar": HexDumpStyle(offset_separator=":  ", hex_padding=1),
+}
+
+def _style(style):
+    return HEX_DUMP_STYLES[style] if isinstance(style, str) else style
+
+def _iter_line_blocks(data, style, bytes_per_line, block_lines):
+    # Yields lists of formatted lines. Each block of bytes is converted with
+    # a single hex(' ') and translate() call; lines are slices of the results.
+    view = memoryview(data).cast('B')
+    hex_step = bytes_per_line * 3
+    hex_width = hex_step - 1 + style.hex_padding
+    offset_format = '08X' if style.uppercase else '08x'
+    prefix, suffix = ("|", "|") if style.ascii_brackets else ("", "")
+    separator = style.offset_separator
+    block_size = bytes_per_line * block_lines
+
+    for start in range(0, len(view), block_size):
+        block = view[start:start + block_size]
+        hex_text = block.hex(' ')
+        if style.uppercase:
+            hex_text = hex_text.upper()
+        ascii_text = block.tobytes().translate(ASCII_COLUMN).decode('ascii')
+
+        lines = []
+        for line, position in enumerate(range(0, len(block), bytes_per_line)):
+            hex_column = hex_text[line * hex_step:(line + 1) * hex_step - 1]
+            lines.append(f"{start + position:{offset_format}}{separator}{hex_column:<{hex_width}}  "
+                         f"{prefix}{ascii_text[position:position + bytes_per_line]}{suffix}")
+        yield lines
+
+def iter_hex_dump(data, style="encoder", bytes_per_line=16, block_lines=BLOCK_LINES):
+    """
+    Yield the lines of a hex dump lazily.
+
+    Args:
+        data: Binary data as bytes, bytearray or memoryview
+        style: Name in HEX_DUMP_STYLES, or a HexDumpStyle
+        bytes_per_line: Number of bytes to display per line
+        block_lines: Number of lines formatted at a time
+
+    Yields:
+        Lines without their newline
+    """
+    for lines in _iter_line_blocks(data, _style(style), bytes_per_line, block_lines):
+        yield from lines
+
+def iter_hex_dump_blocks(data, style="encoder", bytes_per_line=16, block_lines=BLOCK_LINES):
+    """
+    Yield a hex dump as text blocks of block_lines lines that concatenate
+    to create_hex_dump(), for writing to a file or widget piece by piece.
+
+    Args:
+        data: Binary data as bytes, bytearray or memoryview
+        style: Name in HEX_DUMP_STYLES, or a HexDumpStyle
+        bytes_per_line: Number of bytes to display per line
+        block_lines: Number of lines per block
+
+    Yields:
+        Strings
+    """
+    style = _style(style)
+    first = True
+    for lines in _iter_line_blocks(data, style, bytes_per_line, block_lines):
+        text = "\n".join(lines)
+        if style.final_newline:
+            yield text + "\n"
+        elif first:
+            yield text
+        else:
+            yield "\n" + text
+        first = False
+
+def create_hex_dump(data, bytes_per_line=16, style="encoder"):
+    """
+    Create a hex dump of binary data.
+
+    Args:
+        data: Binary data as bytes, bytearray or memoryview
+        bytes_per_line: Number of bytes to display per line
+        style: Name in HEX_DUMP_STYLES, or a HexDumpStyle
+
+    Returns:
+        String containing the hex dump
+    """
+    return "".join(iter_hex_dump_blocks(data, style, bytes_per_line))
+
+def write_hex_dump(data, f, style="encoder", bytes_per_line=16):
+    """
+    Write a hex dump to a text file block by block, without building the whole dump in memory.
+
+    Args:
+        data: Binary data as bytes, bytearray or memoryview
+        f: Text file object
+        style: Name in HEX_DUMP_STYLES, or a HexDumpStyle
+        bytes_per_line: Number of bytes to display per line
+    """
+    for block in iter_hex_dump_blocks(data, style, bytes_per_line):
+        f.write(block)
@@ -8,6 +8,10 @@ import struct
 import argparse
 from pathlib import Path
 
+from string_scanner import find_candidate_strings
+from vocabulary import VOCABULARY
+from hex_dump import write_hex_dump
+
 def parse_binary_file(file_path):
     """
     Parse a binary test procedure file with length-prefixed strings.
@@ -23,21 +27,13 @@ def parse_binary_file(file_path):
 
     # First pass: identify string locations and lengths
     strings = []
-    i = 0
-    while i < len(data):
-        # Look for pattern: 4-byte length followed by string data
-        if i + 4 <= len(data):
-            str_len = int.from_bytes(data[i:i+4], byteorder='big')
-            # Arbitrary upper bound (change as needed)
-            if 0 < str_len < 100 and i + 4 + str_len <= len(data):
-                try:
-                    # Decode string as UTF-8, replacing errors
-                    string_data = data[i+4:i+4+str_len].decode('utf-8', errors='replace')
-                    # Collect it
-                    strings.append((i, str_len, string_data))
-                except:
-                    pass
-        i += 1
+    view = memoryview(data)
+    # Look for pattern: 4-byte length followed by string data
+    # Arbitrary upper bound (change as needed)
+    for i, str_len in find_candidate_strings(data, max_length=99, printable_only=False):
+        # Decode string as UTF-8, replacing errors
+        string_data = VOCABULARY.decode(view[i+4:i+4+str_len])
+        strings.append((i, str_len, string_data))
 
     # Build a structured representation
     result = {}
@@ -208,41 +204,6 @@ def format_as_text(parsed_data):
 
     return "\n".join(lines)
 
-def create_hex_dump(binary_data, bytes_per_line=16):
-    """
-    Creates a hexadecimal representation of binary data for inspection.
-    """
-    result = []
-    ascii_repr = []
-
-    for i, byte in enumerate(binary_data):
-        # Add offset at the beginning of each line
-        if i % bytes_per_line == 0:
-            if i > 0:
-                # Add ASCII representation
-                result.append("  " + "".join(ascii_repr))
-                result.append("\n")
-                ascii_repr = []
-            result.append(f"{i:08x}:  ")
-
-        # Add hex representation
-        result.append(f"{byte:02x} ")
-
-        # Add to ASCII representation (for the right-hand column)
-        if 32 <= byte <= 126:  # Printable ASCII characters
-            ascii_repr.append(chr(byte))
-        else:
-            ascii_repr.append(".")
-
-    # Add padding for the last line if needed
-    padding = bytes_per_line - (len(binary_data) % bytes_per_line) if len(binary_data) % bytes_per_line != 0 else 0
-    result.append("   " * padding)
-
-    # Add the last ASCII representation
-    result.append("  " + "".join(ascii_repr))
-
-    return "".join(result)
-
 def process_file(input_file, output_dir=None, output_format='txt'):
     """
     Process a single binary file and convert it to readable formats.
@@ -277,10 +238,9 @@ def process_file(input_file, output_dir=None, output_format='txt'):
     with open(input_path, 'rb') as f:
         binary_data = f.read()
 
-    hex_dump = create_hex_dump(binary_data)
     hex_output_path = encoder_dir / f"{base_name}_hex_dump.txt"
     with open(hex_output_path, 'w', encoding='utf-8') as f:
-        f.write(hex_dump)
+        write_hex_dump(binary_data, f, style="jksbrfgkjasfjkgbar")
 
     # 2) Parse the file
     try:
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import hashlib
+import threading
+import contextlib
+
+from build_cache import hash_file
+
+@contextlib.contextmanager
+def atomic_path(path):
+    """
+    Give a temporary path to write in place of path, moved over path once
+    the block succeeds and removed if it fails, so readers never see a
+    partial file. Replacing the name also leaves other hardlinks to the
+    previous file untouched.
+
+    Args:
+        path: Final output path
+
+    Yields:
+        Temporary path in the same directory, with the same extension
+    """
+    directory, name = os.path.split(path)
+    root, ext = os.path.splitext(name)
+    temp_path = os.path.join(directory, f".{root}.{os.getpid()}-{threading.get_ident()}.tmp{ext}")
+    try:
+        yield temp_path
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temp_path)
+        raise
+
+@contextlib.contextmanager
+def atomic_write(path, mode='w', **kwargs):
+    """
+    Open a file for writing that only replaces path once it is closed
+    without an error.
+
+    Args:
+        path: Final output path
+        mode: File mode, 'w' or 'wb'
+        **kwargs: Further arguments for open(), e.g. encoding
+
+    Yields:
+        File object
+    """
+    with atomic_path(path) as temp_path:
+        with open(temp_path, mode, **kwargs) as f:
+            yield f
+
+def checksum(path):
+    """
+    Compute the checksum of an output file, or of every file in an output directory.
+
+    Args:
+        path: Path to the file or directory
+
+    Returns:
+        SHA-256 digest as a hex string
+    """
+    if not os.path.isdir(path):
+        return hash_file(path)
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(path)):
+        digest.update(f"{name}\0{checksum(os.path.join(path, name))}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+class Journal:
+    """
+    Append-only record of the inputs a batch run has finished, with the
+    checksums of the outputs written for each. Stored as JSON lines in the
+    output directory, one journal per tool. A line is written as soon as an
+    input is done, so a run that is killed can be resumed from the journal.
+    """
+
+    def __init__(self, output_dir, tool, version, options=None, resume=False):
+        """
+        Args:
+            output_dir: Directory the tool writes its outputs to
+            tool: Name of the converter, e.g. "encoder"
+            version: Output version of the converter
+            options: Dictionary of options that affect the outputs (e.g. output format)
+            resume: Whether to continue the existing journal instead of starting a new one
+
+        Raises:
+            ValueError: If the journal to resume was written with other options
+        """
+        self.path = os.path.join(output_dir, f".{tool}_journal.jsonl")
+        self.run = {"tool": tool, "version": version, "options": dict(options or {})}
+        # Output checksums by input, and the last checksum recorded for each output
+        self.entries = {}
+        self.checksums = {}
+        self.skipped = 0
+
+        ends_with_newline = True
+        if resume and os.path.exists(self.path):
+            ends_with_newline = self._load()
+        else:
+            resume = False
+
+        os.makedirs(output_dir or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        if not ends_with_newline:
+            # Finish the line a killed run was writing, it is skipped on load
+            self._file.write("\n")
+        if not resume:
+            self._append({"run": self.run})
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            lines = f.read().split('\n')
+
+        for index, line in enumerate(lines):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Empty, or cut short when the run was killed
+                continue
+            if index == 0:
+                if record.get("run") != self.run:
+                    raise ValueError(f"{self.path} was written with different options, run again without --resume")
+                continue
+            self.entries[record["input"]] = record["outputs"]
+            self.checksums.update(record["outputs"])
+
+        return lines[-1] == ""
+
+    def _append(self, record):
+        with self._lock:
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the journal file."""
+        self._file.close()
+
+    def pending(self, input_files, output_paths):
+        """
+        Select the inputs a resumed run still has to convert.
+        An input is done when the journal has it and each of its outputs
+        still has the checksum last recorded for that path (a later input
+        may have written the same path). Inputs that write the same output
+        as a pending input are converted again too, so the outputs match an
+        uninterrupted run.
+
+        Args:
+            input_files: Paths of the input files, in conversion order
+            output_paths: Function returning the list of output paths of an input
+
+        Returns:
+            List of the input files to convert, in the given order
+        """
+        current = {}
+
+        def intact(path):
+            if path not in current:
+                current[path] = checksum(path) if os.path.exists(path) else None
+            return current[path] is not None and current[path] == self.checksums.get(path)
+
+        stale = set()
+        owners = {}
+        for input_file in input_files:
+            outputs = self.entries.get(os.path.abspath(input_file))
+            if outputs is None or not all(intact(path) for path in outputs):
+                stale.add(input_file)
+            for path in output_paths(input_file):
+                owners.setdefault(os.path.abspath(path), []).append(input_file)
+
+        for inputs in owners.values():
+            if stale.intersection(inputs):
+                stale.update(inputs)
+
+        selected = [input_file for input_file in input_files if input_file in stale]
+        self.skipped = len(input_files) - len(selected)
+        return selected
+
+    def record(self, input_file, outputs):
+        """
+        Append a finished input and the checksums of its outputs.
+
+        Args:
+            input_file: Path to the input file
+            outputs: Paths of the files or directories written for it
+        """
+        checksums = {os.path.abspath(path): checksum(path) for path in outputs}
+        self._append({"input": os.path.abspath(input_file), "outputs": checksums})
+        self.entries[os.path.abspath(input_file)] = checksums
+        self.checksums.update(checksums)
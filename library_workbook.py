@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import argparse
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+from command_schema import record_columns
+from corpus_summary import CorpusSummary, DEFAULT_BUCKET_SIZE, decoder_function, iter_inputs
+from journal import atomic_path
+
+# Rows per worksheet in an .xlsx file; the test sequence continues on a new sheet after that
+EXCEL_MAX_ROWS = 1048576
+
+INDEX_COLUMNS = ["Program", "File", "Part Number", "Model Number", "Free Length", "Force Unit", "Steps", "Error"]
+SEQUENCE_COLUMNS = ["Program"] + record_columns("CMD")
+
+class LibraryWorkbook:
+    """
+    One workbook covering a whole library of programs, written in
+    openpyxl's write-only mode. Rows are streamed to disk as each program
+    is added, so memory stays flat however many programs are included.
+
+    Sheets:
+      Summary          totals and counts per command, Force Unit and Free Length bucket
+      Index            one row per program, linked to its first test sequence row
+      Test Sequence    every step of every program ("Test Sequence 2", ... past the row limit)
+    """
+
+    def __init__(self, bucket_size=DEFAULT_BUCKET_SIZE, max_rows=EXCEL_MAX_ROWS):
+        """
+        Args:
+            bucket_size: Width of the Free Length buckets on the Summary sheet
+            max_rows: Rows per test sequence sheet, including the header
+        """
+        self.workbook = Workbook(write_only=True)
+        self.summary = CorpusSummary(bucket_size)
+        self.max_rows = max_rows
+        self.header_font = Font(bold=True)
+        self.link_font = Font(color="0563C1", underline="single")
+
+        # Created first so the sheets are in reading order; filled in by save()
+        self.summary_sheet = self.workbook.create_sheet("Summary")
+        self.index_sheet = self.workbook.create_sheet("Index")
+        self._append_header(self.index_sheet, INDEX_COLUMNS)
+
+        self.sequence_sheets = 0
+        self._new_sequence_sheet()
+
+    def _append_header(self, sheet, columns):
+        row = []
+        for name in columns:
+            cell = WriteOnlyCell(sheet, value=name)
+            cell.font = self.header_font
+            row.append(cell)
+        sheet.append(row)
+
+    def _new_sequence_sheet(self):
+        self.sequence_sheets += 1
+        title = "Test Sequence" if self.sequence_sheets == 1 else f"Test Sequence {self.sequence_sheets}"
+        self.sequence_sheet = self.workbook.create_sheet(title)
+        self._append_header(self.sequence_sheet, SEQUENCE_COLUMNS)
+        self.sequence_rows = 1
+
+    def _text_row(self, sheet, values):
+        # openpyxl stores any string starting with "=" as a formula; program
+        # text such as a condition "=(R02-24.3)" has to stay a string
+        return [self._text_cell(sheet, value) if isinstance(value, str) and value.startswith("=") else value
+                for value in values]
+
+    def _text_cell(self, sheet, value):
+        cell = WriteOnlyCell(sheet, value=value)
+        cell.data_type = "s"
+        return cell
+
+    def _link(self, text, sheet_title, row):
+        # A HYPERLINK formula keeps nothing in memory, unlike worksheet hyperlinks
+        # which write-only sheets hold until the workbook is saved
+        label = text[:255].replace('"', '""')
+        cell = WriteOnlyCell(self.index_sheet, value=f'=HYPERLINK("#\'{sheet_title}\'!A{row}","{label}")')
+        cell.font = self.link_font
+        return cell
+
+    def add(self, file_path, data):
+        """
+        Stream one decoded program into the workbook.
+
+        Args:
+            file_path: Path of the decoded file
+            data: Result of encoder.process_binary_file() or LabVIEWDatabaseDecoder.decode_file()
+        """
+        record = self.summary.add(file_path, data)
+        metadata = data.get("metadata") or data.get("component_specifications") or {}
+        program = os.path.basename(file_path)
+
+        link = program
+        for number, step in enumerate(data.get("test_sequence", [])):
+            if self.sequence_rows >= self.max_rows:
+                self._new_sequence_sheet()
+            self.sequence_sheet.append(self._text_row(self.sequence_sheet, (program,) + step.to_tuple()))
+            self.sequence_rows += 1
+            if number == 0:
+                link = self._link(program, self.sequence_sheet.title, self.sequence_rows)
+
+        self.index_sheet.append(self._text_row(self.index_sheet, [
+            link, file_path, record["part_number"], metadata.get("Model Number"),
+            record["free_length"], record["force_unit"], record["steps"], None]))
+
+    def add_error(self, file_path, error):
+        """
+        Record a program that could not be decoded on the Index sheet.
+
+        Args:
+            file_path: Path of the file
+            error: Exception raised while decoding it
+        """
+        self.summary.add_error(file_path, error)
+        self.index_sheet.append(self._text_row(self.index_sheet, [
+            os.path.basename(file_path), file_path, None, None, None, None, 0, str(error)]))
+
+    def save(self, output_path):
+        """
+        Write the Summary sheet and save the workbook. A write-only
+        workbook can only be saved once.
+
+        Args:
+            output_path: Output .xlsx path
+        """
+        totals = self.summary.to_dict()
+        sheet = self.summary_sheet
+        for label in ("files", "steps", "failed"):
+            sheet.append(["Programs" if label == "files" else label.capitalize(), totals[label]])
+
+        for title, key, unit in (("Command", "commands", "Steps"),
+                                 ("Force Unit", "force_units", "Programs"),
+                                 ("Free Length", "free_length_buckets", "Programs"),
+                                 ("Error", "errors", "Programs")):
+            if not totals[key]:
+                continue
+            sheet.append([])
+            self._append_header(sheet, [title, unit])
+            for name, count in totals[key].items():
+                sheet.append(self._text_row(sheet, [name, count]))
+
+        with atomic_path(output_path) as temp_path:
+            self.workbook.save(temp_path)
+
+def build_workbook(file_paths, decode, output_path, bucket_size=DEFAULT_BUCKET_SIZE, verbose=False):
+    """
+    Decode files one at a time into a LibraryWorkbook and save it.
+
+    Args:
+        file_paths: Iterable of paths of the files to decode
+        decode: Function returning the decoded data of a file path
+        output_path: Output .xlsx path
+        bucket_size: Width of the Free Length buckets on the Summary sheet
+        verbose: Whether to print verbose output
+
+    Returns:
+        CorpusSummary with the totals
+    """
+    workbook = LibraryWorkbook(bucket_size)
+
+    for file_path in file_paths:
+        if verbose:
+            print(f"Decoding {file_path}...")
+        try:
+            data = decode(file_path)
+        except Exception as e:
+            workbook.add_error(file_path, e)
+            if verbose:
+                print(f"Error processing file {file_path}: {str(e)}")
+            continue
+        workbook.add(file_path, data)
+
+    workbook.save(output_path)
+    return workbook.summary
+
+def main():
+    parser = argparse.ArgumentParser(description='Write one Excel workbook covering a library of binary spring force test files.')
+    parser.add_argument('input', nargs='+', help='Input binary files or directories')
+    parser.add_argument('-o', '--output', default='test_library.xlsx', help='Output workbook')
+    parser.add_argument('-r', '--recursive', action='store_true', help='Process directories recursively')
+    parser.add_argument('-d', '--decoder', choices=['encoder', 'complete'], default='encoder',
+                        help='Decode with encoder.py (fast) or complete_decoder.py (also reads damaged and text files)')
+    parser.add_argument('--scan-mode', choices=['chain', 'scan'], default='chain', help='String search of the complete decoder')
+    parser.add_argument('--bucket-size', type=float, default=DEFAULT_BUCKET_SIZE, help='Width of the Free Length buckets in mm')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output')
+
+    args = parser.parse_args()
+
+    decode = decoder_function(args.decoder, args.scan_mode)
+    summary = build_workbook(iter_inputs(args.input, args.recursive, [args.output]), decode, args.output,
+                             args.bucket_size, args.verbose)
+
+    print(f"Wrote {summary.files + sum(summary.errors.values())} programs ({summary.steps} steps) to {args.output}, "
+          f"{sum(summary.errors.values())} failed", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -244,13 +244,15 @@ def parse_spring_test_file(text_content):
     return data
 
 
-def create_binary_from_text_content(text_content, output_file):
+def build_binary_from_text_content(text_content):
     """
-    Create a binary file from text content
+    Encode text content in the binary format
     
     Args:
         text_content (str): The raw text content
-        output_file (str): Path to save the binary file
+        
+    Returns:
+        tuple: (BinaryFormatWriter holding the encoded data, part number)
     """
     # Parse the text content
     data = parse_spring_test_file(text_content)
@@ -328,6 +330,19 @@ def create_binary_from_text_content(text_content, output_file):
             else:
                 writer.write_user_message()
     
+    return writer, part_number
+
+
+def create_binary_from_text_content(text_content, output_file):
+    """
+    Create a binary file from text content
+    
+    Args:
+        text_content (str): The raw text content
+        output_file (str): Path to save the binary file
+    """
+    writer, part_number = build_binary_from_text_content(text_content)
+    
     # Ensure the filename starts with the correct prefix
     if not os.path.basename(output_file).startswith("AS 02~"):
         output_dir = os.path.dirname(output_file)
@@ -2,11 +2,18 @@
 
 import sys
 import os
-import re
-import struct
 import argparse
 import json
+import contextlib
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from command_schema import COMMAND_LAYOUTS, pack_string
+from duplicates import DuplicatePlan, break_hardlink
+
+# Strings every generated file contains, encoded up front in each worker
+FIXED_LITERALS = ("Part Number", "Model Number", "Free Length", "<Test Sequence>",
+                  "--", "mm", "N", "kgf", "Height", "300", "800", "100")
 
 def string_to_binary(string):
     """
@@ -18,12 +25,16 @@ def string_to_binary(string):
     Returns:
         Binary data as bytes
     """
-    # Encode the string as UTF-8
-    string_bytes = string.encode('utf-8')
-    # Create a 4-byte length prefix (big endian)
-    length_bytes = len(string_bytes).to_bytes(4, byteorder='big')
-    # Return the combined bytes
-    return length_bytes + string_bytes
+    # Encoded literals are cached by pack_string
+    return pack_string(string)
+
+def preload_literals():
+    """Encode the strings every generated file contains into the literal cache."""
+    for literal in FIXED_LITERALS:
+        pack_string(literal)
+    for layout in COMMAND_LAYOUTS.values():
+        for value in layout.defaults.values():
+            pack_string(value)
 
 def parse_text_file(text_file_path, verbose=False):
     """
@@ -37,7 +48,20 @@ def parse_text_file(text_file_path, verbose=False):
         Dictionary containing the extracted data
     """
     with open(text_file_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+        return parse_text(f.read(), verbose)
+
+def parse_text(text, verbose=False):
+    """
+    Parse the contents of a text file written by the encoder.
+    
+    Args:
+        text: Text file contents
+        verbose: Whether to print verbose output
+        
+    Returns:
+        Dictionary containing the extracted data
+    """
+    lines = text.split('\n')
     
     # Extract metadata and test sequence
     metadata = {}
@@ -161,6 +185,19 @@ def text_to_binary(parsed_data, verbose=False):
         if not cmd_line:
             continue
         
+        if isinstance(cmd_line, dict):
+            # Entry from a JSON file written by the encoder
+            cmd = cmd_line.get("Command", cmd_line.get("CMD", ""))
+            layout = COMMAND_LAYOUTS.get(cmd)
+            if layout is not None:
+                binary_data.extend(layout.pack(cmd_line))
+            elif cmd:
+                if verbose:
+                    print(f"Warning: Unknown command '{cmd}' - adding as-is")
+                binary_data.extend(string_to_binary(cmd))
+                binary_data.extend(string_to_binary(cmd_line.get("Description", "")))
+            continue
+        
         # Parse the command line
         parts = cmd_line.split(" - ", 1)
         if len(parts) < 2:
@@ -172,223 +209,9 @@ def text_to_binary(parsed_data, verbose=False):
         rest = parts[1]
         
         # Process based on command type
-        if cmd == "ZF":
-            # Zero Force
-            binary_data.extend(string_to_binary("ZF"))
-            binary_data.extend(string_to_binary(rest))
-            # Add padding
-            binary_data.extend(b'\x00' * 16)
-        
-        elif cmd == "ZD":
-            # Zero Displacement
-            binary_data.extend(string_to_binary("ZD"))
-            binary_data.extend(string_to_binary(rest))
-            # Add padding
-            binary_data.extend(b'\x00' * 16)
-        
-        elif cmd == "TH":
-            # Threshold (Search Contact)
-            binary_data.extend(string_to_binary("TH"))
-            
-            # Parse description and parameters
-            if ":" in rest:
-                description, params = rest.split(":", 1)
-                binary_data.extend(string_to_binary(description.strip()))
-                
-                # Parse force, unit, and value
-                params = params.strip()
-                if "," in params:
-                    force_part, value_part = params.split(",", 1)
-                    force_parts = force_part.strip().split()
-                    if len(force_parts) >= 2:
-                        force = force_parts[0]
-                        unit = force_parts[1]
-                        binary_data.extend(string_to_binary(force))
-                        binary_data.extend(string_to_binary(unit))
-                        
-                        # Extract value
-                        value = value_part.strip()
-                        if value.startswith("Value:"):
-                            value = value[6:].strip()
-                        binary_data.extend(string_to_binary(value))
-                    else:
-                        # Fallback if parsing fails
-                        binary_data.extend(string_to_binary("10"))
-                        binary_data.extend(string_to_binary("N"))
-                        binary_data.extend(string_to_binary("10"))
-                else:
-                    # Fallback if parsing fails
-                    binary_data.extend(string_to_binary("10"))
-                    binary_data.extend(string_to_binary("N"))
-                    binary_data.extend(string_to_binary("10"))
-            else:
-                # Fallback if parsing fails
-                binary_data.extend(string_to_binary("Search Contact"))
-                binary_data.extend(string_to_binary("10"))
-                binary_data.extend(string_to_binary("N"))
-                binary_data.extend(string_to_binary("10"))
-        
-        elif cmd == "FL(P)":
-            # Measure Free Length
-            binary_data.extend(string_to_binary("FL(P)"))
-            
-            # Parse description and parameters
-            if ":" in rest:
-                description, params = rest.split(":", 1)
-                binary_data.extend(string_to_binary(description.strip()))
-                
-                # Parse unit and value
-                params = params.strip()
-                if "(" in params and ")" in params:
-                    # Format like "50(40,60)"
-                    binary_data.extend(string_to_binary("mm"))
-                    binary_data.extend(string_to_binary(params))
-                else:
-                    # Default values
-                    binary_data.extend(string_to_binary("mm"))
-                    binary_data.extend(string_to_binary(params))
-            else:
-                # Fallback if parsing fails
-                binary_data.extend(string_to_binary("Measure Free Length"))
-                binary_data.extend(string_to_binary("mm"))
-                binary_data.extend(string_to_binary("50"))
-        
-        elif cmd == "Mv(P)":
-            # Move to Position
-            binary_data.extend(string_to_binary("Mv(P)"))
-            
-            # Parse description and parameters
-            if ":" in rest:
-                description, params = rest.split(":", 1)
-                binary_data.extend(string_to_binary(description.strip()))
-                
-                # Parse position, unit, and target
-                params = params.strip()
-                if "," in params:
-                    position_part, target_part = params.split(",", 1)
-                    position_parts = position_part.strip().split()
-                    
-                    if len(position_parts) >= 2:
-                        position = position_parts[0]
-                        unit = position_parts[1]
-                        binary_data.extend(string_to_binary(position))
-                        binary_data.extend(string_to_binary(unit))
-                    else:
-                        # Position without unit
-                        binary_data.extend(string_to_binary(position_part.strip()))
-                        binary_data.extend(string_to_binary("mm"))
-                    
-                    # Extract target
-                    target = target_part.strip()
-                    if target.startswith("Target:"):
-                        target = target[7:].strip()
-                    binary_data.extend(string_to_binary(target))
-                else:
-                    # No target specified
-                    binary_data.extend(string_to_binary(params))
-                    binary_data.extend(string_to_binary("mm"))
-                    binary_data.extend(string_to_binary("50"))
-            else:
-                # Fallback if parsing fails
-                binary_data.extend(string_to_binary("Move to Position"))
-                binary_data.extend(string_to_binary("50"))
-                binary_data.extend(string_to_binary("mm"))
-                binary_data.extend(string_to_binary("50"))
-        
-        elif cmd == "Fr(P)":
-            # Force at Position
-            binary_data.extend(string_to_binary("Fr(P)"))
-            
-            # Parse description and parameters
-            if ":" in rest:
-                description, params = rest.split(":", 1)
-                binary_data.extend(string_to_binary(description.strip()))
-                
-                # Add unit and value
-                binary_data.extend(string_to_binary("N"))
-                binary_data.extend(string_to_binary(params.strip()))
-            else:
-                # Fallback if parsing fails
-                binary_data.extend(string_to_binary("Force at Position"))
-                binary_data.extend(string_to_binary("N"))
-                binary_data.extend(string_to_binary("100"))
-        
-        elif cmd == "TD":
-            # Time Delay
-            binary_data.extend(string_to_binary("TD"))
-            
-            # Parse description and parameters
-            if ":" in rest:
-                description, params = rest.split(":", 1)
-                binary_data.extend(string_to_binary(description.strip()))
-                
-                # Parse time and unit
-                params = params.strip().split()
-                if len(params) >= 2:
-                    time = params[0]
-                    unit = params[1]
-                    binary_data.extend(string_to_binary(time))
-                    binary_data.extend(string_to_binary(unit))
-                else:
-                    # Default values
-                    binary_data.extend(string_to_binary("1"))
-                    binary_data.extend(string_to_binary("Sec"))
-            else:
-                # Fallback if parsing fails
-                binary_data.extend(string_to_binary("Time Delay"))
-                binary_data.extend(string_to_binary("1"))
-                binary_data.extend(string_to_binary("Sec"))
-        
-        elif cmd == "Scrag":
-            # Scragging
-            binary_data.extend(string_to_binary("Scrag"))
-            
-            # Parse description and parameters
-            if ":" in rest:
-                description, params = rest.split(":", 1)
-                binary_data.extend(string_to_binary(description.strip()))
-                binary_data.extend(string_to_binary(params.strip()))
-            else:
-                # Fallback if parsing fails
-                binary_data.extend(string_to_binary("Scragging"))
-                binary_data.extend(string_to_binary("R03,2"))
-            
-            # Add padding
-            binary_data.extend(b'\x00' * 16)
-        
-        elif cmd == "PMsg":
-            # User Message
-            binary_data.extend(string_to_binary("PMsg"))
-            
-            # Parse description and parameters
-            if ":" in rest:
-                description, params = rest.split(":", 1)
-                binary_data.extend(string_to_binary(description.strip()))
-                binary_data.extend(string_to_binary(params.strip()))
-            else:
-                # Fallback if parsing fails
-                binary_data.extend(string_to_binary("User Message"))
-                binary_data.extend(string_to_binary("Test Completed"))
-            
-            # Add padding
-            binary_data.extend(b'\x00' * 16)
-        
-        elif cmd == "LP":
-            # Loop
-            binary_data.extend(string_to_binary("LP"))
-            
-            # Parse description and parameters
-            if ":" in rest:
-                description, params = rest.split(":", 1)
-                binary_data.extend(string_to_binary(description.strip()))
-                binary_data.extend(string_to_binary(params.strip()))
-            else:
-                # Fallback if parsing fails
-                binary_data.extend(string_to_binary("Loop"))
-                binary_data.extend(string_to_binary("R03,3"))
-            
-            # Add padding
-            binary_data.extend(b'\x00' * 16)
+        layout = COMMAND_LAYOUTS.get(cmd)
+        if layout is not None:
+            binary_data.extend(layout.pack(layout.values_from_text(rest)))
         
         else:
             # Unknown command, try to add it as-is
@@ -400,6 +223,39 @@ def text_to_binary(parsed_data, verbose=False):
     
     return binary_data
 
+def binary_output_path_for(input_file, output_dir=None):
+    """
+    Path of the binary file written for an input file.
+    
+    Args:
+        input_file: Path to the input text or JSON file
+        output_dir: Directory to save output files (default: "input" next to the input)
+        
+    Returns:
+        Path of the binary output
+    """
+    input_path = Path(input_file)
+    
+    # Determine output directory
+    if output_dir:
+        output_dir = Path(output_dir)
+    else:
+        output_dir = input_path.parent / "input"
+    
+    # Generate output file name
+    base_name = input_path.stem
+    if '_' in base_name:
+        # Convert AS_01_Comp-Deflection.txt to AS 01~Comp-Deflection
+        parts = base_name.split('_', 2)
+        if len(parts) >= 3:
+            output_name = f"{parts[0]} {parts[1]}~{parts[2]}"
+        else:
+            output_name = base_name.replace('_', ' ', 1).replace('_', '~', 1)
+    else:
+        output_name = base_name
+    
+    return output_dir / output_name
+
 def process_file(input_file, output_dir=None, verbose=False):
     """
     Process a single text file and convert it to binary format.
@@ -424,40 +280,28 @@ def process_file(input_file, output_dir=None, verbose=False):
         else:
             parsed_data = parse_text_file(input_file, verbose)
         
-        # Determine output directory
-        if output_dir:
-            output_dir = Path(output_dir)
-        else:
-            output_dir = input_path.parent / "input"
+        # Determine output file path
+        binary_output_path = binary_output_path_for(input_file, output_dir)
+        output_dir = binary_output_path.parent
+        output_name = binary_output_path.name
         
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
         
-        # Generate output file name
-        base_name = input_path.stem
-        if '_' in base_name:
-            # Convert AS_01_Comp-Deflection.txt to AS 01~Comp-Deflection
-            parts = base_name.split('_', 2)
-            if len(parts) >= 3:
-                output_name = f"{parts[0]} {parts[1]}~{parts[2]}"
-            else:
-                output_name = base_name.replace('_', ' ', 1).replace('_', '~', 1)
-        else:
-            output_name = base_name
-        
-        binary_output_path = output_dir / output_name
         hex_output_path = output_dir / f"{output_name}_hex_dump.txt"
         
         # Convert to binary
         binary_data = text_to_binary(parsed_data, verbose)
         
         # Write binary output
+        break_hardlink(binary_output_path)
         with open(binary_output_path, 'wb') as f:
             f.write(binary_data)
         
         # Create hex dump for verification
-        from encoder import create_hex_dump
+        from hex_dump import create_hex_dump
         hex_dump = create_hex_dump(binary_data)
+        break_hardlink(hex_output_path)
         with open(hex_output_path, 'w', encoding='utf-8') as f:
             f.write(hex_dump)
         
@@ -476,7 +320,107 @@ def process_file(input_file, output_dir=None, verbose=False):
             traceback.print_exc()
         return False, error_message
 
-def process_directory(input_dir, output_dir, recursive=False, verbose=False):
+def output_paths_for(input_file, output_dir=None):
+    """
+    Paths of the files process_file() writes for an input file.
+    
+    Args:
+        input_file: Path to the input text or JSON file
+        output_dir: Directory to save output files
+        
+    Returns:
+        List of the binary output and hex dump paths
+    """
+    binary_output_path = binary_output_path_for(input_file, output_dir)
+    return [binary_output_path, binary_output_path.parent / f"{binary_output_path.name}_hex_dump.txt"]
+
+def is_text_input_name(filename):
+    """
+    Check whether a file name can be a text or JSON input. Dotfiles
+    (journals, manifests and temporary files written by the tools) are not.
+    
+    Args:
+        filename: File name without its directory
+        
+    Returns:
+        True if the file should be converted
+    """
+    return not filename.startswith('.') and filename.endswith(('.txt', '.json'))
+
+def list_text_files(input_dir, recursive=False):
+    """
+    List the text and JSON files in a directory.
+    
+    Args:
+        input_dir: Directory containing input text files
+        recursive: Whether to include subdirectories
+        
+    Returns:
+        List of file paths
+    """
+    if recursive:
+        files = []
+        for root, _, filenames in os.walk(input_dir):
+            for filename in filenames:
+                if is_text_input_name(filename):
+                    files.append(os.path.join(root, filename))
+        return files
+    
+    return [os.path.join(input_dir, f) for f in os.listdir(input_dir) 
+            if os.path.isfile(os.path.join(input_dir, f)) and is_text_input_name(f)]
+
+def _init_worker(log_to_stderr):
+    preload_literals()
+    if log_to_stderr:
+        sys.stdout = sys.stderr
+
+def _convert_group(file_paths, output_dir, verbose):
+    return [(file_path, process_file(file_path, output_dir, verbose)) for file_path in file_paths]
+
+def iter_conversions(files, output_dir=None, jobs=1, verbose=False):
+    """
+    Convert text files to binary, yielding each result as soon as it is available.
+    With jobs > 1 the files are converted by at most jobs worker processes;
+    results are still yielded in a fixed order, and inputs that write the same
+    binary file are converted by one worker in listing order.
+    
+    Args:
+        files: Paths of the input text or JSON files
+        output_dir: Directory to save output files
+        jobs: Number of worker processes
+        verbose: Whether to print verbose output
+        
+    Yields:
+        Tuples of (file_path, (success, error_message))
+    """
+    if jobs <= 1:
+        for file_path in files:
+            if verbose:
+                print(f"Processing {file_path}...")
+            yield file_path, process_file(file_path, output_dir, verbose)
+        return
+    
+    groups = {}
+    for file_path in files:
+        groups.setdefault(binary_output_path_for(file_path, output_dir), []).append(file_path)
+    groups = list(groups.values())
+    if not groups:
+        return
+    
+    jobs = min(jobs, len(groups))
+    chunksize = max(1, len(groups) // (jobs * 4))
+    # Workers print where this process prints, main() sends it to stderr for --summary -
+    initargs = (sys.stdout is sys.stderr,)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=initargs) as executor:
+        for results in executor.map(_convert_group, groups, [output_dir] * len(groups), [verbose] * len(groups),
+                                    chunksize=chunksize):
+            for file_path, result in results:
+                if verbose:
+                    print(f"Processed {file_path}")
+                yield file_path, result
+
+def process_directory(input_dir, output_dir, recursive=False, verbose=False, jobs=1, failures=None,
+                      dedupe=False, duplicate_report=None):
     """
     Process all text files in a directory.
     
@@ -485,6 +429,10 @@ def process_directory(input_dir, output_dir, recursive=False, verbose=False):
         output_dir: Directory to save output files
         recursive: Whether to process subdirectories recursively
         verbose: Whether to print verbose output
+        jobs: Number of worker processes (1 converts in this process)
+        failures: List to append a {"file", "error"} dictionary to for each failed file
+        dedupe: Whether to convert identical files once and hardlink the copies' outputs
+        duplicate_report: Path to write a JSON report of the identical files to (requires dedupe)
         
     Returns:
         Tuple of (success_count, error_count)
@@ -493,71 +441,117 @@ def process_directory(input_dir, output_dir, recursive=False, verbose=False):
     error_count = 0
     
     # Get list of files to process
-    if recursive:
-        files = []
-        for root, _, filenames in os.walk(input_dir):
-            for filename in filenames:
-                if filename.endswith('.txt') or filename.endswith('.json'):
-                    files.append(os.path.join(root, filename))
-    else:
-        files = [os.path.join(input_dir, f) for f in os.listdir(input_dir) 
-                if os.path.isfile(os.path.join(input_dir, f)) 
-                and (f.endswith('.txt') or f.endswith('.json'))]
+    files = list_text_files(input_dir, recursive)
+    
+    plan = None
+    if dedupe:
+        plan = DuplicatePlan(files, lambda input_file: output_paths_for(input_file, output_dir))
+        files = plan.to_convert
     
     # Process each file
-    for file_path in files:
-        if verbose:
-            print(f"Processing {file_path}...")
-        
-        success, error = process_file(file_path, output_dir, verbose)
-        
+    errors = {}
+    for file_path, (success, error) in iter_conversions(files, output_dir, jobs, verbose):
         if success:
             success_count += 1
         else:
             error_count += 1
+            errors[file_path] = error
+            if failures is not None:
+                failures.append({"file": file_path, "error": error})
             if verbose:
                 print(error)
     
+    if plan is not None:
+        # Copies share the outputs of the identical file converted above
+        for copy, original in plan.links:
+            if original in errors:
+                error_count += 1
+                if failures is not None:
+                    failures.append({"file": copy, "error": errors[original]})
+        for copy, original in plan.link_outputs(errors):
+            success_count += 1
+            if verbose:
+                print(f"Linked outputs of {copy} to {original}")
+        
+        if duplicate_report:
+            plan.write_report(duplicate_report)
+    
     return success_count, error_count
 
+def write_summary(summary_path, total_success, failures):
+    """
+    Write a machine-readable summary of a conversion run as JSON.
+    
+    Args:
+        summary_path: Output file path, or "-" for standard output
+        total_success: Number of files converted successfully
+        failures: List of {"file", "error"} dictionaries
+    """
+    summary = {
+        "processed": total_success + len(failures),
+        "succeeded": total_success,
+        "failed": len(failures),
+        "failures": failures,
+    }
+    if summary_path == '-':
+        json.dump(summary, sys.stdout, indent=2)
+        print()
+    else:
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
 def main():
     parser = argparse.ArgumentParser(description='Convert text spring force test files back to binary format.')
     parser.add_argument('input', nargs='+', help='Input text files or directories')
     parser.add_argument('-o', '--output', help='Output directory for converted binary files')
     parser.add_argument('-r', '--recursive', action='store_true', help='Process directories recursively')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='Number of worker processes for directories')
+    parser.add_argument('--dedupe', action='store_true', help='Convert identical files in directories once and hardlink the outputs of the copies')
+    parser.add_argument('--duplicate-report', help='Write a JSON report of the identical files found by --dedupe to this file')
+    parser.add_argument('--summary', help='Write a JSON summary of the run (with every failure) to this file, or - for standard output')
     parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output')
     
     args = parser.parse_args()
     
     total_success = 0
     total_error = 0
+    failures = []
     
-    for input_path in args.input:
-        if os.path.isdir(input_path):
-            if args.verbose:
-                print(f"Processing directory {input_path}...")
+    # With the summary on stdout, progress and verbose output go to stderr
+    log_stream = sys.stderr if args.summary == '-' else sys.stdout
+    with contextlib.redirect_stdout(log_stream):
+        for input_path in args.input:
+            if os.path.isdir(input_path):
+                if args.verbose:
+                    print(f"Processing directory {input_path}...")
             
-            success, error = process_directory(input_path, args.output, args.recursive, args.verbose)
-            total_success += success
-            total_error += error
+                success, error = process_directory(input_path, args.output, args.recursive, args.verbose,
+                                                   args.jobs, failures, args.dedupe, args.duplicate_report)
+                total_success += success
+                total_error += error
         
-        elif os.path.isfile(input_path):
-            if args.verbose:
-                print(f"Processing file {input_path}...")
+            elif os.path.isfile(input_path):
+                if args.verbose:
+                    print(f"Processing file {input_path}...")
             
-            success, error = process_file(input_path, args.output, args.verbose)
+                success, error = process_file(input_path, args.output, args.verbose)
             
-            if success:
-                total_success += 1
-            else:
-                total_error += 1
-                if args.verbose:
-                    print(error)
+                if success:
+                    total_success += 1
+                else:
+                    total_error += 1
+                    failures.append({"file": input_path, "error": error})
+                    if args.verbose:
+                        print(error)
         
-        else:
-            print(f"Error: {input_path} does not exist")
+            else:
+                print(f"Error: {input_path} does not exist")
+    
+    if args.summary:
+        write_summary(args.summary, total_success, failures)
     
-    print(f"Processed {total_success + total_error} files: {total_success} successful, {total_error} failed")
+    if args.summary != '-':
+        print(f"Processed {total_success + total_error} files: {total_success} successful, {total_error} failed")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import base64
+import argparse
+import threading
+import contextlib
+from urllib.parse import urlsplit, parse_qs
+from concurrent.futures import ThreadPoolExecutor
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+from encoder import process_binary_data, format_as_text
+from hex_dump import create_hex_dump
+from reverser import parse_text, parse_json_file, text_to_binary
+from command_schema import with_record_dicts
+
+# Largest request body the HTTP service accepts, in bytes
+DEFAULT_MAX_REQUEST_SIZE = 10 * 1024 * 1024
+
+class RequestError(Exception):
+    """Raised for a request that is malformed or names an unknown operation."""
+
+def _read_input(request):
+    # Binary input of a request: a file path or a base64 payload
+    if "path" in request:
+        with open(request["path"], 'rb') as f:
+            return f.read()
+    if "data" in request:
+        return base64.b64decode(request["data"])
+    raise RequestError("Request needs a 'path' or base64 'data'")
+
+class ConversionService:
+    """
+    Runs conversion requests in a long-lived process.
+    The converters are imported once, so a request only costs its own work.
+    complete_decoder (and pandas) is imported on the first export request.
+
+    A request is a dictionary with an "op" and its arguments:
+      decode   {"path" | "data", "format": "json" | "txt" | "all"}
+               Binary file to metadata and test sequence (encoder.py)
+      encode   {"path" | "text" | "json", "output", "writer": "reverser" | "ni"}
+               Text or JSON program to binary (reverser.py, or ni_binary_format.py
+               for its text format); the binary is returned as base64 "data"
+               unless written to "output"
+      export   {"path", "output", "format": name | [names] | "all"}
+               Binary file to complete_decoder.py exports under the output prefix
+      hexdump  {"path" | "data"}
+      ping     {}
+    An optional "id" is copied to the response.
+    """
+
+    OPERATIONS = ("decode", "encode", "export", "hexdump", "ping")
+
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+        self._decoder = None
+        self._export_stages = {}
+        self.requests = 0
+        self.failures = 0
+
+    def close(self):
+        """Shut down the export worker pools."""
+        for stage in self._export_stages.values():
+            stage.close()
+        self._export_stages.clear()
+
+    def handle(self, request):
+        """
+        Run one request.
+
+        Args:
+            request: Request dictionary
+
+        Returns:
+            Response dictionary with "ok", "result" or "error" and "elapsed_ms"
+        """
+        start = time.perf_counter()
+        response = {}
+        if isinstance(request, dict) and "id" in request:
+            response["id"] = request["id"]
+
+        try:
+            if not isinstance(request, dict):
+                raise RequestError("Request must be a JSON object")
+            op = request.get("op")
+            if op not in self.OPERATIONS:
+                raise RequestError(f"Unknown op '{op}', expected one of: {', '.join(self.OPERATIONS)}")
+            result = getattr(self, f"_op_{op}")(request)
+            response["ok"] = True
+            response["result"] = result
+        except Exception as e:
+            self.failures += 1
+            response["ok"] = False
+            response["error"] = str(e)
+
+        self.requests += 1
+        response["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        return response
+
+    def _op_ping(self, request):
+        return {"pid": os.getpid(), "requests": self.requests}
+
+    def decode(self, buffer, output_format="json"):
+        """
+        Decode a binary file held in memory.
+
+        Args:
+            buffer: File contents
+            output_format: "json" for the data, "txt" for the text form, or "all"
+
+        Returns:
+            Dictionary with the decoded data and/or its "text" form
+        """
+        data = process_binary_data(buffer, self.verbose)
+        result = {}
+        if output_format in ("json", "all"):
+            result.update(with_record_dicts(data))
+        if output_format in ("txt", "all"):
+            result["text"] = format_as_text(data)
+        return result
+
+    def encode_text(self, text, writer="reverser"):
+        """
+        Encode a text program to binary.
+
+        Args:
+            text: Text program
+            writer: "reverser" for the encoder's text format, "ni" for the
+                ni_binary_format.py text format
+
+        Returns:
+            Binary data as bytes
+        """
+        if writer == "ni":
+            from ni_binary_format import build_binary_from_text_content
+            return bytes(build_binary_from_text_content(text)[0].data)
+        return bytes(text_to_binary(parse_text(text, self.verbose), self.verbose))
+
+    def encode_data(self, parsed_data):
+        """
+        Encode a program in the encoder's JSON form to binary.
+
+        Args:
+            parsed_data: Dictionary with "metadata" and "test_sequence"
+
+        Returns:
+            Binary data as bytes
+        """
+        return bytes(text_to_binary(parsed_data, self.verbose))
+
+    def _op_decode(self, request):
+        return self.decode(_read_input(request), request.get("format", "json"))
+
+    def _op_encode(self, request):
+        if "text" in request:
+            binary_data = self.encode_text(request["text"], request.get("writer", "reverser"))
+        elif "json" in request:
+            binary_data = self.encode_data(request["json"])
+        elif "path" in request:
+            if request["path"].lower().endswith('.json'):
+                binary_data = self.encode_data(parse_json_file(request["path"], self.verbose))
+            else:
+                with open(request["path"], 'r', encoding='utf-8') as f:
+                    binary_data = self.encode_text(f.read(), request.get("writer", "reverser"))
+        else:
+            raise RequestError("Request needs a 'path', 'text' or 'json'")
+
+        if "output" in request:
+            with open(request["output"], 'wb') as f:
+                f.write(binary_data)
+            return {"output": request["output"], "size": len(binary_data)}
+        return {"data": base64.b64encode(binary_data).decode('ascii'), "size": len(binary_data)}
+
+    def _op_export(self, request):
+        from complete_decoder import LabVIEWDatabaseDecoder, ExportStage, EXPORT_SUFFIXES
+
+        if "path" not in request or "output" not in request:
+            raise RequestError("Request needs a 'path' and an 'output' prefix")
+        output_format = request.get("format", "all")
+        if output_format == "all":
+            formats = list(EXPORT_SUFFIXES)
+        elif isinstance(output_format, list):
+            formats = output_format
+        else:
+            formats = [output_format]
+
+        if self._decoder is None:
+            self._decoder = LabVIEWDatabaseDecoder(verbose=self.verbose)
+        # Keep one export stage per set of formats, so its worker pools stay warm.
+        # ExportStage raises for an unknown format, so a failed lookup is never cached.
+        key = frozenset(formats)
+        stage = self._export_stages.get(key)
+        if stage is None:
+            stage = ExportStage(self._decoder, formats)
+            self._export_stages[key] = stage
+
+        data = self._decoder.decode_file(request["path"])
+        timings = stage.export(data, request["output"])
+        return {
+            "outputs": [f"{request['output']}{EXPORT_SUFFIXES[fmt]}" for fmt in stage.formats],
+            "timings": timings,
+        }
+
+    def _op_hexdump(self, request):
+        return {"hex_dump": create_hex_dump(_read_input(request))}
+
+class ServiceMetrics:
+    """Request counters and latencies of the HTTP service, safe to update from any thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.in_flight = 0
+        # (endpoint, status) -> count
+        self.requests = {}
+        # endpoint -> [count, total seconds]
+        self.latency = {}
+        self.bytes_received = 0
+        self.bytes_sent = 0
+
+    def begin(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def end(self, endpoint, status, seconds, received, sent):
+        with self._lock:
+            self.in_flight -= 1
+            self.requests[(endpoint, status)] = self.requests.get((endpoint, status), 0) + 1
+            latency = self.latency.setdefault(endpoint, [0, 0.0])
+            latency[0] += 1
+            latency[1] += seconds
+            self.bytes_received += received
+            self.bytes_sent += sent
+
+    def render(self, workers):
+        """
+        Format the metrics in the Prometheus text format.
+
+        Args:
+            workers: Size of the worker pool
+
+        Returns:
+            Metrics as a string
+        """
+        with self._lock:
+            lines = [
+                f"converter_uptime_seconds {time.time() - self.started:.3f}",
+                f"converter_workers {workers}",
+                f"converter_requests_in_flight {self.in_flight}",
+                f"converter_received_bytes_total {self.bytes_received}",
+                f"converter_sent_bytes_total {self.bytes_sent}",
+            ]
+            for (endpoint, status), count in sorted(self.requests.items()):
+                lines.append(f'converter_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+            for endpoint, (count, seconds) in sorted(self.latency.items()):
+                lines.append(f'converter_request_seconds_sum{{endpoint="{endpoint}"}} {seconds:.6f}')
+                lines.append(f'converter_request_seconds_count{{endpoint="{endpoint}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+class PooledHTTPServer(HTTPServer):
+    """
+    HTTP server that handles connections on a fixed-size thread pool.
+    At most max_pending connections wait for a worker; further connections
+    are answered with 503. While connections are waiting, kept-alive
+    connections are closed after their current response so they hand
+    their worker over.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, server_address, handler_class, service, workers=4, max_request_size=DEFAULT_MAX_REQUEST_SIZE,
+                 max_pending=None):
+        super().__init__(server_address, handler_class)
+        self.service = service
+        self.workers = workers
+        self.max_request_size = max_request_size
+        self.max_pending = 4 * workers if max_pending is None else max_pending
+        self.metrics = ServiceMetrics()
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self._lock = threading.Lock()
+        self._connections = 0
+
+    def waiting(self):
+        """Return the number of accepted connections waiting for a worker."""
+        with self._lock:
+            return max(0, self._connections - self.workers)
+
+    def process_request(self, request, client_address):
+        with self._lock:
+            full = self._connections >= self.workers + self.max_pending
+            if not full:
+                self._connections += 1
+        if full:
+            self._reject(request)
+            return
+        self.pool.submit(self._process_request_worker, request, client_address)
+
+    def _reject(self, request):
+        # Answered on the accept thread without reading the request
+        try:
+            request.sendall(b"HTTP/1.1 503 Service Unavailable\r\nContent-Type: application/json\r\n"
+                            b"Content-Length: 26\r\nRetry-After: 1\r\nConnection: close\r\n\r\n"
+                            b'{"error": "Server busy"}\r\n')
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            with self._lock:
+                self._connections -= 1
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=False)
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP front end of ConversionService.
+
+      POST /decode?format=json|txt|all   binary file in, JSON out (format=txt returns text/plain)
+      POST /encode?writer=reverser|ni    text/plain or application/json program in, binary out
+      POST /hexdump                      binary file in, hex dump out
+      GET  /metrics                      Prometheus text format
+      GET  /health                       "ok"
+    """
+
+    protocol_version = "HTTP/1.1"
+    server_version = "SpringConverter/1.0"
+    # Seconds an idle kept-alive connection may hold a worker
+    timeout = 5
+
+    ENDPOINTS = {"/decode", "/encode", "/hexdump"}
+
+    def log_message(self, format, *args):
+        if self.server.service.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, content_type):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        if self.server.waiting():
+            # Free the worker for a waiting connection instead of idling on this one
+            self.close_connection = True
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+        return len(body)
+
+    def _send_json(self, status, payload):
+        return self._send(status, json.dumps(payload), "application/json")
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/metrics":
+            self._send(200, self.server.metrics.render(self.server.workers), "text/plain; version=0.0.4")
+        elif path == "/health":
+            self._send(200, "ok\n", "text/plain")
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint {path}"})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        endpoint = url.path
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        metrics = self.server.metrics
+        metrics.begin()
+        start = time.perf_counter()
+        received = sent = 0
+        status = 500
+
+        try:
+            if endpoint not in self.ENDPOINTS:
+                status = 404
+                sent = self._send_json(status, {"error": f"Unknown endpoint {endpoint}"})
+                return
+
+            length = self.headers.get("Content-Length")
+            if length is None:
+                status = 411
+                self.close_connection = True
+                sent = self._send_json(status, {"error": "Content-Length required"})
+                return
+            try:
+                length = int(length)
+            except ValueError:
+                length = -1
+            if length < 0:
+                # Where the body ends is unknown, so the connection cannot be reused
+                status = 400
+                self.close_connection = True
+                sent = self._send_json(status, {"error": "Invalid Content-Length"})
+                return
+            if length > self.server.max_request_size:
+                # The body is not read, so the connection cannot be reused
+                status = 413
+                self.close_connection = True
+                sent = self._send_json(status, {"error": f"Request body larger than {self.server.max_request_size} bytes"})
+                return
+
+            body = self.rfile.read(length)
+            received = len(body)
+            service = self.server.service
+
+            try:
+                if endpoint == "/decode":
+                    output_format = params.get("format", "json")
+                    result = service.decode(body, output_format)
+                    status = 200
+                    if output_format == "txt":
+                        sent = self._send(status, result["text"], "text/plain; charset=utf-8")
+                    else:
+                        sent = self._send_json(status, result)
+                elif endpoint == "/encode":
+                    content_type = self.headers.get("Content-Type", "text/plain")
+                    if content_type.startswith("application/json"):
+                        binary_data = service.encode_data(json.loads(body))
+                    else:
+                        binary_data = service.encode_text(body.decode('utf-8'), params.get("writer", "reverser"))
+                    status = 200
+                    sent = self._send(status, binary_data, "application/octet-stream")
+                else:
+                    status = 200
+                    sent = self._send(status, create_hex_dump(body), "text/plain; charset=utf-8")
+            except (ValueError, KeyError, IndexError, UnicodeDecodeError) as e:
+                status = 400
+                sent = self._send_json(status, {"error": str(e)})
+            except Exception as e:
+                status = 500
+                sent = self._send_json(status, {"error": str(e)})
+        finally:
+            metrics.end(endpoint if endpoint in self.ENDPOINTS else "other", status,
+                        time.perf_counter() - start, received, sent)
+
+def serve_http(service, host="127.0.0.1", port=8765, workers=4, max_request_size=DEFAULT_MAX_REQUEST_SIZE,
+               max_pending=None):
+    """
+    Serve the conversion endpoints over HTTP until interrupted.
+
+    Args:
+        service: ConversionService to run the requests
+        host: Address to listen on
+        port: Port to listen on (0 picks a free port)
+        workers: Number of connections handled at once
+        max_request_size: Largest accepted request body in bytes
+        max_pending: Connections that may wait for a worker before new ones get 503 (default: 4 per worker)
+
+    Returns:
+        PooledHTTPServer, already closed when this returns
+    """
+    server = PooledHTTPServer((host, port), ConversionRequestHandler, service, workers, max_request_size, max_pending)
+    print(f"Serving on http://{server.server_address[0]}:{server.server_address[1]} with {workers} workers",
+          file=sys.stderr)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+    return server
+
+def serve_stdio(service, stdin=None, stdout=None):
+    """
+    Answer newline-delimited JSON requests until the input ends.
+    Each response is written as one JSON line as soon as it is ready.
+    Anything the converters print goes to stderr so it cannot corrupt the stream.
+
+    Args:
+        service: ConversionService to run the requests
+        stdin: Text stream to read requests from (default: sys.stdin)
+        stdout: Text stream to write responses to (default: sys.stdout)
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = {"ok": False, "error": f"Invalid JSON: {e}", "elapsed_ms": 0.0}
+        else:
+            with contextlib.redirect_stdout(sys.stderr):
+                response = service.handle(request)
+        stdout.write(json.dumps(response) + "\n")
+        stdout.flush()
+
+def main():
+    parser = argparse.ArgumentParser(description='Long-running conversion service for spring force test files.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='Answer conversion requests')
+    transport = serve_parser.add_mutually_exclusive_group(required=True)
+    transport.add_argument('--stdio', action='store_true',
+                           help='Read JSON requests from standard input, one per line, and write one JSON response per line')
+    transport.add_argument('--http', action='store_true', help='Serve the conversion endpoints over HTTP')
+    serve_parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (HTTP)')
+    serve_parser.add_argument('--port', type=int, default=8765, help='Port to listen on (HTTP)')
+    serve_parser.add_argument('-w', '--workers', type=int, default=4, help='Number of connections handled at once (HTTP)')
+    serve_parser.add_argument('--max-request-size', type=int, default=DEFAULT_MAX_REQUEST_SIZE,
+                              help='Largest accepted request body in bytes (HTTP)')
+    serve_parser.add_argument('--max-pending', type=int,
+                              help='Connections that may wait for a worker before new ones are refused (HTTP, default: 4 per worker)')
+    serve_parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output (written to stderr)')
+
+    args = parser.parse_args()
+
+    service = ConversionService(verbose=args.verbose)
+    try:
+        if args.http:
+            serve_http(service, args.host, args.port, args.workers, args.max_request_size, args.max_pending)
+        else:
+            serve_stdio(service)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+
+import sys
+import json
+import argparse
+
+from binary_reader import BinaryReader, LENGTH_PREFIX, MAX_STRING_LENGTH
+from command_schema import HEADER_SIZE
+from encoder import SECTION_ANCHORS, read_header, read_command
+
+class IncompleteData(Exception):
+    """Raised when a field runs past the bytes received so far."""
+
+class _StreamReader(BinaryReader):
+    """
+    BinaryReader over the bytes received so far.
+    Until the stream is finished, a read that needs bytes beyond the end of
+    the buffer raises IncompleteData instead of being treated as invalid.
+    """
+
+    def __init__(self, buffer, finished):
+        super().__init__(buffer)
+        self.finished = finished
+
+    def has_bytes(self, offset, size):
+        if offset + size > len(self.view) and not self.finished:
+            raise IncompleteData()
+        return super().has_bytes(offset, size)
+
+    def read_length(self, offset):
+        if not self.finished:
+            if offset + 4 > len(self.view):
+                raise IncompleteData()
+            length = LENGTH_PREFIX.unpack_from(self.view, offset)[0]
+            if length <= MAX_STRING_LENGTH and offset + 4 + length > len(self.view):
+                raise IncompleteData()
+        return super().read_length(offset)
+
+class SequenceStreamDecoder:
+    """
+    Incremental decoder for spring force test files that arrive in chunks.
+    Applies the same field rules as encoder.process_binary_file, but yields
+    each test sequence command as soon as all of its bytes have arrived.
+    Length prefixes and payloads may be split across chunk boundaries.
+    """
+
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+        # Component metadata, None until the test sequence header has arrived
+        self.metadata = None
+        self.finished = False
+        self._buffer = bytearray()
+        # Offset of the next unread byte in the buffer, -1 once there is nothing left to decode
+        self._offset = 0
+        # Where to resume looking for the <Test Sequence> marker
+        self._marker_search = 0
+        self._row_index = 0
+
+    def feed(self, chunk):
+        """
+        Add received bytes to the decoder.
+        The chunk is buffered immediately, the returned generator only parses.
+
+        Args:
+            chunk: Bytes received from the file, socket or serial line
+
+        Returns:
+            Generator of CommandRecord steps completed by this chunk
+        """
+        if self.finished:
+            raise ValueError("Cannot feed data after close()")
+        self._buffer.extend(chunk)
+        return self._drain()
+
+    def close(self):
+        """
+        Mark the end of the stream.
+
+        Returns:
+            Generator of the remaining CommandRecord steps
+        """
+        self.finished = True
+        return self._drain()
+
+    def _drain(self):
+        if self._offset < 0:
+            return
+
+        # Parse the buffer in place. It cannot be resized while the reader's
+        # view exists, so the records are collected and yielded after it is released.
+        records = []
+        reader = _StreamReader(self._buffer, self.finished)
+        try:
+            if self.metadata is None and not self._read_header(reader):
+                return
+
+            offset = self._offset
+            while offset >= 0:
+                try:
+                    if not reader.has_bytes(offset, 5):
+                        self._offset = -1
+                        break
+                    command_entry, offset = read_command(reader, offset, self._row_index)
+                except IncompleteData:
+                    break
+                except Exception as e:
+                    if self.verbose:
+                        print(f"Error processing command at offset {offset}: {str(e)}")
+                    # Try to recover by moving to the next potential string
+                    command_entry = None
+                    offset += 1
+
+                self._offset = offset
+                if command_entry is not None:
+                    self._row_index += 1
+                    records.append(command_entry)
+        finally:
+            reader.close()
+
+        # Drop the bytes the records consumed
+        if self._offset > 0:
+            del self._buffer[:self._offset]
+            self._marker_search = max(0, self._marker_search - self._offset)
+            self._offset = 0
+        elif self._offset < 0:
+            self._buffer.clear()
+
+        yield from records
+
+    def _read_header(self, reader):
+        # Wait until the <Test Sequence> marker is in the buffer
+        marker = reader.find(SECTION_ANCHORS["<Test Sequence>"], self._marker_search)
+        if marker < 0 and not self.finished:
+            self._marker_search = max(0, len(reader) - len(SECTION_ANCHORS["<Test Sequence>"]) + 1)
+            return False
+
+        if len(reader) < HEADER_SIZE:
+            # File too small to be a valid spring force test file
+            self.metadata = {}
+            self._offset = -1
+            return False
+
+        try:
+            metadata, offset = read_header(reader, HEADER_SIZE)
+        except IncompleteData:
+            # The strings after the marker have not all arrived yet
+            return False
+
+        self.metadata = metadata
+        self._offset = offset
+        if self.verbose:
+            print(f"Extracted metadata: {metadata}")
+        return offset >= 0
+
+def decode_stream(stream, chunk_size=4096, verbose=False):
+    """
+    Decode a binary file from a readable stream as it arrives.
+
+    Args:
+        stream: File-like object with a read() method (file, socket file, serial port)
+        chunk_size: Maximum number of bytes to read at a time
+        verbose: Whether to print verbose output
+
+    Yields:
+        CommandRecord steps in file order
+    """
+    decoder = SequenceStreamDecoder(verbose)
+    # read1() returns whatever has arrived instead of waiting for a full chunk
+    read = getattr(stream, 'read1', stream.read)
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        yield from decoder.feed(chunk)
+    yield from decoder.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Decode a spring force test file as it arrives, printing one JSON line per command.')
+    parser.add_argument('input', nargs='?', default='-', help='Input binary file (default: standard input)')
+    parser.add_argument('-c', '--chunk-size', type=int, default=4096, help='Bytes to read at a time')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output')
+
+    args = parser.parse_args()
+
+    if args.input == '-':
+        stream = sys.stdin.buffer
+    else:
+        stream = open(args.input, 'rb')
+
+    with stream:
+        for command_entry in decode_stream(stream, args.chunk_size, args.verbose):
+            print(json.dumps(command_entry.to_dict()), flush=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+from binary_reader import LENGTH_PREFIX
+
+# Bytes accepted as "printable" inside a length-prefixed string payload
+PRINTABLE_ASCII = bytes(range(32, 127))
+
+# numpy module, imported by the first scan so decoders that never scan start
+# without it; False until then, None if numpy is not installed
+_np = False
+
+def _numpy():
+    global _np
+    if _np is False:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:
+            # The pure-Python scan below gives the same results, only slower
+            _np = None
+    return _np
+
+def find_candidate_strings(data, max_length=100, printable_only=True):
+    """
+    Find every offset that looks like the start of a length-prefixed string.
+    Each byte offset is tested independently, so candidates may overlap,
+    exactly like the brute-force scanners that test offsets one by one.
+
+    Args:
+        data: Binary data as bytes
+        max_length: Longest payload accepted (lengths of 0 are never accepted)
+        printable_only: Whether the payload must be printable ASCII
+
+    Returns:
+        List of (offset, length) tuples in offset order
+    """
+    if len(data) < 5:
+        return []
+    np = _numpy()
+    if np is not None:
+        return _find_candidates_numpy(np, data, max_length, printable_only)
+    return _find_candidates_python(data, max_length, printable_only)
+
+def _find_candidates_numpy(np, data, max_length, printable_only):
+    size = len(data)
+    raw = np.frombuffer(data, dtype=np.uint8)
+
+    # Big-endian u32 at every offset: a view with a 1-byte stride over the same buffer
+    lengths = np.ndarray(shape=(size - 3,), dtype='>u4', buffer=raw, strides=(1,)).astype(np.int64)
+    offsets = np.arange(size - 3, dtype=np.int64)
+    ends = offsets + 4 + lengths
+    mask = (lengths > 0) & (lengths <= max_length) & (ends <= size)
+
+    if printable_only:
+        # Printable bytes in data[a:b] is printable_count[b] - printable_count[a]
+        printable = (raw >= 32) & (raw <= 126)
+        printable_count = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(printable, out=printable_count[1:])
+        candidates = np.flatnonzero(mask)
+        runs = printable_count[ends[candidates]] - printable_count[candidates + 4]
+        candidates = candidates[runs == lengths[candidates]]
+    else:
+        candidates = np.flatnonzero(mask)
+
+    return list(zip(candidates.tolist(), lengths[candidates].tolist()))
+
+def _find_candidates_python(data, max_length, printable_only):
+    size = len(data)
+    candidates = []
+    for offset in range(size - 3):
+        length = LENGTH_PREFIX.unpack_from(data, offset)[0]
+        if 0 < length <= max_length and offset + 4 + length <= size:
+            if printable_only and data[offset+4:offset+4+length].translate(None, PRINTABLE_ASCII):
+                continue
+            candidates.append((offset, length))
+    return candidates
@@ -0,0 +1,43 @@
+import os
+
+from batch_decode import ColumnarBatch, decode_batch
+from command_schema import CommandRecord
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "DATA")
+
+def test_same_path_has_one_file_id():
+    batch = ColumnarBatch()
+    first = batch.add_file("a", {})
+    batch.add_step(first, 0, CommandRecord("R00", "TH"))
+    assert batch.add_file("a", {"Part Number": "1"}) == first
+    assert batch.files == ["a"]
+    assert batch.metadata == [{"Part Number": "1"}]
+
+    frame = batch.to_dataframe()
+    assert list(frame["File"]) == ["a"]
+
+def test_file_given_twice_is_decoded_once():
+    file_path = os.path.join(DATA_DIR, "AS 02~C-SPRING")
+    once = decode_batch([file_path])
+    twice = decode_batch([file_path, file_path])
+    assert twice.files == [file_path]
+    assert len(twice) == len(once) > 0
+    assert len(twice.to_dataframe()) == len(once)
+
+def test_file_failing_mid_sequence_adds_no_steps(monkeypatch):
+    import batch_decode
+
+    def failing_commands(reader, offset, verbose=False):
+        yield CommandRecord("R00", "ZF", "Zero Force")
+        yield CommandRecord("R01", "TH", "Search Contact")
+        raise ValueError("truncated command")
+
+    file_path = os.path.join(DATA_DIR, "AS 02~C-SPRING")
+    monkeypatch.setattr(batch_decode, "iter_commands", failing_commands)
+    batch = decode_batch([file_path])
+
+    assert batch.errors == {file_path: "truncated command"}
+    assert file_path not in batch
+    assert batch.files == []
+    assert len(batch) == 0
+    assert list(batch.iter_rows()) == []
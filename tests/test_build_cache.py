@@ -0,0 +1,102 @@
+import os
+import shutil
+
+import encoder
+from build_cache import BuildCache
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "DATA")
+
+def _outputs(output_dir):
+    return lambda input_file: [os.path.join(output_dir, os.path.basename(input_file) + ".out")]
+
+def _build(input_dir, output_dir, version=1, options=None):
+    # One run of a converter: convert the changed inputs, record and save them
+    cache = BuildCache(output_dir, "tool", version, options or {"format": "txt"})
+    output_paths = _outputs(output_dir)
+    inputs = sorted(os.path.join(input_dir, name) for name in os.listdir(input_dir))
+    converted = cache.changed(inputs, output_paths)
+    for input_file in converted:
+        for path in output_paths(input_file):
+            with open(path, 'w') as f:
+                f.write("converted")
+        cache.record(input_file, output_paths(input_file))
+    cache.save()
+    return [os.path.basename(path) for path in converted], cache.skipped
+
+def _setup(tmp_path):
+    input_dir = tmp_path / "in"
+    output_dir = tmp_path / "out"
+    input_dir.mkdir()
+    output_dir.mkdir()
+    for name in ("a", "b", "c"):
+        (input_dir / name).write_bytes(name.encode() * 10)
+    assert _build(str(input_dir), str(output_dir)) == (["a", "b", "c"], 0)
+    return input_dir, output_dir
+
+def test_unchanged_inputs_are_skipped(tmp_path):
+    input_dir, output_dir = _setup(tmp_path)
+    assert _build(str(input_dir), str(output_dir)) == ([], 3)
+    assert (output_dir / ".tool_manifest.json").exists()
+
+def test_content_change_rebuilds_only_that_input(tmp_path):
+    input_dir, output_dir = _setup(tmp_path)
+    (input_dir / "b").write_bytes(b"changed")
+    assert _build(str(input_dir), str(output_dir)) == (["b"], 2)
+    assert _build(str(input_dir), str(output_dir)) == ([], 3)
+
+def test_same_size_and_mtime_content_change_is_detected(tmp_path):
+    # The manifest compares content hashes, not sizes or timestamps
+    input_dir, output_dir = _setup(tmp_path)
+    stat = os.stat(input_dir / "a")
+    (input_dir / "a").write_bytes(b"z" * 10)
+    os.utime(input_dir / "a", ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert _build(str(input_dir), str(output_dir)) == (["a"], 2)
+
+def test_options_change_rebuilds_everything(tmp_path):
+    input_dir, output_dir = _setup(tmp_path)
+    assert _build(str(input_dir), str(output_dir), options={"format": "json"}) == (["a", "b", "c"], 0)
+
+def test_version_change_rebuilds_everything(tmp_path):
+    input_dir, output_dir = _setup(tmp_path)
+    assert _build(str(input_dir), str(output_dir), version=2) == (["a", "b", "c"], 0)
+
+def test_deleted_output_rebuilds_its_input(tmp_path):
+    input_dir, output_dir = _setup(tmp_path)
+    os.remove(output_dir / "c.out")
+    assert _build(str(input_dir), str(output_dir)) == (["c"], 2)
+
+def test_inputs_sharing_an_output_are_rebuilt_together(tmp_path):
+    input_dir, output_dir = _setup(tmp_path)
+    shared = lambda input_file: [os.path.join(str(output_dir), "shared.out")]
+    cache = BuildCache(str(output_dir), "shared", 1)
+    inputs = [str(input_dir / name) for name in ("a", "b")]
+    for input_file in inputs:
+        (output_dir / "shared.out").write_text("converted")
+        cache.record(input_file, shared(input_file))
+    cache.save()
+
+    (input_dir / "b").write_bytes(b"changed")
+    cache = BuildCache(str(output_dir), "shared", 1)
+    # a is unchanged but writes the same file as b, so it is converted again first
+    assert cache.changed(inputs, shared) == inputs
+
+def test_unreadable_manifest_rebuilds_everything(tmp_path):
+    input_dir, output_dir = _setup(tmp_path)
+    (output_dir / ".tool_manifest.json").write_text("{not json")
+    assert _build(str(input_dir), str(output_dir)) == (["a", "b", "c"], 0)
+
+def test_encoder_incremental_run_skips_unchanged_files(tmp_path):
+    input_dir = tmp_path / "in"
+    output_dir = tmp_path / "out"
+    input_dir.mkdir()
+    for name in ("AS 02~C-SPRING", "AS 01~Comp-Height"):
+        shutil.copy(os.path.join(DATA_DIR, name), input_dir / name)
+
+    assert encoder.process_directory(str(input_dir), str(output_dir), "txt", incremental=True) == (2, 0)
+    txt_path = output_dir / "AS_02_C-SPRING.txt"
+    os.remove(txt_path)
+    mtime = os.stat(output_dir / "AS_01_Comp-Height.txt").st_mtime_ns
+
+    assert encoder.process_directory(str(input_dir), str(output_dir), "txt", incremental=True) == (2, 0)
+    assert txt_path.exists()
+    assert os.stat(output_dir / "AS_01_Comp-Height.txt").st_mtime_ns == mtime
@@ -0,0 +1,88 @@
+import os
+import shutil
+
+import catalogue
+from catalogue import INDEXES, Catalogue
+from encoder import process_binary_file
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "DATA")
+
+SAMPLES = ["AS 01~Comp-Height", "AS 01~Tens-Height", "AS 02~C-SPRING", "AS 01~THM0121536", "AS 01~TA44942BO"]
+
+def _copy_samples(tmp_path):
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    for name in SAMPLES:
+        shutil.copy(os.path.join(DATA_DIR, name), input_dir / name)
+    return [str(input_dir / name) for name in SAMPLES]
+
+def _load(db_path, file_paths, prune=False):
+    with Catalogue(db_path) as cat:
+        cat.load(file_paths, process_binary_file, prune)
+        counts = (cat.added, cat.updated, cat.unchanged, cat.removed, cat.failed)
+        rows = {table: cat.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("files", "specs", "steps")}
+        indexes = {name for (name,) in cat.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    return counts, rows, indexes
+
+def _expected_steps(file_paths):
+    return sum(len(process_binary_file(path)["test_sequence"]) for path in file_paths)
+
+def test_incremental_counts(tmp_path):
+    files = _copy_samples(tmp_path)
+    db_path = str(tmp_path / "catalogue.db")
+
+    counts, rows, _ = _load(db_path, files)
+    assert counts == (5, 0, 0, 0, 0)
+    assert rows["files"] == 5
+    assert rows["steps"] == _expected_steps(files)
+
+    counts, rows, _ = _load(db_path, files)
+    assert counts == (0, 0, 5, 0, 0)
+    assert rows["files"] == 5
+
+    # Replace one file's contents and leave another out
+    shutil.copy(os.path.join(DATA_DIR, "AS 01~Tension-Deflection"), files[0])
+    counts, rows, _ = _load(db_path, files[:-1])
+    assert counts == (0, 1, 3, 0, 0)
+    # Without prune the file left out stays catalogued
+    assert rows["files"] == 5
+
+    counts, rows, _ = _load(db_path, files[:-1], prune=True)
+    assert counts == (0, 0, 4, 1, 0)
+    assert rows["files"] == 4
+    # The updated file's old steps are gone
+    assert rows["steps"] == _expected_steps(files[:-1])
+
+def test_changed_options_reload_everything(tmp_path):
+    files = _copy_samples(tmp_path)
+    db_path = str(tmp_path / "catalogue.db")
+    _load(db_path, files)
+    with Catalogue(db_path, {"decoder": "complete"}) as cat:
+        cat.load(files, process_binary_file)
+        assert (cat.added, cat.unchanged) == (5, 0)
+
+def test_indexes_rebuilt_after_a_large_load(tmp_path, monkeypatch):
+    files = _copy_samples(tmp_path)
+    db_path = str(tmp_path / "catalogue.db")
+    dropped = []
+    drop_indexes = Catalogue.drop_indexes
+    monkeypatch.setattr(Catalogue, "drop_indexes", lambda self: (dropped.append(True), drop_indexes(self)))
+
+    # A first load changes everything: indexes are dropped, then created after the rows
+    _, _, indexes = _load(db_path, files)
+    assert dropped == [True]
+    assert indexes >= set(INDEXES)
+
+    # One changed file out of five is below the threshold, the indexes are updated in place
+    monkeypatch.setattr(catalogue, "REINDEX_FRACTION", 0.5)
+    shutil.copy(os.path.join(DATA_DIR, "AS 01~Tension-Deflection"), files[0])
+    _, _, indexes = _load(db_path, files)
+    assert dropped == [True]
+    assert indexes >= set(INDEXES)
+
+    # A load with nothing to decode still leaves every index in place
+    with Catalogue(db_path) as cat:
+        cat.drop_indexes()
+    _, _, indexes = _load(db_path, files)
+    assert indexes >= set(INDEXES)
@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+from command_schema import pack_string
+from complete_decoder import LabVIEWDatabaseDecoder
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "DATA")
+
+SAMPLES = sorted(name for name in os.listdir(DATA_DIR)
+                 if os.path.isfile(os.path.join(DATA_DIR, name)) and not name.endswith(('.txt', '.json')))
+
+def _decoded(data):
+    return (data["component_specifications"], [step.to_tuple() for step in data["test_sequence"]],
+            data.get("_extracted_strings"))
+
+@pytest.mark.parametrize("name", SAMPLES)
+def test_chain_and_scan_modes_agree(name):
+    file_path = os.path.join(DATA_DIR, name)
+    chain = LabVIEWDatabaseDecoder(scan_mode="chain").decode_file(file_path)
+    scan = LabVIEWDatabaseDecoder(scan_mode="scan").decode_file(file_path)
+    assert _decoded(chain) == _decoded(scan)
+    assert chain["file_info"]["scan_mode"] == "chain"
+    assert scan["file_info"]["skipped_bytes"] == 0
+
+def test_chain_resync_counts_skipped_bytes(tmp_path):
+    garbage = b"\xff\xff\xff\xff\x01\x02"
+    data = (b"\x00\x00\x00\x02\x00\x00\x00\x01" + pack_string("Part Number") + garbage
+            + pack_string("Model Number"))
+    file_path = tmp_path / "damaged"
+    file_path.write_bytes(data)
+
+    decoded = LabVIEWDatabaseDecoder(scan_mode="chain").decode_file(str(file_path))
+    assert decoded["file_info"]["skipped_bytes"] == len(garbage)
+    assert decoded["_extracted_strings"] == ["Part Number", "Model Number"]
@@ -0,0 +1,84 @@
+import gzip
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import corpus_jsonl
+from command_schema import with_record_dicts
+from corpus_jsonl import open_stream, record_serializer, write_corpus
+from corpus_summary import decoder_function
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(REPO_DIR, "DATA")
+
+SAMPLES = [os.path.join(DATA_DIR, name) for name in ("AS 01~Comp-Height", "AS 02~C-SPRING", "AS 01~THM0121536")]
+
+def _records(lines):
+    records = [json.loads(line) for line in lines.splitlines()]
+    for record in records:
+        # The complete decoder stamps each decode
+        record.get("file_info", {}).pop("decode_time", None)
+    return records
+
+def _lines(monkeypatch, use_orjson, decoder, command_key):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(corpus_jsonl, "orjson", None)
+    stream = io.BytesIO()
+    write_corpus(SAMPLES, stream, decoder_function(decoder), command_key)
+    return stream.getvalue()
+
+@pytest.mark.parametrize("decoder, command_key", [("encoder", "Command"), ("complete", "CMD")])
+def test_orjson_and_stdlib_write_equal_records(monkeypatch, decoder, command_key):
+    with monkeypatch.context() as patch:
+        fast = _lines(patch, True, decoder, command_key)
+    stdlib = _lines(monkeypatch, False, decoder, command_key)
+
+    stdlib_records = _records(stdlib)
+    assert _records(fast) == stdlib_records
+    assert len(stdlib_records) == len(SAMPLES)
+
+    # Each record is the per-file JSON form of the decoded data
+    decode = decoder_function(decoder)
+    for file_path, record in zip(SAMPLES, stdlib_records):
+        expected = json.dumps(dict(with_record_dicts(decode(file_path), command_key), file=file_path))
+        assert _records(expected) == [record]
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_non_ascii_and_steps_serialize_the_same(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(corpus_jsonl, "orjson", None)
+    decoded = decoder_function("encoder")(SAMPLES[0])
+    record = {"file": "Prüfung µ", "metadata": {"Part Number": "Ø 12"}, "test_sequence": decoded["test_sequence"]}
+    line = record_serializer("CMD")(record)
+    assert line.endswith(b"\n") and line.count(b"\n") == 1
+    assert json.loads(line) == json.loads(json.dumps(with_record_dicts(record, "CMD")))
+    with pytest.raises(TypeError):
+        record_serializer()({"value": object()})
+
+def test_gzip_round_trip():
+    raw = io.BytesIO()
+    with open_stream(raw, True) as stream:
+        records, errors = write_corpus(SAMPLES + [os.path.join(DATA_DIR, "missing")], stream,
+                                       decoder_function("encoder"))
+    assert (records, errors) == (4, 1)
+
+    plain = io.BytesIO()
+    write_corpus(SAMPLES + [os.path.join(DATA_DIR, "missing")], plain, decoder_function("encoder"))
+    assert gzip.decompress(raw.getvalue()) == plain.getvalue()
+    assert json.loads(plain.getvalue().splitlines()[-1])["error"]
+
+def test_command_line_gz_output(tmp_path):
+    output = tmp_path / "corpus.jsonl.gz"
+    subprocess.run([sys.executable, os.path.join(REPO_DIR, "corpus_jsonl.py"), *SAMPLES, "-o", str(output)],
+                   check=True, capture_output=True)
+    with gzip.open(output, 'rt', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert [record["file"] for record in records] == SAMPLES
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from command_schema import CommandRecord
+from complete_decoder import LabVIEWDatabaseDecoder
+from corpus_summary import CorpusSummary, UNKNOWN, force_unit, free_length_bucket, iter_inputs
+from encoder import process_binary_file
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "DATA")
+
+def test_force_unit_of_complete_decoder_output_matches_encoder():
+    file_path = os.path.join(DATA_DIR, "AS 02~C-SPRING")
+    expected = process_binary_file(file_path)["metadata"]["Force Unit"]
+    decoded = LabVIEWDatabaseDecoder().decode_file(file_path)
+    assert "Force Unit" not in decoded["component_specifications"]
+    assert force_unit(decoded) == expected == "lbf"
+
+def test_force_unit_needs_a_unit_step():
+    assert force_unit({"metadata": {"Force Unit": "N"}}) == "N"
+    assert force_unit({"test_sequence": [CommandRecord("R00", "ZF", "Zero Force")]}) is None
+    assert force_unit({}) is None
+
+@pytest.mark.parametrize("free_length, bucket_size, expected", [
+    ("120 mm", 10, 120),
+    ("129.9 mm", 10, 120),
+    ("5 mm", 10, 0),
+    ("-3 mm", 10, -10),
+    ("47.5", 2.5, 47.5),
+    ("", 10, None),
+    (None, 10, None),
+    ("-- mm", 10, None),
+])
+def test_free_length_bucket(free_length, bucket_size, expected):
+    assert free_length_bucket(free_length, bucket_size) == expected
+
+def test_summary_counts_buckets_and_units():
+    summary = CorpusSummary(bucket_size=10)
+    summary.add("a", {"metadata": {"Free Length": "125 mm", "Force Unit": "N"}, "test_sequence": []})
+    record = summary.add("b", {"metadata": {}, "test_sequence": []})
+    summary.add_error("c", ValueError("bad"))
+
+    assert record["force_unit"] == UNKNOWN
+    assert record["free_length_bucket"] == UNKNOWN
+    totals = summary.to_dict()
+    assert totals["files"] == 2
+    assert totals["failed"] == 1
+    assert totals["force_units"] == {"N": 1, UNKNOWN: 1}
+    assert totals["free_length_buckets"] == {"120-130": 1, UNKNOWN: 1}
+
+def test_iter_inputs_skips_excluded_outputs(tmp_path):
+    for name in ("program", "summary.out"):
+        (tmp_path / name).write_bytes(b"\x00")
+    found = list(iter_inputs([str(tmp_path)], exclude=[str(tmp_path / "summary.out")]))
+    assert found == [str(tmp_path / "program")]
@@ -0,0 +1,27 @@
+import os
+
+from duplicates import DuplicatePlan
+
+def test_link_outputs_skips_missing_original_output(tmp_path):
+    input_dir = tmp_path / "in"
+    output_dir = tmp_path / "out"
+    input_dir.mkdir()
+    output_dir.mkdir()
+    for name in ("a", "b"):
+        (input_dir / name).write_bytes(b"same content")
+
+    def output_paths(input_file):
+        name = os.path.basename(input_file)
+        return [str(output_dir / f"{name}.txt"), str(output_dir / f"{name}_hex_dump.txt")]
+
+    inputs = [str(input_dir / "a"), str(input_dir / "b")]
+    plan = DuplicatePlan(inputs, output_paths)
+    assert plan.to_convert == inputs[:1]
+    assert plan.links == [(inputs[1], inputs[0])]
+
+    # The original was converted without its hex dump
+    (output_dir / "a.txt").write_text("converted")
+
+    assert plan.link_outputs() == [(inputs[1], inputs[0])]
+    assert os.path.samefile(output_dir / "a.txt", output_dir / "b.txt")
+    assert not (output_dir / "b_hex_dump.txt").exists()
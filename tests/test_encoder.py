@@ -0,0 +1,114 @@
+import os
+import shutil
+import struct
+
+import pytest
+
+from binary_reader import BinaryReader
+from command_schema import pack_string
+from encoder import iter_conversions, process_binary_data, process_directory, read_header
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "DATA")
+
+def _strings_after(data, offset):
+    # Offsets of the length-prefixed strings that follow offset
+    while offset + 4 <= len(data):
+        length = struct.unpack_from('>I', data, offset)[0]
+        if offset + 4 + length > len(data):
+            return
+        yield offset, length
+        offset += 4 + length
+
+def test_header_anchor_after_test_sequence_marker_is_ignored():
+    with open(os.path.join(DATA_DIR, "AS 02~C-SPRING"), 'rb') as f:
+        data = bytearray(f.read())
+    expected = process_binary_data(bytes(data))
+
+    # Drop the header's Model Number and put its anchor in a test sequence field
+    anchor = pack_string("Model Number")
+    data[data.find(anchor) + 4] = ord("m")
+    marker = data.find(pack_string("<Test Sequence>"))
+    field = next(offset for offset, length in _strings_after(data, marker + 19) if length == len("Model Number"))
+    data[field:field + len(anchor)] = anchor
+
+    metadata, offset = read_header(BinaryReader(bytes(data)), 13)
+    assert "Model Number" not in metadata
+    assert offset > marker
+    assert len(process_binary_data(bytes(data))["test_sequence"]) == len(expected["test_sequence"])
+
+def _strings(*values):
+    return b"".join(pack_string(value) for value in values)
+
+def test_header_fields_found_past_an_unexpected_string():
+    # The old sequential read stopped at "Revision" and left Model Number and Free Length empty
+    data = (b'\x00\x00\x00\x12\x00\x00\x00\x06\x00\x00\x00\x01\x31'
+            + _strings("Part Number", "--", "P-100", "Revision", "B", "Model Number", "--", "M1",
+                       "Free Length", "mm", "120", "<Test Sequence>", "N", "--", "Height", "125", "80"))
+    metadata, offset = read_header(BinaryReader(data), 13)
+    assert metadata == {"Part Number": "P-100", "Model Number": "M1", "Free Length": "120 mm", "Force Unit": "N"}
+    assert offset == len(data)
+
+def test_header_fields_of_a_short_header_file():
+    # Two 4-byte array dimensions instead of the 13-byte header: Part Number
+    # starts before offset 13, the fields after it are still found
+    root = os.path.dirname(DATA_DIR)
+    metadata = process_binary_data(open(os.path.join(root, "AS 02~THM0121536"), 'rb').read())["metadata"]
+    assert "Part Number" not in metadata
+    assert metadata["Model Number"] == "2022"
+    assert metadata["Free Length"] == ": 315 mm"
+    assert metadata["Force Unit"] == "lbf"
+
+SAMPLES = ["AS 01~Comp-Height", "AS 01~Tens-Height", "AS 02~C-SPRING", "AS 01~THM0121536"]
+
+def _read_outputs(output_dir):
+    outputs = {}
+    for root, _, filenames in os.walk(output_dir):
+        for filename in filenames:
+            path = os.path.join(root, filename)
+            with open(path, 'rb') as f:
+                outputs[os.path.relpath(path, output_dir)] = f.read()
+    return outputs
+
+def _inputs(tmp_path):
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    files = []
+    for name in SAMPLES:
+        shutil.copy(os.path.join(DATA_DIR, name), input_dir / name)
+        files.append(str(input_dir / name))
+    # Both write AS_02_C-SPRING.*, the later one must win as in a serial run
+    shutil.copy(os.path.join(DATA_DIR, "AS 01~Comp-Height"), input_dir / "AS 02 C-SPRING")
+    files.append(str(input_dir / "AS 02 C-SPRING"))
+    return files
+
+@pytest.mark.parametrize("jobs", [2, 3])
+def test_parallel_conversion_matches_serial(tmp_path, jobs):
+    files = _inputs(tmp_path)
+    # An input that cannot be read fails the same way in both modes
+    files.insert(2, str(tmp_path / "in" / "missing"))
+
+    serial = list(iter_conversions(files, str(tmp_path / "serial")))
+    parallel = list(iter_conversions(files, str(tmp_path / "parallel"), jobs=jobs))
+
+    assert sorted(parallel) == sorted(serial)
+    assert sum(not success for _, (success, _) in parallel) == 1
+    assert _read_outputs(tmp_path / "parallel") == _read_outputs(tmp_path / "serial")
+
+def test_same_output_name_converted_in_listing_order(tmp_path):
+    files = _inputs(tmp_path)
+    shared = [file_path for file_path in files if os.path.basename(file_path).startswith("AS 02")]
+
+    results = [file_path for file_path, _ in iter_conversions(files, str(tmp_path / "out"), "txt", jobs=2)]
+    assert [file_path for file_path in results if file_path in shared] == shared
+
+    # The text written is the conversion of the last input
+    last = list(iter_conversions(shared[-1:], str(tmp_path / "last"), "txt"))
+    assert last[0][1] == (True, "")
+    assert (tmp_path / "out" / "AS_02_C-SPRING.txt").read_bytes() == (tmp_path / "last" / "AS_02_C-SPRING.txt").read_bytes()
+
+def test_process_directory_totals_match_serial(tmp_path):
+    _inputs(tmp_path)
+    serial = process_directory(str(tmp_path / "in"), str(tmp_path / "serial"), jobs=1)
+    parallel = process_directory(str(tmp_path / "in"), str(tmp_path / "parallel"), jobs=2)
+    assert parallel == serial == (5, 0)
+    assert _read_outputs(tmp_path / "parallel") == _read_outputs(tmp_path / "serial")
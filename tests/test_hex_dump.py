@@ -0,0 +1,102 @@
+import io
+import os
+
+import pytest
+
+from hex_dump import create_hex_dump, iter_hex_dump, iter_hex_dump_blocks, write_hex_dump
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "DATA")
+
+# Copies of the formatters the three tools used before hex_dump.py, the references for each style
+
+def _legacy_encoder(data, bytes_per_line=16):
+    result = []
+    for i in range(0, len(data), bytes_per_line):
+        chunk = data[i:i+bytes_per_line]
+        hex_values = ' '.join(f'{b:02X}' for b in chunk)
+        ascii_values = ''.join(chr(b) if 32 <= b <= 126 else '.' for b in chunk)
+        result.append(f'{i:08X}  {hex_values:<{bytes_per_line*3}}  |{ascii_values}|')
+    return '\n'.join(result)
+
+def _legacy_complete_decoder(data, bytes_per_line=16):
+    f = io.StringIO()
+    for i in range(0, len(data), 16):
+        chunk = data[i:i+16]
+        hex_values = ' '.join(f'{b:02x}' for b in chunk)
+        ascii_values = ''.join(chr(b) if 32 <= b <= 126 else '.' for b in chunk)
+        f.write(f"{i:08x}:  {hex_values.ljust(47)}  {ascii_values}\n")
+    return f.getvalue()
+
+def _legacy_jksbrfgkjasfjkgbar(binary_data, bytes_per_line=16):
+    result = []
+    ascii_repr = []
+    for i, byte in enumerate(binary_data):
+        if i % bytes_per_line == 0:
+            if i > 0:
+                result.append("  " + "".join(ascii_repr))
+                result.append("\n")
+                ascii_repr = []
+            result.append(f"{i:08x}:  ")
+        result.append(f"{byte:02x} ")
+        if 32 <= byte <= 126:
+            ascii_repr.append(chr(byte))
+        else:
+            ascii_repr.append(".")
+    padding = bytes_per_line - (len(binary_data) % bytes_per_line) if len(binary_data) % bytes_per_line != 0 else 0
+    result.append("   " * padding)
+    result.append("  " + "".join(ascii_repr))
+    return "".join(result)
+
+LEGACY = {
+    "encoder": _legacy_encoder,
+    "complete_decoder": _legacy_complete_decoder,
+    "jksbrfgkjasfjkgbar": _legacy_jksbrfgkjasfjkgbar,
+}
+
+# Every byte value, so the ASCII column sees printable and non-printable bytes
+ALL_BYTES = bytes(range(256)) * 2
+
+@pytest.mark.parametrize("style", sorted(LEGACY))
+@pytest.mark.parametrize("length", [1, 2, 15, 16, 17, 31, 32, 33, 255, 512])
+def test_styles_match_legacy_output(style, length):
+    data = ALL_BYTES[:length]
+    assert create_hex_dump(data, style=style) == LEGACY[style](data)
+
+@pytest.mark.parametrize("style", ["encoder", "jksbrfgkjasfjkgbar"])
+@pytest.mark.parametrize("length", [7, 8, 9, 100])
+def test_styles_match_legacy_output_with_short_lines(style, length):
+    data = ALL_BYTES[:length]
+    assert create_hex_dump(data, bytes_per_line=8, style=style) == LEGACY[style](data, 8)
+
+@pytest.mark.parametrize("style", sorted(LEGACY))
+def test_styles_match_legacy_output_on_sample(style):
+    with open(os.path.join(DATA_DIR, "AS 02~C-SPRING"), 'rb') as f:
+        data = f.read()
+    assert create_hex_dump(data, style=style) == LEGACY[style](data)
+    assert create_hex_dump(memoryview(bytearray(data)), style=style) == LEGACY[style](data)
+
+def test_empty_data():
+    assert create_hex_dump(b"", style="encoder") == _legacy_encoder(b"")
+    assert create_hex_dump(b"", style="complete_decoder") == _legacy_complete_decoder(b"")
+    # The only intended difference: the old formatter wrote two spaces for an empty file
+    assert create_hex_dump(b"", style="jksbrfgkjasfjkgbar") == ""
+
+@pytest.mark.parametrize("style", sorted(LEGACY))
+@pytest.mark.parametrize("length", [1, 47, 48, 49, 95, 96, 97])
+def test_blocks_concatenate_to_the_dump(style, length):
+    # Three lines of 16 bytes per block: lengths on both sides of each block edge
+    data = ALL_BYTES[:length]
+    blocks = list(iter_hex_dump_blocks(data, style, block_lines=3))
+
+    assert "".join(blocks) == create_hex_dump(data, style=style)
+    lines = -(-length // 16)
+    assert len(blocks) == -(-lines // 3)
+    for block in blocks[:-1]:
+        assert len(block.strip("\n").split("\n")) == 3
+    assert list(iter_hex_dump(data, style, block_lines=3)) == create_hex_dump(data, style=style).splitlines()
+
+@pytest.mark.parametrize("style", sorted(LEGACY))
+def test_write_hex_dump(style):
+    f = io.StringIO()
+    write_hex_dump(ALL_BYTES, f, style=style)
+    assert f.getvalue() == LEGACY[style](ALL_BYTES)
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from journal import Journal
+
+OPTIONS = {"format": "all"}
+
+def _write(path, text):
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+def test_resume_after_truncated_line(tmp_path):
+    inputs = [_write(tmp_path / name, name) for name in ("a", "b", "c")]
+    outputs = {path: str(tmp_path / "out" / f"{name}.txt") for path, name in zip(inputs, "abc")}
+    (tmp_path / "out").mkdir()
+
+    with Journal(str(tmp_path / "out"), "encoder", 1, OPTIONS) as journal:
+        for input_file in inputs[:2]:
+            _write(tmp_path / "out" / f"{input_file[-1]}.txt", "converted")
+            journal.record(input_file, [outputs[input_file]])
+
+    # The run is killed while writing the line for the second input
+    with open(journal.path, 'r+', encoding='utf-8') as f:
+        text = f.read()
+        f.seek(0)
+        f.truncate()
+        f.write(text[:text.rindex('{"input"') + 20])
+
+    with Journal(str(tmp_path / "out"), "encoder", 1, OPTIONS, resume=True) as journal:
+        assert journal.pending(inputs, lambda path: [outputs[path]]) == inputs[1:]
+        assert journal.skipped == 1
+        journal.record(inputs[1], [outputs[inputs[1]]])
+
+    lines = open(journal.path, encoding='utf-8').read().split('\n')
+    assert lines[-1] == ""
+    # The torn line is left on a line of its own, the next record stays readable
+    assert json.loads(lines[-2])["input"] == inputs[1]
+
+def test_resume_with_other_options_is_refused(tmp_path):
+    Journal(str(tmp_path), "encoder", 1, OPTIONS).close()
+    with pytest.raises(ValueError):
+        Journal(str(tmp_path), "encoder", 1, {"format": "txt"}, resume=True)
@@ -0,0 +1,19 @@
+from openpyxl import load_workbook
+
+from command_schema import CommandRecord
+from library_workbook import LibraryWorkbook
+
+def test_formula_like_condition_is_written_as_text(tmp_path):
+    workbook = LibraryWorkbook()
+    step = CommandRecord("2", "PM", "Probe Mode", "=(R02-24.3)", "N", "", "10")
+    workbook.add("program", {"metadata": {"Part Number": "=A1"}, "test_sequence": [step]})
+    output_path = tmp_path / "library.xlsx"
+    workbook.save(str(output_path))
+
+    sequence = load_workbook(output_path)["Test Sequence"]
+    assert sequence.cell(row=2, column=5).value == "=(R02-24.3)"
+    assert sequence.cell(row=2, column=5).data_type == "s"
+
+    index = load_workbook(output_path)["Index"]
+    assert index.cell(row=2, column=3).value == "=A1"
+    assert index.cell(row=2, column=3).data_type == "s"
@@ -0,0 +1,70 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from command_schema import COMMAND_LAYOUTS
+from encoder import format_as_text, process_binary_data
+from reverser import parse_text, text_to_binary
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+METADATA = {"Part Number": "P-100", "Model Number": "M1", "Free Length": "120 mm"}
+
+# Field values of one step per command code; fields the text form does not
+# carry (FL(P) and Fr(P) units) keep the layout default so both forms agree
+STEP_VALUES = {
+    "ZF": {"Description": "Zero Force"},
+    "ZD": {"Description": "Zero Displacement"},
+    "TH": {"Description": "Search Contact", "Condition": "12", "Unit": "N", "Tolerance": "15"},
+    "FL(P)": {"Description": "Measure Free Length", "Unit": "mm", "Tolerance": "118(110,130)"},
+    "Mv(P)": {"Description": "Move to Position", "Condition": "=(R02-10)", "Unit": "mm", "Tolerance": "60"},
+    "Fr(P)": {"Description": "Force at Position", "Unit": "N", "Tolerance": "250(200,300)"},
+    "TD": {"Description": "Time Delay", "Condition": "3", "Unit": "Sec"},
+    "Scrag": {"Description": "Scragging", "Condition": "R04,5"},
+    "PMsg": {"Description": "User Message", "Condition": "Remove Spring"},
+    "LP": {"Description": "Loop", "Condition": "R02,4"},
+}
+
+def _decode(code, binary):
+    steps = process_binary_data(bytes(binary))["test_sequence"]
+    # The ZF step after the command checks that its padding was consumed
+    assert [step.command for step in steps] == [code, "ZF"]
+    return steps[0]
+
+@pytest.mark.parametrize("code", sorted(COMMAND_LAYOUTS))
+def test_json_step_round_trips_through_encoder(code):
+    values = STEP_VALUES[code]
+    steps = [dict(values, Command=code), dict(STEP_VALUES["ZF"], Command="ZF")]
+    binary = text_to_binary({"metadata": METADATA, "test_sequence": steps})
+
+    step = _decode(code, binary)
+    for field in COMMAND_LAYOUTS[code].fields:
+        assert step[field] == values[field]
+
+@pytest.mark.parametrize("code", sorted(COMMAND_LAYOUTS))
+def test_text_step_round_trips_through_encoder(code):
+    values = STEP_VALUES[code]
+    steps = [dict(values, Command=code), dict(STEP_VALUES["ZF"], Command="ZF")]
+    binary = text_to_binary({"metadata": METADATA, "test_sequence": steps})
+
+    # Text written by the encoder encodes back to the same bytes
+    text = format_as_text(process_binary_data(bytes(binary)))
+    assert text_to_binary(parse_text(text)) == binary
+
+def test_verbose_output_stays_off_a_summary_on_stdout(tmp_path):
+    text = format_as_text(process_binary_data(bytes(text_to_binary({"metadata": METADATA, "test_sequence": []}))))
+    for name in ("a.txt", "b.txt"):
+        (tmp_path / name).write_text(text, encoding='utf-8')
+    (tmp_path / "c.json").write_text("not json", encoding='utf-8')
+
+    result = subprocess.run([sys.executable, os.path.join(REPO_DIR, "reverser.py"), str(tmp_path),
+                             "-o", str(tmp_path / "out"), "-j", "2", "-v", "--summary", "-"],
+                            capture_output=True, text=True, check=True)
+
+    summary = json.loads(result.stdout)
+    assert (summary["succeeded"], summary["failed"]) == (2, 1)
+    # Verbose output of the worker processes
+    assert "Successfully converted" in result.stderr
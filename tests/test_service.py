@@ -0,0 +1,157 @@
+import io
+import json
+import os
+import socket
+import threading
+import time
+import http.client
+
+import pytest
+
+from service import ConversionRequestHandler, ConversionService, PooledHTTPServer, serve_stdio
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "DATA")
+SAMPLE = os.path.join(DATA_DIR, "AS 02~C-SPRING")
+
+MAX_REQUEST_SIZE = 4096
+
+@pytest.fixture
+def server():
+    # One worker and no waiting room, so a second connection is rejected
+    server = PooledHTTPServer(("127.0.0.1", 0), ConversionRequestHandler, ConversionService(), workers=1,
+                              max_request_size=MAX_REQUEST_SIZE, max_pending=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+def _connect(server):
+    return socket.create_connection(server.server_address, timeout=5)
+
+def _wait_idle(server):
+    # The worker releases its slot just after closing the connection
+    deadline = time.monotonic() + 5
+    while server._connections and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+def _read_response(sock):
+    # Read a response until the server closes the connection
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    head, _, body = b"".join(chunks).partition(b"\r\n\r\n")
+    lines = head.decode('latin-1').split("\r\n")
+    headers = dict(line.split(": ", 1) for line in lines[1:])
+    return int(lines[0].split()[1]), headers, body
+
+def _raw_request(server, data):
+    with _connect(server) as sock:
+        sock.sendall(data)
+        response = _read_response(sock)
+    _wait_idle(server)
+    return response
+
+def _get(server, path):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=5)
+    try:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        return response.status, response.read().decode('utf-8')
+    finally:
+        connection.close()
+        _wait_idle(server)
+
+def test_decode_round_trip(server):
+    with open(SAMPLE, 'rb') as f:
+        body = f.read()
+    connection = http.client.HTTPConnection(*server.server_address, timeout=5)
+    try:
+        connection.request("POST", "/decode", body=body)
+        response = connection.getresponse()
+        assert response.status == 200
+        assert json.loads(response.read())["metadata"]["Force Unit"] == "lbf"
+    finally:
+        connection.close()
+        _wait_idle(server)
+
+def test_missing_content_length_is_411(server):
+    status, headers, body = _raw_request(server, b"POST /decode HTTP/1.1\r\nHost: x\r\n\r\n")
+    assert status == 411
+    assert headers["Connection"] == "close"
+    assert json.loads(body) == {"error": "Content-Length required"}
+
+@pytest.mark.parametrize("length", [b"-1", b"abc"])
+def test_invalid_content_length_is_400(server, length):
+    status, headers, body = _raw_request(server, b"POST /decode HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n")
+    assert status == 400
+    assert headers["Connection"] == "close"
+    assert json.loads(body) == {"error": "Invalid Content-Length"}
+
+def test_oversized_body_is_413_without_reading_it(server):
+    length = str(MAX_REQUEST_SIZE + 1).encode()
+    status, headers, body = _raw_request(server, b"POST /hexdump HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n")
+    assert status == 413
+    assert headers["Connection"] == "close"
+    assert "larger than" in json.loads(body)["error"]
+
+def test_connection_over_the_limit_is_503(server):
+    # Hold the only worker with a request that is never finished
+    held = _connect(server)
+    held.sendall(b"POST /decode HTTP/1.1\r\n")
+    deadline = time.monotonic() + 5
+    while server._connections < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    with _connect(server) as sock:
+        sock.sendall(b"GET /health HTTP/1.1\r\n\r\n")
+        status, headers, body = _read_response(sock)
+    assert status == 503
+    assert headers["Retry-After"] == "1"
+    assert json.loads(body) == {"error": "Server busy"}
+
+    # Once the held connection goes away the worker serves again
+    held.close()
+    _wait_idle(server)
+    assert _get(server, "/health") == (200, "ok\n")
+
+def test_metrics_count_requests_by_endpoint_and_status(server):
+    _raw_request(server, b"POST /decode HTTP/1.1\r\nHost: x\r\n\r\n")
+    _raw_request(server, b"POST /encode HTTP/1.1\r\nContent-Length: -1\r\n\r\n")
+    _raw_request(server, b"POST /nowhere HTTP/1.1\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+    status, text = _get(server, "/metrics")
+
+    assert status == 200
+    metrics = dict(line.rsplit(" ", 1) for line in text.splitlines())
+    assert metrics['converter_requests_total{endpoint="/decode",status="411"}'] == "1"
+    assert metrics['converter_requests_total{endpoint="/encode",status="400"}'] == "1"
+    assert metrics['converter_requests_total{endpoint="other",status="404"}'] == "1"
+    assert metrics['converter_request_seconds_count{endpoint="/decode"}'] == "1"
+    assert metrics["converter_workers"] == "1"
+    assert metrics["converter_requests_in_flight"] == "0"
+
+def test_serve_stdio_writes_responses_to_stdout_and_logs_to_stderr(capsys):
+    stdin = io.StringIO("\n".join([
+        json.dumps({"op": "ping", "id": 1}),
+        "",
+        "{not json",
+        json.dumps({"op": "decode", "path": SAMPLE, "format": "txt", "id": 2}),
+        json.dumps({"op": "unknown", "id": 3}),
+    ]) + "\n")
+    stdout = io.StringIO()
+
+    # Verbose decoding prints while the request runs
+    serve_stdio(ConversionService(verbose=True), stdin, stdout)
+
+    responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert [response.get("id") for response in responses] == [1, None, 2, 3]
+    assert [response["ok"] for response in responses] == [True, False, True, False]
+    assert "--- Test Sequence ---" in responses[2]["result"]["text"]
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "File size:" in captured.err
@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+from binary_reader import BinaryReader
+from command_schema import HEADER_SIZE
+from encoder import read_header, iter_commands
+from stream_decoder import SequenceStreamDecoder
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "DATA")
+
+SAMPLES = sorted(name for name in os.listdir(DATA_DIR)
+                 if os.path.isfile(os.path.join(DATA_DIR, name)) and not name.endswith(('.txt', '.json')))
+
+@pytest.mark.parametrize("name", SAMPLES)
+def test_one_byte_chunks_match_iter_commands(name):
+    with open(os.path.join(DATA_DIR, name), 'rb') as f:
+        data = f.read()
+
+    with BinaryReader(data) as reader:
+        metadata, offset = read_header(reader, HEADER_SIZE)
+        expected = [record.to_tuple() for record in iter_commands(reader, offset)]
+
+    decoder = SequenceStreamDecoder()
+    decoded = []
+    for i in range(len(data)):
+        decoded.extend(record.to_tuple() for record in decoder.feed(data[i:i + 1]))
+    decoded.extend(record.to_tuple() for record in decoder.close())
+
+    assert decoder.metadata == metadata
+    assert decoded == expected
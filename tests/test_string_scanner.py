@@ -0,0 +1,75 @@
+import os
+import struct
+
+import pytest
+
+import string_scanner
+from command_schema import pack_string
+from string_scanner import find_candidate_strings
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "DATA")
+
+def _brute_force(data, max_length, printable_only):
+    # The offset-by-offset scan the decoders used before the shared scanner
+    candidates = []
+    for offset in range(len(data) - 4):
+        length = struct.unpack('>I', data[offset:offset+4])[0]
+        if 0 < length <= max_length and offset + 4 + length <= len(data):
+            payload = data[offset+4:offset+4+length]
+            if printable_only and not all(32 <= b <= 126 for b in payload):
+                continue
+            candidates.append((offset, length))
+    return candidates
+
+def _scan(monkeypatch, data, with_numpy, **kwargs):
+    if with_numpy:
+        pytest.importorskip("numpy")
+        monkeypatch.setattr(string_scanner, "_np", False)
+    else:
+        monkeypatch.setattr(string_scanner, "_np", None)
+    return find_candidate_strings(data, **kwargs)
+
+def _crafted():
+    return (pack_string("Part Number")
+            + struct.pack('>I', 3) + b'\x01\x02\x7f'   # non-printable run
+            + pack_string("--")
+            + b'\x00' * 16                             # padding
+            + struct.pack('>I', 2) + b'\x80A'
+            + pack_string("x")
+            + struct.pack('>I', 40) + b'truncated')  # length past the end
+
+@pytest.mark.parametrize("with_numpy", [True, False])
+@pytest.mark.parametrize("printable_only", [True, False])
+@pytest.mark.parametrize("max_length", [1, 5, 100])
+def test_crafted_buffer_matches_brute_force(monkeypatch, with_numpy, printable_only, max_length):
+    data = _crafted()
+    expected = _brute_force(data, max_length, printable_only)
+    assert _scan(monkeypatch, data, with_numpy, max_length=max_length, printable_only=printable_only) == expected
+
+def test_non_printable_runs_only_found_without_printable_only(monkeypatch):
+    data = _crafted()
+    run_offset = len(pack_string("Part Number"))
+    assert (run_offset, 3) not in _scan(monkeypatch, data, False)
+    assert (run_offset, 3) in _scan(monkeypatch, data, False, printable_only=False)
+
+@pytest.mark.parametrize("with_numpy", [True, False])
+@pytest.mark.parametrize("tail", range(0, 8))
+def test_truncated_tails(monkeypatch, with_numpy, tail):
+    # A string cut short at every possible point of its prefix and payload
+    data = pack_string("Height") + pack_string("Free Length")[:tail]
+    expected = _brute_force(data, 100, True)
+    assert _scan(monkeypatch, data, with_numpy) == expected
+
+@pytest.mark.parametrize("with_numpy", [True, False])
+def test_short_buffers(monkeypatch, with_numpy):
+    for data in (b"", b"\x00\x00\x00", b"\x00\x00\x00\x01"):
+        assert _scan(monkeypatch, data, with_numpy) == []
+    assert _scan(monkeypatch, b"\x00\x00\x00\x01A", with_numpy) == [(0, 1)]
+
+@pytest.mark.parametrize("printable_only", [True, False])
+def test_numpy_and_fallback_agree_on_sample(monkeypatch, printable_only):
+    with open(os.path.join(DATA_DIR, "AS 02~C-SPRING"), 'rb') as f:
+        data = f.read()
+    fallback = _scan(monkeypatch, data, False, printable_only=printable_only)
+    assert fallback == _scan(monkeypatch, data, True, printable_only=printable_only)
+    assert fallback == _brute_force(data, 100, printable_only)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+import sys
+import threading
+
+# Strings every spring force test file repeats, registered first so they
+# get the same small codes in every process
+COMMON_STRINGS = (
+    "Part Number", "Model Number", "Free Length", "<Test Sequence>", "--",
+    "ZF", "ZD", "TH", "FL(P)", "Mv(P)", "Fr(P)", "TD", "Scrag", "PMsg", "LP",
+    "Zero Force", "Zero Displacement", "Search Contact", "Measure Free Length",
+    "Measure Free Length-Position", "Move to Position", "Force @ Position",
+    "Force at Position", "Time Delay", "Scragging", "User Message", "Loop",
+    "mm", "N", "kgf", "lbf", "Sec", "Height", "L1", "L2",
+)
+
+# Most distinct strings a table keeps; corrupt files can contain any number
+# of one-off strings and these are decoded without being stored
+MAX_VOCABULARY_SIZE = 65536
+
+class Vocabulary:
+    """
+    Table of the distinct strings found in spring force test files.
+    Keyed by the raw payload bytes, so a string seen before is returned as
+    the same interned str object without decoding it again. Each string also
+    has a small integer code for columnar storage.
+    """
+
+    def __init__(self, strings=(), max_size=MAX_VOCABULARY_SIZE):
+        """
+        Args:
+            strings: Strings to register up front, in code order
+            max_size: Most distinct strings to keep
+        """
+        self.max_size = max_size
+        self._codes = {}
+        self._strings = []
+        self._lock = threading.Lock()
+        for string in strings:
+            self.code(string.encode('utf-8'))
+
+    def __len__(self):
+        return len(self._strings)
+
+    def __getitem__(self, code):
+        return self._strings[code]
+
+    def _lookup(self, raw):
+        # Read-only memoryviews hash like bytes, so slices of a mapped file
+        # can be looked up without copying them
+        try:
+            return self._codes.get(raw), raw
+        except (TypeError, ValueError):
+            raw = bytes(raw)
+            return self._codes.get(raw), raw
+
+    def code(self, raw):
+        """
+        Get the code of a string payload, registering it if it is new.
+
+        Args:
+            raw: Payload as bytes, bytearray or memoryview
+
+        Returns:
+            Integer code, or -1 if the table is full and the string is new
+        """
+        code, raw = self._lookup(raw)
+        if code is not None:
+            return code
+
+        with self._lock:
+            key = bytes(raw)
+            code = self._codes.get(key)
+            if code is None:
+                if len(self._strings) >= self.max_size:
+                    return -1
+                code = len(self._strings)
+                self._strings.append(sys.intern(str(key, 'utf-8', 'replace')))
+                self._codes[key] = code
+            return code
+
+    def decode(self, raw):
+        """
+        Decode a string payload through the table.
+
+        Args:
+            raw: Payload as bytes, bytearray or memoryview
+
+        Returns:
+            Interned string (decoded as UTF-8, replacing errors)
+        """
+        code, raw = self._lookup(raw)
+        if code is None:
+            code = self.code(raw)
+            if code < 0:
+                return str(raw, 'utf-8', 'replace')
+        return self._strings[code]
+
+# Table shared by every parser in the process
+VOCABULARY = Vocabulary(COMMON_STRINGS)
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import queue
+import argparse
+import threading
+
+try:
+    import inotify_simple
+except ImportError:
+    # Not installed, or not on Linux: fall back to polling with scandir
+    inotify_simple = None
+
+# Seconds a file's size and modification time must stay the same before it is converted
+DEFAULT_SETTLE_TIME = 0.3
+
+# Seconds between directory scans when polling, and the longest wait for inotify events
+DEFAULT_POLL_INTERVAL = 0.2
+
+# Files waiting for a worker before the watcher stops accepting more
+DEFAULT_QUEUE_SIZE = 64
+
+class WatchStats:
+    """Counters and latencies of a running watcher, safe to read from any thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.converted = 0
+        self.failed = 0
+        # Seconds from a file being detected to its conversion finishing
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        # Seconds files spent in the queue waiting for a worker
+        self.queue_wait_total = 0.0
+
+    def count_queued(self):
+        with self._lock:
+            self.queued += 1
+
+    def record(self, success, detected_at, queued_at, started_at, finished_at):
+        with self._lock:
+            if success:
+                self.converted += 1
+            else:
+                self.failed += 1
+            latency = finished_at - detected_at
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+            self.queue_wait_total += started_at - queued_at
+
+    def snapshot(self, queue_depth=0):
+        """
+        Get the current statistics.
+
+        Args:
+            queue_depth: Number of files waiting in the queue
+
+        Returns:
+            Dictionary of statistics
+        """
+        with self._lock:
+            done = self.converted + self.failed
+            return {
+                "queue_depth": queue_depth,
+                "queued": self.queued,
+                "converted": self.converted,
+                "failed": self.failed,
+                "latency_avg": self.latency_total / done if done else 0.0,
+                "latency_max": self.latency_max,
+                "queue_wait_avg": self.queue_wait_total / done if done else 0.0,
+            }
+
+class FolderWatcher:
+    """
+    Converts files dropped into a directory as soon as they are completely written.
+    Changes are detected with inotify where available and with scandir
+    polling otherwise. A file is converted once its size and modification
+    time have not changed for settle_time seconds, so files still being
+    copied are not picked up half written. Settled files go through a
+    bounded queue to a fixed number of worker threads.
+    """
+
+    def __init__(self, watch_dir, convert, accept, recursive=False, settle_time=DEFAULT_SETTLE_TIME,
+                 poll_interval=DEFAULT_POLL_INTERVAL, queue_size=DEFAULT_QUEUE_SIZE, workers=2,
+                 ignore_dirs=(), verbose=False):
+        """
+        Args:
+            watch_dir: Directory to watch
+            convert: Function taking a file path and returning (success, error_message);
+                called from several worker threads at once
+            accept: Function taking a file name and returning whether it should be converted
+            recursive: Whether to watch subdirectories too
+            settle_time: Seconds a file must stay unchanged before it is converted
+            poll_interval: Seconds between scans when polling
+            queue_size: Maximum number of files waiting for a worker
+            workers: Number of worker threads
+            ignore_dirs: Directories whose files are never converted (e.g. the output directory)
+            verbose: Whether to print verbose output
+        """
+        self.watch_dir = watch_dir
+        self.convert = convert
+        self.accept = accept
+        self.recursive = recursive
+        self.settle_time = settle_time
+        self.poll_interval = poll_interval
+        self.workers = workers
+        self.ignore_dirs = [os.path.abspath(path) for path in ignore_dirs]
+        self.verbose = verbose
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.stats = WatchStats()
+        self._stop = threading.Event()
+        self._threads = []
+        # (size, mtime_ns) of every file the last time it was converted or seen at startup
+        self._done = {}
+        # Files that changed and are waiting to settle: path -> [signature, detected_at, changed_at]
+        self._pending = {}
+
+    def _ignored(self, path):
+        path = os.path.abspath(path)
+        return any(path == directory or path.startswith(directory + os.sep) for directory in self.ignore_dirs)
+
+    def _scan(self, directory):
+        # Yield (path, stat) of the accepted files, without following symlinks
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if self.recursive and not self._ignored(entry.path):
+                        yield from self._scan(entry.path)
+                elif entry.is_file(follow_symlinks=False) and self.accept(entry.name):
+                    yield entry.path, entry.stat(follow_symlinks=False)
+            except OSError:
+                # Removed while scanning
+                continue
+
+    def _signature(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def mark_existing(self):
+        """Treat the files already in the directory as converted."""
+        for path, stat in self._scan(self.watch_dir):
+            self._done[path] = (stat.st_size, stat.st_mtime_ns)
+
+    def _note_existing(self, directory, now):
+        # Note the files under a directory that changed since they were last converted
+        for path, stat in self._scan(directory):
+            if (stat.st_size, stat.st_mtime_ns) != self._done.get(path):
+                self._note_change(path, now)
+
+    def _note_change(self, path, now):
+        if self._ignored(path):
+            return
+        signature = self._signature(path)
+        if signature is None or signature == self._done.get(path):
+            self._pending.pop(path, None)
+            return
+        pending = self._pending.get(path)
+        if pending is None:
+            self._pending[path] = [signature, now, now]
+        elif pending[0] != signature:
+            pending[0] = signature
+            pending[2] = now
+
+    def _enqueue_settled(self, now):
+        for path, (signature, detected_at, changed_at) in list(self._pending.items()):
+            if now - changed_at < self.settle_time:
+                continue
+            # Check once more, the file may have changed since the last event
+            current = self._signature(path)
+            if current != signature:
+                if current is None:
+                    del self._pending[path]
+                else:
+                    self._pending[path] = [current, detected_at, now]
+                continue
+            del self._pending[path]
+            self._done[path] = signature
+            # Blocks while all workers are busy and the queue is full
+            while not self._stop.is_set():
+                try:
+                    self.queue.put((path, detected_at, time.monotonic()), timeout=self.poll_interval)
+                except queue.Full:
+                    continue
+                self.stats.count_queued()
+                break
+
+    def _worker(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                return
+            path, detected_at, queued_at = item
+            started_at = time.monotonic()
+            try:
+                success, error = self.convert(path)
+            except Exception as e:
+                success, error = False, f"Error processing file {path}: {str(e)}"
+            finished_at = time.monotonic()
+            self.stats.record(success, detected_at, queued_at, started_at, finished_at)
+            if success:
+                if self.verbose:
+                    print(f"Converted {path} in {finished_at - detected_at:.3f} s")
+            else:
+                print(error)
+            self.queue.task_done()
+
+    def _poll_loop(self):
+        while not self._stop.is_set():
+            now = time.monotonic()
+            for path, stat in self._scan(self.watch_dir):
+                if (stat.st_size, stat.st_mtime_ns) != self._done.get(path):
+                    self._note_change(path, now)
+            self._enqueue_settled(time.monotonic())
+            self._stop.wait(self.poll_interval)
+
+    def _inotify_loop(self):
+        flags = inotify_simple.flags
+        mask = flags.CLOSE_WRITE | flags.MOVED_TO | flags.MODIFY | flags.CREATE
+        notify = inotify_simple.INotify()
+        directories = {}
+
+        def add_watch(directory):
+            try:
+                directories[notify.add_watch(directory, mask)] = directory
+            except OSError:
+                return
+            if self.recursive:
+                try:
+                    subdirectories = [entry.path for entry in os.scandir(directory)
+                                      if entry.is_dir(follow_symlinks=False) and not entry.name.startswith('.')
+                                      and not self._ignored(entry.path)]
+                except OSError:
+                    # Removed right after it was created
+                    return
+                for subdirectory in subdirectories:
+                    add_watch(subdirectory)
+
+        add_watch(self.watch_dir)
+        # Files already there (or written before the watches were set) raise no events
+        self._note_existing(self.watch_dir, time.monotonic())
+        try:
+            while not self._stop.is_set():
+                # Wake up at least every poll interval to enqueue files that have settled
+                events = notify.read(timeout=int(self.poll_interval * 1000))
+                now = time.monotonic()
+                for event in events:
+                    directory = directories.get(event.wd)
+                    if directory is None or not event.name or event.name.startswith('.'):
+                        continue
+                    path = os.path.join(directory, event.name)
+                    if event.mask & flags.ISDIR:
+                        if self.recursive and event.mask & (flags.CREATE | flags.MOVED_TO) and not self._ignored(path):
+                            add_watch(path)
+                            # Files moved in with the directory, or written before its watch was set
+                            self._note_existing(path, now)
+                    elif self.accept(event.name):
+                        self._note_change(path, now)
+                self._enqueue_settled(time.monotonic())
+        finally:
+            notify.close()
+
+    def start(self):
+        """Start the worker threads and the watch loop in the background."""
+        for _ in range(self.workers):
+            thread = threading.Thread(target=self._worker, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+        loop = self._inotify_loop if inotify_simple is not None else self._poll_loop
+        self._watch_thread = threading.Thread(target=loop, daemon=True)
+        self._watch_thread.start()
+
+    def stop(self):
+        """Stop watching, let the workers finish the queued files and wait for them."""
+        self._stop.set()
+        self._watch_thread.join()
+        for _ in self._threads:
+            self.queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def snapshot(self):
+        """Return the current statistics, including the queue depth."""
+        return self.stats.snapshot(self.queue.qsize())
+
+def _decode_converter(output_dir, output_format, hex_dump, verbose):
+    from encoder import EncoderPipeline, is_input_name
+    # Each worker thread keeps its own pipeline, a pipeline holds the buffer it read
+    local = threading.local()
+
+    def convert(path):
+        pipeline = getattr(local, "pipeline", None)
+        if pipeline is None:
+            pipeline = local.pipeline = EncoderPipeline(output_dir, output_format, hex_dump, verbose)
+        return pipeline.run(path)
+
+    return convert, is_input_name
+
+def _encode_converter(output_dir, verbose):
+    from reverser import process_file, is_text_input_name
+
+    def convert(path):
+        return process_file(path, output_dir, verbose)
+
+    return convert, is_text_input_name
+
+def format_stats(stats):
+    """
+    Format a statistics snapshot as one line.
+
+    Args:
+        stats: Dictionary returned by FolderWatcher.snapshot()
+
+    Returns:
+        Formatted string
+    """
+    return (f"queue {stats['queue_depth']}, queued {stats['queued']}, converted {stats['converted']}, "
+            f"failed {stats['failed']}, latency avg {stats['latency_avg']:.3f} s "
+            f"max {stats['latency_max']:.3f} s, queue wait avg {stats['queue_wait_avg']:.3f} s")
+
+def main():
+    parser = argparse.ArgumentParser(description='Watch a drop directory and convert spring force test files as they arrive.')
+    parser.add_argument('directory', help='Directory to watch')
+    # Same names as the service.py operations: decode reads binaries, encode writes them
+    parser.add_argument('-m', '--mode', choices=['decode', 'encode'], default='decode',
+                        help='decode converts binary files to text/JSON (encoder.py), encode converts text/JSON back to binary (reverser.py)')
+    parser.add_argument('-o', '--output', default='output', help='Output directory')
+    parser.add_argument('-f', '--format', choices=['txt', 'json', 'all'], default='all', help='Output format (decode mode)')
+    parser.add_argument('--no-hex-dump', dest='hex_dump', action='store_false', help='Do not write hex dumps (decode mode)')
+    parser.add_argument('-r', '--recursive', action='store_true', help='Watch subdirectories too')
+    parser.add_argument('--existing', action='store_true', help='Also convert the files already in the directory')
+    parser.add_argument('-w', '--workers', type=int, default=2, help='Number of worker threads')
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE, help='Maximum number of files waiting for a worker')
+    parser.add_argument('--settle-time', type=float, default=DEFAULT_SETTLE_TIME, help='Seconds a file must stay unchanged before it is converted')
+    parser.add_argument('--poll-interval', type=float, default=DEFAULT_POLL_INTERVAL, help='Seconds between directory scans when polling')
+    parser.add_argument('--stats-interval', type=float, default=0, help='Print statistics every this many seconds (0 disables)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output')
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.directory):
+        print(f"Error: {args.directory} does not exist")
+        sys.exit(1)
+
+    if args.mode == 'decode':
+        convert, accept = _decode_converter(args.output, args.format, args.hex_dump, args.verbose)
+    else:
+        convert, accept = _encode_converter(args.output, args.verbose)
+
+    watcher = FolderWatcher(args.directory, convert, accept, args.recursive, args.settle_time,
+                            args.poll_interval, args.queue_size, args.workers,
+                            ignore_dirs=[args.output], verbose=args.verbose)
+    if not args.existing:
+        watcher.mark_existing()
+
+    method = "inotify" if inotify_simple is not None else "polling"
+    print(f"Watching {args.directory} ({method}), press Ctrl+C to stop")
+    watcher.start()
+
+    try:
+        while True:
+            if args.stats_interval > 0:
+                time.sleep(args.stats_interval)
+                print(format_stats(watcher.snapshot()))
+            else:
+                time.sleep(3600)
+    except KeyboardInterrupt:
+        print("Stopping...")
+    finally:
+        watcher.stop()
+        print(format_stats(watcher.snapshot()))
+
+if __name__ == "__main__":
+    main()